@@ -0,0 +1,52 @@
+# Benchmark of the config getters called by the paint of the states and the paths of the transitions,
+# config read from the file at each call against the config kept in memory
+# Usage : python -m benchmark.bench_cfg [nb_items ...]
+import os
+import sys
+import tempfile
+import time
+
+from tools.cfg import Cfg
+
+
+def paint_frame_previous(cfg, nb_items):
+    # Previous getters : the file is read at each call
+    for num in range(nb_items):
+        cfg.get_content().is_center_state_text
+        cfg.get_content().is_diagonal_visible
+
+
+def paint_frame(cfg, nb_items):
+    for num in range(nb_items):
+        cfg.get_height_rectangle(10.0, 25.0)
+        cfg.is_diagonal_visible()
+
+
+def measure(paint, cfg, nb_items, nb_frames):
+    # Duration and reads of the file per frame
+    nb_reads = cfg.nb_reads
+    start = time.perf_counter()
+    for num in range(nb_frames):
+        paint(cfg, nb_items)
+    duration = time.perf_counter() - start
+    return duration / nb_frames, (cfg.nb_reads - nb_reads) / nb_frames
+
+
+def main():
+    all_nb_items = [int(arg) for arg in sys.argv[1:]] or [100, 1000]
+
+    with tempfile.TemporaryDirectory() as folder:
+        cfg = Cfg(os.path.join(folder, "config.json"))
+        for nb_items in all_nb_items:
+            time_previous, reads_previous = measure(paint_frame_previous, cfg, nb_items, 3)
+            time_cached, reads_cached = measure(paint_frame, cfg, nb_items, 100)
+
+            print("Items per frame         = ", nb_items)
+            print("Previous (ms / frame)   = ", round(time_previous * 1000, 2), " reads = ", reads_previous)
+            print("Cached (ms / frame)     = ", round(time_cached * 1000, 4), " reads = ", reads_cached)
+            print("")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
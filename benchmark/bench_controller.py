@@ -0,0 +1,69 @@
+# Benchmark of the load of the state machine into the scene after the edit of one line,
+# reload of all the items against the reconciliation with the previously loaded state machine
+# Usage : QT_QPA_PLATFORM=offscreen python -m benchmark.bench_controller [nb_states ...]
+import re
+import sys
+import time
+
+from PySide6.QtCore import QObject
+from PySide6.QtWidgets import QApplication
+
+from benchmark.bench_sms_reader import generate_sms
+from gui.controller import Controller
+from gui.graphics_scene import GraphicsScene
+from model.default_placer import DefaultPlacer
+from sms_incremental import IncrementalStateMachineBuilder
+
+
+class ReadPlacer(DefaultPlacer):
+    # The vertices keep the place given by the SMD reader, the layout of a new diagram is not measured
+    def place_vertices(self, scene, orphan_vertices):
+        pass
+
+
+def edit_line(lines, num_line, num_edit):
+    # Change the action of a transition
+    lines[num_line] = re.sub(r'/ \w+', '/ edit%d' % num_edit, lines[num_line], count=1)
+    return num_line
+
+
+def measure(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    all_nb_states = [int(arg) for arg in sys.argv[1:]] or [1000, 10000]
+    app = QApplication.instance() or QApplication([])
+    owner = QObject()
+
+    for nb_states in all_nb_states:
+        lines = generate_sms(nb_states)
+        builder = IncrementalStateMachineBuilder()
+        builder.update(lines)
+        scene = GraphicsScene(owner)
+        controller = Controller(scene)
+        controller.load_sm(builder.get_state_machine(), ReadPlacer())
+
+        # Edit of a transition in the middle of the description
+        num_line = next(num for num in range(len(lines) // 2, len(lines)) if '->' in lines[num] and '/' in lines[num])
+
+        # Previous update : a new controller reloads all the items
+        builder.update(lines, edit_line(lines, num_line, 1))
+        time_full = measure(Controller(scene).load_sm, builder.get_state_machine(), DefaultPlacer())
+
+        builder.update(lines, edit_line(lines, num_line, 2))
+        time_changes = measure(controller.load_sm, builder.get_state_machine(), DefaultPlacer())
+
+        print("States               = ", nb_states)
+        print("Items                = ", len(scene.items()))
+        print("Full reload (s)      = ", round(time_full, 3))
+        print("Reconciliation (ms)  = ", round(time_changes * 1000, 2))
+        print("")
+        scene.reset()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
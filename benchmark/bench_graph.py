@@ -0,0 +1,59 @@
+# Benchmark of the memory and of the analyses of DepGraph against the dictionary form
+# Usage : python -m benchmark.bench_graph [nb_files] [nb_includes]
+import random
+import sys
+import time
+import tracemalloc
+
+from dep_graph import DepGraph
+from graph_analysis import get_cycles, get_redundant_includes
+
+
+def generate_dependencies(nb_files, nb_includes, seed=0):
+    # Dictionary name -> dependencies, each file includes headers chosen at random
+    rand = random.Random(seed)
+    names = ["Cls%06d.h" % i for i in range(nb_files)]
+    return {name: rand.sample(names, nb_includes) for name in names}
+
+
+def get_memory(build):
+    # Memory allocated by the object returned by build
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, size
+
+
+def main():
+    nb_files = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    nb_includes = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    # Names are built before, both forms share them
+    dependencies = generate_dependencies(nb_files, nb_includes)
+    dictionary, size_dict = get_memory(lambda: {name: set(targets) for name, targets in dependencies.items()})
+    graph, size_graph = get_memory(lambda: DepGraph.from_dict(dependencies))
+    size_edges = graph.offsets.itemsize * len(graph.offsets) + graph.targets.itemsize * len(graph.targets)
+
+    start = time.perf_counter()
+    get_cycles(graph)
+    time_cycles = time.perf_counter() - start
+
+    print("Files              = ", graph.get_nb_node())
+    print("Edges              = ", graph.get_nb_edge())
+    print("Dict of sets (MB)  = ", round(size_dict / 1e6, 2))
+    print("DepGraph (MB)      = ", round(size_graph / 1e6, 2))
+    print("CSR arrays (MB)    = ", round(size_edges / 1e6, 2))
+    print("Cycles (s)         = ", round(time_cycles, 3))
+    print("Same dictionary    = ", graph.to_dict() == dependencies)
+
+    # Transitive reduction only on small graphs, bitsets grow with the number of files
+    if nb_files <= 20000:
+        start = time.perf_counter()
+        get_redundant_includes(graph)
+        print("Redundant (s)      = ", round(time.perf_counter() - start, 3))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
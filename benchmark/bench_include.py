@@ -0,0 +1,83 @@
+# Benchmark of the include extractor against the former line by line parser
+# Usage : python -m benchmark.bench_include [nb_files] [nb_lines]
+import sys
+import tempfile
+import time
+
+from benchmark.synthetic_tree import generate_cpp_tree
+from generate_dot import get_dependencies_line_cpp
+from include_extractor import get_includes_file, get_includes
+
+
+def get_includes_file_line(path):
+    # Former parser : every line containing #include is split on quotes
+    includes = {}
+    nb_line = 0
+    with open(path, "r") as f:
+        for d in f:
+            nb_line = nb_line + 1
+            if "#include" in d:
+                name_header = get_dependencies_line_cpp(d)
+                if len(name_header) > 0:
+                    includes[name_header] = None
+    return list(includes), nb_line
+
+
+def get_includes_line(data):
+    # Former parser on a buffer already into memory
+    includes = {}
+    for d in data.decode().splitlines():
+        if "#include" in d:
+            name_header = get_dependencies_line_cpp(d)
+            if len(name_header) > 0:
+                includes[name_header] = None
+    return list(includes)
+
+
+def run(parser, paths):
+    start = time.perf_counter()
+    results = [parser(path) for path in paths]
+    return results, time.perf_counter() - start
+
+
+def main():
+    nb_files = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    nb_lines = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+
+    with tempfile.TemporaryDirectory() as folder:
+        paths = generate_cpp_tree(folder, nb_files, nb_lines=nb_lines)
+
+        # Warm the file system cache
+        run(get_includes_file, paths)
+
+        results_line, time_line = run(get_includes_file_line, paths)
+        results_buffer, time_buffer = run(get_includes_file, paths)
+
+        # Parsing only, files already into memory
+        buffers = []
+        for path in paths:
+            with open(path, "rb") as f:
+                buffers.append(f.read())
+        results, time_line_memory = run(get_includes_line, buffers)
+        results, time_buffer_memory = run(get_includes, buffers)
+
+    # The new parser keeps angle includes and skips commented ones
+    nb_line_same = all(r1[1] == r2[1] for r1, r2 in zip(results_line, results_buffer))
+    nb_line_parser = sum(len(r[0]) for r in results_line)
+    nb_buffer_parser = sum(len(r[0]) for r in results_buffer)
+
+    print("Files                  = ", len(paths))
+    print("Line parser      (s)   = ", round(time_line, 3))
+    print("Buffer parser    (s)   = ", round(time_buffer, 3))
+    print("Speed up               = ", round(time_line / time_buffer, 2))
+    print("Line parser mem  (s)   = ", round(time_line_memory, 3))
+    print("Buffer parser mem (s)  = ", round(time_buffer_memory, 3))
+    print("Speed up memory        = ", round(time_line_memory / time_buffer_memory, 2))
+    print("Includes line parser   = ", nb_line_parser)
+    print("Includes buffer parser = ", nb_buffer_parser)
+    print("Same line count        = ", nb_line_same)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+# Benchmark of the built-in layered layout against Graphviz
+# Usage : python -m benchmark.bench_layout [nb_nodes ...]
+import os
+import random
+import sys
+import tempfile
+import time
+from bisect import bisect_right, insort
+
+import numpy as np
+
+from dep_graph import DepGraph
+from graph_layout import get_layout_graphviz
+from sugiyama_layout import get_edges, get_acyclic_edges, get_layers, reduce_crossings, get_layout_sugiyama
+
+
+def generate_dependencies(nb_nodes, nb_includes=3, seed=0):
+    # Include graph : each file includes files of a higher number, plus a few cycles
+    rand = random.Random(seed)
+    names = ["Cls%06d" % i for i in range(nb_nodes)]
+    dependencies = {}
+    for num, name in enumerate(names):
+        targets = set()
+        for i in range(nb_includes):
+            if num + 1 < nb_nodes:
+                targets.add(names[rand.randrange(num + 1, min(nb_nodes, num + 1 + nb_nodes // 10 + 2))])
+        if rand.random() < 0.01 and num > 0:
+            targets.add(names[rand.randrange(num)])
+        dependencies[name] = sorted(targets)
+    return dependencies
+
+
+def get_nb_crossings(layer, position, sources, targets):
+    # Crossings between the edges joining two adjacent layers
+    nb_crossing = 0
+    adjacent = layer[targets] == layer[sources] + 1
+    sources = sources[adjacent]
+    targets = targets[adjacent]
+    for num_layer in np.unique(layer[sources]):
+        edges = np.flatnonzero(layer[sources] == num_layer)
+        order = np.lexsort((position[targets[edges]], position[sources[edges]]))
+        # Number of inversions of the targets once the edges are sorted by source
+        seen = []
+        for end in position[targets[edges][order]]:
+            nb_crossing = nb_crossing + len(seen) - bisect_right(seen, end)
+            insort(seen, end)
+    return nb_crossing
+
+
+def write_dot(dependencies, path):
+    with open(path, "w") as f:
+        f.write("digraph G {\n")
+        for name, targets in dependencies.items():
+            for target in targets:
+                f.write('"' + name + '" -> "' + target + '"\n')
+        f.write("}\n")
+
+
+def main():
+    all_nb_nodes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 50000]
+
+    for nb_nodes in all_nb_nodes:
+        dependencies = generate_dependencies(nb_nodes)
+
+        start = time.perf_counter()
+        positions = get_layout_sugiyama(dependencies)
+        time_sugiyama = time.perf_counter() - start
+
+        # Crossings before and after the barycentric sweeps, only on small graphs
+        nb_crossing = "skipped"
+        if nb_nodes <= 10000:
+            graph = DepGraph.from_dict(dependencies)
+            sources, targets = get_acyclic_edges(graph, *get_edges(graph))
+            layer = get_layers(graph.get_nb_node(), sources, targets)
+            before = get_nb_crossings(layer, reduce_crossings(layer, sources, targets, 0), sources, targets)
+            after = get_nb_crossings(layer, reduce_crossings(layer, sources, targets), sources, targets)
+            nb_crossing = str(before) + " -> " + str(after)
+
+        # Graphviz on the same graph
+        with tempfile.TemporaryDirectory() as folder:
+            dot_path = os.path.join(folder, "bench.dot")
+            write_dot(dependencies, dot_path)
+            start = time.perf_counter()
+            positions_graphviz = get_layout_graphviz(dot_path)
+            time_graphviz = time.perf_counter() - start
+
+        print("Nodes              = ", nb_nodes)
+        print("Edges              = ", sum(len(targets) for targets in dependencies.values()))
+        print("Built-in (s)       = ", round(time_sugiyama, 3))
+        print("Crossings          = ", nb_crossing)
+        if positions_graphviz is None:
+            print("Graphviz (s)       =  dot not installed")
+        else:
+            print("Graphviz (s)       = ", round(time_graphviz, 3))
+        print("Positioned nodes   = ", len(positions))
+        print("")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,65 @@
+# Benchmark of the memory of the state machine model, in bytes per state and per transition
+# Usage : python -m benchmark.bench_model_memory [nb_transitions ...]
+import gc
+import random
+import sys
+import time
+import tracemalloc
+
+from sms_reader import StateMachineBuilder
+from state.state_machine import StateMachine
+
+
+def generate_sms(nb_states, nb_transitions, seed=0):
+    # Flat states, transitions and internal events with a few event, guard and action names
+    rand = random.Random(seed)
+    lines = []
+    for num in range(nb_states):
+        lines.append('=S%d=' % num)
+        lines.append('entry / act%d' % (num % 10))
+        for num_trans in range(nb_transitions // nb_states):
+            if num_trans % 5 == 0:
+                lines.append('ev%d [g%d] / a%d' % (num_trans % 20, num_trans % 7, num_trans % 13))
+            else:
+                lines.append('ev%d [g%d] / a%d -> S%d' % (num_trans % 20, num_trans % 7, num_trans % 13,
+                                                          rand.randrange(nb_states)))
+    return '\n'.join(lines)
+
+
+def measure_model(text):
+    # Memory kept by the state machine once the builder is released
+    gc.collect()
+    tracemalloc.start()
+    sm = StateMachine()
+    StateMachineBuilder(sm).build_from_string(text)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return sm, size
+
+
+def main():
+    all_nb_transitions = [int(arg) for arg in sys.argv[1:]] or [10000, 100000]
+
+    for nb_transitions in all_nb_transitions:
+        nb_states = max(nb_transitions // 10, 1)
+        text_states = generate_sms(nb_states, 0)
+        text = generate_sms(nb_states, nb_transitions)
+
+        sm_states, size_states = measure_model(text_states)
+        del sm_states
+        start = time.perf_counter()
+        sm, size = measure_model(text)
+        duration = time.perf_counter() - start
+
+        print("States               = ", nb_states)
+        print("Transitions          = ", nb_transitions)
+        print("Bytes per state      = ", size_states // nb_states)
+        print("Bytes per transition = ", (size - size_states) // nb_transitions)
+        print("Build, traced (s)    = ", round(duration, 3))
+        print("")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
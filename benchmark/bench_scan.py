@@ -0,0 +1,72 @@
+# Benchmark of the source scanner : serial against process pool
+# Usage : python -m benchmark.bench_scan [nb_files] [nb_workers]
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+from constant_mode import MODE_GENERATE_CPP_SRC
+from generate_dot import generate_dot_from_source, get_source_files, get_dependencies_sources, \
+    get_dependencies_sources_cached
+from scan_cache import ScanCache
+from benchmark.synthetic_tree import generate_cpp_tree
+
+
+def run_scan(folder, dot_path, nb_workers):
+    # Scan without the verbose output of the scanner
+    with contextlib.redirect_stdout(io.StringIO()):
+        # Time the parsing stage only
+        start = time.perf_counter()
+        source_files, nb_dir = get_source_files(folder, MODE_GENERATE_CPP_SRC)
+        get_dependencies_sources(source_files, MODE_GENERATE_CPP_SRC, nb_workers)
+        duration = time.perf_counter() - start
+
+        # Full pipeline to compare the outputs
+        dep = generate_dot_from_source(folder, dot_path, MODE_GENERATE_CPP_SRC, nb_workers)
+    return dep, duration
+
+
+def run_scan_cached(folder, cache_path):
+    # Time the parsing stage with the scan cache
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        source_files, nb_dir = get_source_files(folder, MODE_GENERATE_CPP_SRC)
+        scan_cache = ScanCache(cache_path, MODE_GENERATE_CPP_SRC)
+        get_dependencies_sources_cached(source_files, MODE_GENERATE_CPP_SRC, scan_cache)
+        scan_cache.close()
+    return time.perf_counter() - start
+
+
+def main():
+    nb_files = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    nb_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 0
+
+    with tempfile.TemporaryDirectory() as folder:
+        generate_cpp_tree(os.path.join(folder, "src"), nb_files)
+        serial_dot = os.path.join(folder, "serial.dot")
+        parallel_dot = os.path.join(folder, "parallel.dot")
+
+        dep_serial, time_serial = run_scan(os.path.join(folder, "src"), serial_dot, 1)
+        dep_parallel, time_parallel = run_scan(os.path.join(folder, "src"), parallel_dot, nb_workers)
+
+        cache_path = os.path.join(folder, "dependencies.scan.db")
+        time_cold = run_scan_cached(os.path.join(folder, "src"), cache_path)
+        time_warm = run_scan_cached(os.path.join(folder, "src"), cache_path)
+
+        with open(serial_dot) as f1, open(parallel_dot) as f2:
+            same_dot = f1.read() == f2.read()
+
+    print("Files              = ", 2 * nb_files)
+    print("Serial parse   (s) = ", round(time_serial, 3))
+    print("Parallel parse (s) = ", round(time_parallel, 3))
+    print("Cold cache     (s) = ", round(time_cold, 3))
+    print("Warm cache     (s) = ", round(time_warm, 3))
+    print("Identical dot      = ", same_dot)
+    print("Identical dep      = ", dep_serial == dep_parallel)
+    return 0 if same_dot and dep_serial == dep_parallel else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
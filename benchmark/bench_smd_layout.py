@@ -0,0 +1,117 @@
+# Benchmark of the load of a SMD file : walk of the XML stream as done by XMLReader,
+# XML parsed by ElementTree and compact format
+# Usage : python -m benchmark.bench_smd_layout [nb_vertices ...]
+# The items of the scene are created the same way by XMLReader and CompactReader, they are not measured
+import os
+import random
+import sys
+import tempfile
+import time
+
+from PySide6.QtCore import QFile, QIODevice, QXmlStreamReader
+
+from model.smd_layout import DiagramLayout, read_compact, read_smd_xml, write_compact, write_smd_xml
+from model.xml_reader import elements
+
+
+def generate_layout(nb_vertices, nb_transitions_per_vertex=2, seed=0):
+    rand = random.Random(seed)
+    layout = DiagramLayout()
+    names = ["State%06d" % num for num in range(nb_vertices)]
+    for name in names:
+        layout.add_vertex(name, None, "#ffffcc", False, True, True,
+                          (0.0, 0.0, len(name) * 10.0, 25.0), (rand.uniform(0, 1e4), rand.uniform(0, 1e4)))
+    for name in names:
+        for target in rand.sample(names, nb_transitions_per_vertex):
+            rules = [(rand.choice('HVD'), (rand.uniform(0, 1e4), rand.uniform(0, 1e4)))
+                     for num in range(rand.randrange(3))]
+            layout.add_transition('%s->%s:' % (name, target), (0.5, 0.5), (0.5, 0.5), rules,
+                                  ((0.0, 0.0), (-50.0, -10.0, 100.0, 20.0), (0.0, 0.0)))
+    return layout
+
+
+def read_qt_stream(path):
+    # Previous load : same walk of the stream and same conversions as XMLReader, without the items
+    def read_values(names):
+        attributes = stream.attributes()
+        values = tuple(float(attributes.value(name)) for name in names)
+        for elem_name in elements(stream):
+            pass
+        return values
+
+    count = 0
+    smd_file = QFile(path)
+    smd_file.open(QIODevice.ReadOnly)
+    stream = QXmlStreamReader(smd_file)
+    while not stream.atEnd():
+        if stream.readNext() == QXmlStreamReader.StartElement and stream.name() == 'body':
+            for diagram_name in elements(stream, ('diagram',)):
+                for elem_name in elements(stream, ('vertex', 'transition')):
+                    attributes = stream.attributes()
+                    str(attributes.value('id'))
+                    str(attributes.value('background'))
+                    eval(str(attributes.value('excluded')) or 'False')
+                    for sub_name in elements(stream):
+                        if sub_name == 'rule':
+                            str(stream.attributes().value('orient'))
+                            for anchor_name in elements(stream):
+                                read_values('xy')
+                        elif sub_name == 'text':
+                            for text_name in elements(stream):
+                                if text_name == 'rect':
+                                    read_values(('x', 'y', 'width', 'height'))
+                                else:
+                                    read_values('xy')
+                        elif sub_name == 'rect':
+                            read_values(('x', 'y', 'width', 'height'))
+                        else:
+                            read_values('xy')
+                    count += 1
+    smd_file.close()
+    return count
+
+
+def read_all(layouts):
+    # Decode every vertex and transition
+    return sum(len(list(layout.vertices())) + len(list(layout.transitions())) for layout in layouts)
+
+
+def measure(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    all_nb_vertices = [int(arg) for arg in sys.argv[1:]] or [10000, 100000]
+
+    for nb_vertices in all_nb_vertices:
+        layout = generate_layout(nb_vertices)
+        with tempfile.TemporaryDirectory() as folder:
+            path_xml = os.path.join(folder, "diagram.smd")
+            path_compact = os.path.join(folder, "diagram.smdc")
+            write_smd_xml(path_xml, [layout])
+            write_compact(path_compact, [layout])
+
+            time_stream, count_stream = measure(read_qt_stream, path_xml)
+            time_xml, count_xml = measure(lambda: read_all(read_smd_xml(path_xml)))
+            time_open = measure(read_compact, path_compact)[0]
+            time_compact, count_compact = measure(lambda: read_all(read_compact(path_compact)))
+            is_same = (list(read_compact(path_compact)[0].transitions()) == list(layout.transitions()) and
+                       list(read_smd_xml(path_xml)[0].vertices()) == list(layout.vertices()))
+
+            print("Vertices               = ", nb_vertices)
+            print("Transitions            = ", layout.get_nb_transitions())
+            print("XML size (MB)          = ", round(os.path.getsize(path_xml) / 1e6, 2))
+            print("Compact size (MB)      = ", round(os.path.getsize(path_compact) / 1e6, 2))
+            print("XMLReader stream (s)   = ", round(time_stream, 3))
+            print("XML ElementTree (s)    = ", round(time_xml, 3))
+            print("Compact, open (s)      = ", round(time_open, 4))
+            print("Compact, decoded (s)   = ", round(time_compact, 3))
+            print("Same layout            = ", is_same and count_stream == count_xml == count_compact)
+            print("")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
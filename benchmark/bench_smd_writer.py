@@ -0,0 +1,106 @@
+# Benchmark of the save of a SMD file : QXmlStreamWriter with auto formatting as done by the previous
+# XMLWriter, against the streaming writer, and time during which the GUI thread is blocked by DiagramSaver
+# Usage : python -m benchmark.bench_smd_writer [nb_vertices ...]
+import os
+import sys
+import tempfile
+import time
+
+from PySide6.QtCore import QFile, QIODevice, QXmlStreamWriter
+
+from benchmark.bench_smd_layout import generate_layout
+from model.diagram_saver import DiagramSaver
+from model.smd_layout import read_smd_xml, write_smd_xml
+
+
+def write_previous(path, layouts):
+    # Previous writer : auto formatting, str() of each float, one call per attribute
+    def write_values(names, values):
+        for name, value in zip(names, values):
+            stream.writeAttribute(name, str(value))
+
+    smd_file = QFile(path)
+    smd_file.open(QIODevice.WriteOnly)
+    stream = QXmlStreamWriter(smd_file)
+    stream.setAutoFormatting(True)
+    stream.setAutoFormattingIndent(2)
+    stream.writeStartDocument()
+    stream.writeStartElement('body')
+    for layout in layouts:
+        stream.writeStartElement('diagram')
+        for id, pseudo, background, excluded, show_sub, show_actions, rect, pos in layout.vertices():
+            stream.writeStartElement('vertex')
+            stream.writeAttribute('id', id)
+            stream.writeAttribute('background', background)
+            stream.writeAttribute('excluded', str(excluded))
+            stream.writeEmptyElement('rect')
+            write_values(('x', 'y', 'width', 'height'), rect)
+            stream.writeEmptyElement('pos')
+            write_values('xy', pos)
+            stream.writeEndElement()
+        for id, source_point, target_point, rules, text in layout.transitions():
+            stream.writeStartElement('transition')
+            stream.writeAttribute('id', id)
+            stream.writeEmptyElement('source_point')
+            write_values('xy', source_point)
+            stream.writeEmptyElement('target_point')
+            write_values('xy', target_point)
+            for orient, anchor in rules:
+                stream.writeStartElement('rule')
+                stream.writeAttribute('orient', orient)
+                stream.writeEmptyElement('anchor')
+                write_values('xy', anchor)
+                stream.writeEndElement()
+            text_pos, rect, pos = text
+            stream.writeEmptyElement('text_pos')
+            write_values('xy', text_pos)
+            stream.writeStartElement('text')
+            stream.writeEmptyElement('rect')
+            write_values(('x', 'y', 'width', 'height'), rect)
+            stream.writeEmptyElement('pos')
+            write_values('xy', pos)
+            stream.writeEndElement()
+            stream.writeEndElement()
+        stream.writeEndElement()
+    stream.writeEndElement()
+    stream.writeEndDocument()
+    smd_file.close()
+
+
+def measure(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    all_nb_vertices = [int(arg) for arg in sys.argv[1:]] or [10000, 100000]
+
+    for nb_vertices in all_nb_vertices:
+        layouts = [generate_layout(nb_vertices)]
+        with tempfile.TemporaryDirectory() as folder:
+            path_previous = os.path.join(folder, "previous.smd")
+            path_streaming = os.path.join(folder, "streaming.smd")
+            time_previous = measure(write_previous, path_previous, layouts)
+            time_streaming = measure(write_smd_xml, path_streaming, layouts)
+            size_previous = os.path.getsize(path_previous)
+            size_streaming = os.path.getsize(path_streaming)
+            is_same = (list(read_smd_xml(path_previous)[0].transitions()) ==
+                       list(read_smd_xml(path_streaming)[0].transitions()))
+
+            saver = DiagramSaver()
+            file_base = os.path.join(folder, "saved")
+            time_blocked = measure(saver.save, file_base, b'', layouts, False)
+            time_saved = time_blocked + measure(saver.wait)
+
+        print("Vertices                 = ", nb_vertices)
+        print("Previous (s)             = ", round(time_previous, 3), " size (MB) = ", round(size_previous / 1e6, 2))
+        print("Streaming (s)            = ", round(time_streaming, 3), " size (MB) = ", round(size_streaming / 1e6, 2))
+        print("Same layout              = ", is_same)
+        print("Saver, GUI blocked (s)   = ", round(time_blocked, 4), " total = ", round(time_saved, 3))
+        print("")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
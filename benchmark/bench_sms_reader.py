@@ -0,0 +1,89 @@
+# Benchmark of the SMS line classification, each parser in turn against the first character dispatch,
+# and of the update of the incremental builder after the edit of one line
+# Usage : python -m benchmark.bench_sms_reader [nb_states ...]
+import random
+import sys
+import time
+
+from sms_incremental import IncrementalStateMachineBuilder
+from sms_reader import StateMachineBuilder
+from state.state_machine import StateMachine
+
+
+def generate_sms(nb_states, seed=0):
+    # States with sub states, actions, events, transitions, comments and a few errors
+    rand = random.Random(seed)
+    lines = []
+    for num in range(nb_states):
+        lines.append('=S%d%s=' % (num, '*' if num % 50 == 0 else ''))
+        for num_sub in range(rand.randrange(3)):
+            lines.append('  ==S%d_%d== # sub state' % (num, num_sub))
+            lines.append('    entry / act%d ^check' % num_sub)
+            lines.append('    ev%d [g%d] / a%d -> S%d' % (num_sub, num_sub, num_sub, rand.randrange(nb_states)))
+        lines.append(rand.choice(['entry / doit', 'exit / stop', 'ev [!x] / act ^c', 'after(t1) / go',
+                                  '#port=%d' % num, '## note', '# comment', 'syntax error', '']))
+        lines.append('->S%d' % rand.randrange(nb_states))
+    return lines
+
+
+def classify_each_parser(lines):
+    # Previous classification : each parser in turn, once per pass
+    tokens = []
+    for num_pass in range(2):
+        tokens = []
+        for line in lines:
+            for parser in StateMachineBuilder.ALL_PARSERS:
+                match_res = parser.reg_exp.match(line)
+                if match_res is not None:
+                    tokens.append((parser, match_res))
+                    break
+            else:
+                tokens.append((None, None))
+    return tokens
+
+
+def main():
+    all_nb_states = [int(arg) for arg in sys.argv[1:]] or [1000, 10000]
+
+    for nb_states in all_nb_states:
+        lines = generate_sms(nb_states)
+
+        start = time.perf_counter()
+        tokens_previous = classify_each_parser(lines)
+        time_previous = time.perf_counter() - start
+
+        start = time.perf_counter()
+        tokens = [StateMachineBuilder.CLASSIFIER.classify(line) for line in lines]
+        time_dispatch = time.perf_counter() - start
+
+        is_same = all(parser is parser_previous and match_res.regs == match_previous.regs
+                      for (parser, match_res), (parser_previous, match_previous) in zip(tokens, tokens_previous))
+
+        start = time.perf_counter()
+        builder = StateMachineBuilder(StateMachine())
+        builder.build_from_string('\n'.join(lines))
+        time_build = time.perf_counter() - start
+
+        # Edit of one transition in the middle of the text, then update of the incremental builder
+        incremental = IncrementalStateMachineBuilder()
+        incremental.update(lines)
+        edited = list(lines)
+        num_line = next(num for num in range(len(lines) // 2, len(lines)) if lines[num].startswith('->'))
+        edited[num_line] = '->S0'
+        start = time.perf_counter()
+        incremental.update(edited, num_line)
+        time_update = time.perf_counter() - start
+
+        print("States             = ", nb_states)
+        print("Lines              = ", len(lines))
+        print("Each parser (s)    = ", round(time_previous, 3))
+        print("Dispatch (s)       = ", round(time_dispatch, 3))
+        print("Same tokens        = ", is_same)
+        print("Full build (s)     = ", round(time_build, 3))
+        print("Update (s)         = ", round(time_update, 4), " ", incremental.get_changes())
+        print("")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
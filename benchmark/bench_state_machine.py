@@ -0,0 +1,83 @@
+# Benchmark of the construction of a state machine and of the lookup of the transitions of each vertex,
+# the adjacency lists of the vertices against the previous scan of all the transitions
+# Usage : python -m benchmark.bench_state_machine [nb_transitions ...]
+import random
+import sys
+import time
+
+from state.state_machine import StateMachine
+
+
+def build_state_machine(nb_transitions, nb_per_state=5, seed=0):
+    # Flat states with nb_per_state transitions each, a fifth of them internal
+    rand = random.Random(seed)
+    nb_states = max(nb_transitions // nb_per_state, 1)
+    sm = StateMachine()
+    names = ["S%d" % num for num in range(nb_states)]
+    for name in names:
+        sm.add_state(name, '|')
+    for num in range(nb_transitions):
+        name = names[num // nb_per_state]
+        if num % 5 == 0:
+            sm.add_event(name, None, None, None)
+        else:
+            sm.add_transition(name, rand.choice(names), None, None, None)
+    return sm
+
+
+def lookup_scan(vertices, transitions):
+    # Previous lookup : scan of all the transitions for each vertex
+    nb_found = 0
+    for vertex in vertices:
+        nb_found += len([transition for transition in transitions if transition.source is vertex])
+        nb_found += len([transition for transition in transitions if transition.target is vertex])
+    return nb_found
+
+
+def lookup_adjacency(vertices):
+    nb_found = 0
+    for vertex in vertices:
+        nb_found += len(vertex.outgoing())
+        nb_found += len(vertex.incoming())
+    return nb_found
+
+
+def main():
+    all_nb_transitions = [int(arg) for arg in sys.argv[1:]] or [10000, 50000]
+
+    for nb_transitions in all_nb_transitions:
+        start = time.perf_counter()
+        sm = build_state_machine(nb_transitions)
+        time_build = time.perf_counter() - start
+
+        vertices = list(sm.get_all_vertices().values())
+        transitions = [transition for region in sm.region for transition in region.transition]
+
+        # The scan is quadratic, measured on a sample of the vertices
+        sample = vertices[:100]
+        start = time.perf_counter()
+        nb_scan = lookup_scan(sample, transitions)
+        time_scan = (time.perf_counter() - start) * len(vertices) / len(sample)
+
+        start = time.perf_counter()
+        nb_adjacency = lookup_adjacency(sample)
+        lookup_adjacency(vertices)
+        time_adjacency = time.perf_counter() - start
+
+        start = time.perf_counter()
+        sm.get_simple_graph()
+        time_graph = time.perf_counter() - start
+
+        print("Transitions          = ", nb_transitions)
+        print("Vertices             = ", len(vertices))
+        print("Build (s)            = ", round(time_build, 3))
+        print("Scan, estimated (s)  = ", round(time_scan, 3))
+        print("Adjacency (s)        = ", round(time_adjacency, 4))
+        print("Same transitions     = ", nb_scan == nb_adjacency)
+        print("Simple graph (s)     = ", round(time_graph, 3))
+        print("")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
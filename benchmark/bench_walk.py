@@ -0,0 +1,65 @@
+# Benchmark of the source walker against the former os.walk with per file checks
+# Usage : python -m benchmark.bench_walk [nb_files] [nb_excluded_files]
+import os
+import sys
+import tempfile
+import time
+
+from benchmark.synthetic_tree import generate_cpp_tree
+from constant_mode import MODE_GENERATE_CPP_SRC
+from source_walker import ScanRules, walk_source_files
+
+
+def is_good_file_former(root, name):
+    # Former checks of the source mode, done for every file
+    if "VSB-CALIA4-SMP" in root or "library" in root or "LibsSiso" in root:
+        return False
+    answer = (".h" in name and not ".hap" in name) or ".cpp" in name
+    return answer and name not in ["ClsGigEVision.cpp"]
+
+
+def walk_former(folder_input):
+    # Former walker : excluded folders are still listed
+    source_files = []
+    nb_visited = 0
+    for root, dirs, files in os.walk(folder_input):
+        for name in files:
+            nb_visited = nb_visited + 1
+            if is_good_file_former(root, name):
+                source_files.append((root, name))
+    return source_files, nb_visited
+
+
+def main():
+    nb_files = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    nb_excluded_files = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+
+    with tempfile.TemporaryDirectory() as folder:
+        # Sources to scan and third party libraries to skip
+        generate_cpp_tree(os.path.join(folder, "src"), nb_files, nb_lines=10)
+        generate_cpp_tree(os.path.join(folder, "library"), nb_excluded_files, nb_dirs=200, nb_lines=10)
+        rules = ScanRules.from_mode(MODE_GENERATE_CPP_SRC)
+
+        # Warm the file system cache
+        walk_former(folder)
+
+        start = time.perf_counter()
+        files_former, nb_visited_former = walk_former(folder)
+        time_former = time.perf_counter() - start
+
+        start = time.perf_counter()
+        files_walker, nb_dir, nb_visited_walker = walk_source_files(folder, rules)
+        time_walker = time.perf_counter() - start
+
+    print("Source files          = ", len(files_walker))
+    print("Former visited files  = ", nb_visited_former)
+    print("Walker visited files  = ", nb_visited_walker)
+    print("Former walk (s)       = ", round(time_former, 3))
+    print("Walker (s)            = ", round(time_walker, 3))
+    print("Speed up              = ", round(time_former / time_walker, 2))
+    print("Same files            = ", files_former == files_walker)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+# Benchmark of the streaming SMS / SMD writers against the previous writers
+# Usage : python -m benchmark.bench_writer [nb_edges ...]
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from xml.sax.saxutils import escape
+
+from dep_writer import get_dep_edges, write_sms, write_smd
+
+
+def generate_dependencies(nb_edges, nb_includes=10, seed=0):
+    # Scanned files including nb_includes files each, a third of the included files are not scanned
+    rand = random.Random(seed)
+    nb_files = nb_edges // nb_includes
+    names = ["Cls%07d" % i for i in range(nb_files + nb_files // 2)]
+    return {names[num]: rand.sample(names, nb_includes) for num in range(nb_files)}
+
+
+def write_sms_previous(path, dep):
+    # Previous writer : copy of the dependencies then two writes per line
+    depNew = {}
+    for file in dep:
+        for name in dep[file]:
+            if not (name in dep.keys()):
+                depNew[name] = []
+        depNew[file] = dep[file]
+
+    fileSMS = open(path, "w")
+    for file in depNew:
+        fileSMS.write('=' + file + '=')
+        fileSMS.write("\n")
+        for name in depNew[file]:
+            fileSMS.write("->" + name)
+            fileSMS.write("\n")
+    fileSMS.close()
+
+
+def write_smd_previous(path, positions):
+    # Previous writer : four writes per vertex
+    fileSMD = open(path, "w")
+    fileSMD.write('<?xml version="1.0" encoding="UTF-8"?>\n')
+    fileSMD.write('    <body>                            \n')
+    fileSMD.write('        <diagram>                     \n')
+    for id, (x, y) in positions.items():
+        width = str(len(id) * 10)
+        vertex_option = '" background="#ffffcc" show_sub="True" show_actions="True" excluded="False">'
+        fileSMD.write('<vertex id="' + escape(id, {'"': '&quot;'}) + vertex_option + '\n')
+        fileSMD.write('  <rect x="0.0" y="0.0" width="' + width + '" height="25.0"/>\n')
+        fileSMD.write('  <pos x="' + str(x) + '" y="' + str(y) + '"/>\n')
+        fileSMD.write('</vertex>\n')
+    fileSMD.write('    </diagram>     \n')
+    fileSMD.write('</body>            \n')
+    fileSMD.close()
+
+
+def measure(function, *args):
+    # Duration of the call, then peak of the memory allocated during a second call
+    start = time.perf_counter()
+    function(*args)
+    duration = time.perf_counter() - start
+    tracemalloc.start()
+    function(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return duration, peak
+
+
+def main():
+    all_nb_edges = [int(arg) for arg in sys.argv[1:]] or [100000, 1000000]
+
+    for nb_edges in all_nb_edges:
+        dep = generate_dependencies(nb_edges)
+        positions = {id: (float(num), float(num % 100)) for num, id in enumerate(dep)}
+        vertices = [(id, x, y, "#ffffcc") for id, (x, y) in positions.items()]
+
+        with tempfile.TemporaryDirectory() as folder:
+            path_previous = os.path.join(folder, "previous.sms")
+            path_streaming = os.path.join(folder, "streaming.sms")
+            sms_previous = measure(write_sms_previous, path_previous, dep)
+            sms_streaming = measure(lambda: write_sms(path_streaming, get_dep_edges(dep)))
+            with open(path_previous, "rb") as f_previous, open(path_streaming, "rb") as f_streaming:
+                is_same_sms = f_previous.read() == f_streaming.read()
+
+            path_previous = os.path.join(folder, "previous.smd")
+            path_streaming = os.path.join(folder, "streaming.smd")
+            smd_previous = measure(write_smd_previous, path_previous, positions)
+            smd_streaming = measure(write_smd, path_streaming, vertices)
+            with open(path_previous, "rb") as f_previous, open(path_streaming, "rb") as f_streaming:
+                is_same_smd = f_previous.read() == f_streaming.read()
+
+        print("Edges              = ", nb_edges)
+        print("Nodes              = ", len(dep))
+        print("SMS previous (s)   = ", round(sms_previous[0], 3), " peak (MB) = ", round(sms_previous[1] / 1e6, 2))
+        print("SMS streaming (s)  = ", round(sms_streaming[0], 3), " peak (MB) = ", round(sms_streaming[1] / 1e6, 2))
+        print("SMD previous (s)   = ", round(smd_previous[0], 3), " peak (MB) = ", round(smd_previous[1] / 1e6, 2))
+        print("SMD streaming (s)  = ", round(smd_streaming[0], 3), " peak (MB) = ", round(smd_streaming[1] / 1e6, 2))
+        print("Same output        = ", is_same_sms and is_same_smd)
+        print("")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+# Benchmark of the decoding of the attributes of the vertices of a SMD file,
+# eval() and one QColor per vertex against the typed decoding of XMLReader
+# Usage : python -m benchmark.bench_xml_reader [nb_vertices ...]
+import os
+import sys
+import tempfile
+import time
+
+from PySide6.QtCore import QFile, QIODevice, QXmlStreamReader
+from PySide6.QtGui import QColor
+
+from benchmark.bench_smd_layout import generate_layout
+from model.smd_layout import write_smd_xml
+from model.xml_reader import XMLReader
+
+
+def decode_previous(reader, attributes):
+    # Previous decoding of XMLReader.read_StateGItem and read_VertexGItem
+    return (QColor(attributes.value('background')).name(),
+            eval(str(attributes.value('show_sub')) or 'True'),
+            eval(str(attributes.value('show_actions')) or 'True'),
+            eval(str(attributes.value('excluded')) or 'False'))
+
+
+def decode(reader, attributes):
+    return (reader.read_color(attributes, 'background').name(),
+            reader.read_bool(attributes, 'show_sub', True),
+            reader.read_bool(attributes, 'show_actions', True),
+            reader.read_bool(attributes, 'excluded', False))
+
+
+def read_vertex_attributes(path):
+    # Attributes of each vertex of the file, and the reader of the file
+    smd_file = QFile(path)
+    smd_file.open(QIODevice.ReadOnly)
+    reader = XMLReader(smd_file)
+    stream = reader._stream
+    all_attributes = []
+    start = time.perf_counter()
+    while not stream.atEnd():
+        if stream.readNext() == QXmlStreamReader.StartElement and stream.name() == 'vertex':
+            all_attributes.append(stream.attributes())
+    duration = time.perf_counter() - start
+    smd_file.close()
+    return duration, reader, all_attributes
+
+
+def decode_vertices(reader, all_attributes, decode_function):
+    start = time.perf_counter()
+    values = [decode_function(reader, attributes) for attributes in all_attributes]
+    return time.perf_counter() - start, values
+
+
+def main():
+    all_nb_vertices = [int(arg) for arg in sys.argv[1:]] or [20000]
+
+    for nb_vertices in all_nb_vertices:
+        layout = generate_layout(nb_vertices, 0)
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "diagram.smd")
+            write_smd_xml(path, [layout])
+            time_stream, reader, all_attributes = read_vertex_attributes(path)
+        time_previous, values_previous = decode_vertices(reader, all_attributes, decode_previous)
+        time_typed, values = decode_vertices(reader, all_attributes, decode)
+
+        print("Vertices           = ", nb_vertices)
+        print("Stream (s)         = ", round(time_stream, 3))
+        print("eval, QColor (s)   = ", round(time_previous, 3))
+        print("Typed (s)          = ", round(time_typed, 3))
+        print("Same values        = ", values == values_previous)
+        print("")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
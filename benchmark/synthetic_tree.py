@@ -0,0 +1,40 @@
+# Generate synthetic source trees used by the benchmarks
+import os
+import random
+
+
+def generate_cpp_tree(folder, nb_files, nb_includes=8, nb_dirs=20, nb_lines=200, seed=0):
+    """
+    Write nb_files headers and sources spread over nb_dirs folders, each one including
+    nb_includes headers chosen at random. Return the list of written paths.
+    """
+    rand = random.Random(seed)
+    names = ["Cls%05d" % i for i in range(nb_files)]
+    paths = []
+
+    # For each file
+    for num, name in enumerate(names):
+        sub_folder = os.path.join(folder, "dir%03d" % (num % nb_dirs))
+        os.makedirs(sub_folder, exist_ok=True)
+        includes = rand.sample(names, min(nb_includes, nb_files))
+
+        # Header and source of the current class
+        for ext in (".h", ".cpp"):
+            path = os.path.join(sub_folder, name + ext)
+            with open(path, "w") as f:
+                f.write("/*\n * " + name + ext + " : synthetic file\n */\n")
+                if ext == ".h":
+                    f.write("#ifndef " + name.upper() + "_H\n#define " + name.upper() + "_H\n")
+                if ext == ".cpp":
+                    f.write('#include "' + name + '.h"\n')
+                for include in includes:
+                    f.write('#include "' + include + '.h"\n')
+                f.write("#include <vector>\n")
+                f.write('// #include "Commented.h"\n')
+                for num_line in range(nb_lines):
+                    f.write("int " + name + "_" + str(num_line) + " = " + str(num_line) + ";\n")
+                if ext == ".h":
+                    f.write("#endif\n")
+            paths.append(path)
+
+    return paths
@@ -22,9 +22,12 @@ MKDIR Tmp
 CD Tmp
 DEL *.obj
 
+REM Number of parallel jobs, all processors by default
+if "%NB_JOBS%"=="" set NB_JOBS=%NUMBER_OF_PROCESSORS%
+
 REM Run compaign compilation for all headers
-echo C:\Python36\python.exe ..\compileHeaders.py %rootFolderTR%
-CALL C:\Python36\python.exe ..\compileHeaders.py %rootFolderTR%
+echo C:\Python36\python.exe ..\compileHeaders.py %rootFolderTR% -j %NB_JOBS%
+CALL C:\Python36\python.exe ..\compileHeaders.py %rootFolderTR% -j %NB_JOBS%
 
 REM Go back directory
 CD ..
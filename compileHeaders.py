@@ -1,5 +1,10 @@
+import argparse
 import os
 import ntpath
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from queue import Queue
 
 def getNameHeader(line):
 
@@ -55,7 +60,67 @@ def GetCmdsErrorFileName():
 
     return "cmdsError.txt"
 
-def compileHeaders(TR_DIR):
+def GetTimesFileName():
+
+    return "headersTime.txt"
+
+def runCommand(cmd, slots):
+
+    #Take a free slot, each slot has its own Test<slot>.cpp and objects
+    slot = slots.get()
+    try:
+        start = time.perf_counter()
+        result = subprocess.run(cmd + " \"\" " + str(slot), shell=True,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+        duration = time.perf_counter() - start
+    finally:
+        slots.put(slot)
+
+    return result.returncode, duration, result.stdout
+
+def runCommands(cmds, nbJobs):
+
+    #Free slots of the pool
+    slots = Queue()
+    for slot in range(nbJobs):
+        slots.put(slot)
+
+    status = {}
+    durations = {}
+    nbDone = 0
+
+    #Run commands into a bounded pool, print results as they finish
+    with ThreadPoolExecutor(max_workers=nbJobs) as executor:
+        futures = {executor.submit(runCommand, cmd, slots): cmd for cmd in cmds}
+        for future in as_completed(futures):
+            cmd = futures[future]
+            status[cmd], durations[cmd], output = future.result()
+            nbDone = nbDone + 1
+
+            #Display result
+            state = "OK  " if status[cmd] == 0 else "FAIL"
+            print("[%d/%d] %s %7.2fs %s" % (nbDone, len(cmds), state, durations[cmd], cmd))
+            if status[cmd] != 0:
+                print(output)
+
+    return status, durations
+
+def writeTimes(durations, nbSlowest=10):
+
+    #Slowest headers first
+    slowest = sorted(durations.items(), key=lambda item: item[1], reverse=True)
+
+    #Write all times
+    with open(GetTimesFileName(), "w") as f:
+        for cmd, duration in slowest:
+            f.write("%.2f %s\n" % (duration, cmd))
+
+    #Display the slowest
+    print("Slowest headers :")
+    for cmd, duration in slowest[:nbSlowest]:
+        print("%7.2fs %s" % (duration, cmd))
+
+def compileHeaders(TR_DIR, nbJobs=1):
 
     #Define the commande compile bat
     CMD_COMPILE_BAT = "..\\compileOneHeader.bat"
@@ -89,15 +154,19 @@ def compileHeaders(TR_DIR):
                     cmd = CMD_COMPILE_BAT + " " + path + " " + TR_DIR
                     cmds.append(cmd)
         
-    #For each cmd
+    #Remove end of lines and empty lines
+    cmds = [cmd.replace("\n", "") for cmd in cmds]
+    cmds = [cmd for cmd in cmds if len(cmd) > 0]
+
+    #Execute commands into the pool
+    status, durations = runCommands(cmds, nbJobs)
+    writeTimes(durations)
+
+    #For each cmd, in the order of the commands
     for cmd in cmds:
-    
-        #execute command
-        cmd = cmd.replace("\n", "")
-        status = os.system(cmd)
         
         #If status fail
-        if status != 0:
+        if status[cmd] != 0:
             cmdsError[cmd] = cmd
             
             
@@ -127,3 +196,13 @@ def compileHeaders(TR_DIR):
         if os.path.exists(cmdsErrorFileName) :        
             #Remove file errors
             os.remove(cmdsErrorFileName) 
+
+if __name__ == "__main__":
+
+    #Arguments : TR directory and number of jobs
+    parser = argparse.ArgumentParser(description="Compile each header alone")
+    parser.add_argument("TR_DIR")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    compileHeaders(args.TR_DIR, max(args.jobs, 1))
@@ -0,0 +1,121 @@
+import json
+import math
+
+import numpy as np
+
+from graph_analysis import get_strongly_connected_components, get_component_of, get_component_reachability
+
+
+# -----------------------------------------------
+#   Compile cost of the headers
+#   - total lines : lines of all files pulled in by including the file, itself included
+#   - nb tu       : number of translation units including the file, at any depth
+#   - cost        : total lines * nb tu, lines compiled because of the file over the build
+# -----------------------------------------------
+
+# Rows of the reachability matrix unpacked at once
+COST_BLOCK_SIZE = 1024
+
+# Colors of the weights, from the default background to red
+COLOR_LIGHT = (0xff, 0xff, 0xcc)
+COLOR_HEAVY = (0xff, 0x33, 0x00)
+
+
+class CompileCost:
+
+    def __init__(self, name, nb_line, total_lines, nb_tu):
+        # Init attributes
+        self.name = name
+        self.nb_line = nb_line
+        self.total_lines = total_lines
+        self.nb_tu = nb_tu
+        self.cost = total_lines * nb_tu
+
+
+def get_compile_costs(graph, nb_lines, translation_units):
+    """
+    Return the list of CompileCost of each node of the graph, most expensive first.
+    - nb_lines          : dictionary name -> number of lines of the file
+    - translation_units : names of the nodes compiled as a translation unit
+    Files of a cycle pull in each other, they have the same total lines.
+    """
+    names = graph.names
+    components = get_strongly_connected_components(graph)
+    component_of = get_component_of(graph.get_nb_node(), components)
+    reach = get_component_reachability(graph, components, component_of)
+    nb_component = len(components)
+
+    # Lines and translation units of each component
+    lines = np.zeros(nb_component, dtype=np.int64)
+    units = np.zeros(nb_component, dtype=np.int64)
+    for node, name in enumerate(names):
+        lines[component_of[node]] += nb_lines.get(name, 0)
+        if name in translation_units:
+            units[component_of[node]] += 1
+
+    total_lines = np.zeros(nb_component, dtype=np.int64)
+    nb_tu = np.zeros(nb_component, dtype=np.int64)
+    nb_byte = (nb_component + 7) // 8
+
+    # For each block of components, unpack the reachable components as a matrix of booleans
+    for begin in range(0, nb_component, COST_BLOCK_SIZE):
+        end = min(begin + COST_BLOCK_SIZE, nb_component)
+        data = b''.join((reach[num] | (1 << num)).to_bytes(nb_byte, 'little') for num in range(begin, end))
+        matrix = np.unpackbits(np.frombuffer(data, dtype=np.uint8).reshape(end - begin, nb_byte),
+                               axis=1, bitorder='little')[:, :nb_component]
+
+        # Lines pulled in by each component, translation units reaching each component
+        total_lines[begin:end] = matrix @ lines
+        nb_tu += units[begin:end] @ matrix
+
+    # Cost of each node, most expensive first
+    costs = [CompileCost(name, nb_lines.get(name, 0), int(total_lines[component_of[node]]),
+                         int(nb_tu[component_of[node]])) for node, name in enumerate(names)]
+    costs.sort(key=lambda cost: (-cost.cost, -cost.total_lines, cost.name))
+    return costs
+
+
+def write_compile_cost_report(path, costs):
+    # Ranked report, one file per line
+    with open(path, "w") as f:
+        f.write("%6s %12s %10s %8s %8s %s\n" % ("rank", "cost", "total", "lines", "tu", "file"))
+        for rank, cost in enumerate(costs):
+            f.write("%6d %12d %10d %8d %8d %s\n" %
+                    (rank + 1, cost.cost, cost.total_lines, cost.nb_line, cost.nb_tu, cost.name))
+
+
+def get_weights(costs):
+    """
+    Return a dictionary name -> weight between 0 and 1, on a log scale.
+    The cost is used if there is any translation unit, the total lines otherwise.
+    """
+    values = [cost.cost for cost in costs]
+    if max(values, default=0) == 0:
+        values = [cost.total_lines for cost in costs]
+    maximum = math.log1p(max(values, default=0))
+
+    # For each file
+    weights = {}
+    for cost, value in zip(costs, values):
+        weights[cost.name] = math.log1p(value) / maximum if maximum > 0 else 0.0
+    return weights
+
+
+def get_weight_color(weight):
+    # Color of a weight, #rrggbb
+    return "#" + "".join("%02x" % round(light + (heavy - light) * weight)
+                         for light, heavy in zip(COLOR_LIGHT, COLOR_HEAVY))
+
+
+def write_weights(path, weights):
+    with open(path, "w") as f:
+        json.dump(weights, f, indent=2, sort_keys=True)
+
+
+def read_weights(path):
+    # Weights written by write_weights, empty if no file
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
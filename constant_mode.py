@@ -0,0 +1,10 @@
+# Modes of generation of the dependencies, without any Qt import
+MODE_GENERATE_NO = "No"
+MODE_GENERATE_CPP_SRC = "source"
+MODE_GENERATE_CPP_HEADER = "header"
+MODE_GENERATE_PHP = "php"
+MODE_GENERATE_PY = "python"
+MODE_GENERATE_XML = "Xml"
+MODE_GENERATE_DOT = "MyDot"
+ALL_MODES = [MODE_GENERATE_CPP_SRC, MODE_GENERATE_CPP_HEADER,
+             MODE_GENERATE_PHP, MODE_GENERATE_PY, MODE_GENERATE_XML, MODE_GENERATE_NO, MODE_GENERATE_DOT]
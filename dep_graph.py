@@ -0,0 +1,125 @@
+import json
+from array import array
+
+
+# -----------------------------------------------
+#   Dependency graph with integer nodes
+#   Names are interned once, edges are stored in CSR form :
+#   the children of node n are targets[offsets[n]:offsets[n + 1]]
+# -----------------------------------------------
+
+
+def write_dep_graph(path, graph, translation_units=()):
+    # Full scan graph : all the nodes, the dependencies of each file and the sources merged with their header
+    with open(path, "w") as f:
+        json.dump({"nodes": graph.names, "dependencies": graph.to_dict(),
+                   "translation_units": sorted(translation_units)}, f)
+
+
+def read_dep_graph(path):
+    # Return (graph, translation_units) written by write_dep_graph
+    with open(path, "r") as f:
+        data = json.load(f)
+    return DepGraph.from_dict(data["dependencies"], data["nodes"]), set(data["translation_units"])
+
+
+class DepGraph:
+
+    def __init__(self, names, offsets, targets, nb_key=None):
+        # Init attributes
+        self.names = names
+        self.index = {name: num for num, name in enumerate(names)}
+        self.offsets = offsets
+        self.targets = targets
+        # Nodes which were a key of the dictionary, they are the first ones
+        self.nb_key = len(names) if nb_key is None else nb_key
+
+    @classmethod
+    def from_dict(cls, dependencies, list_node=()):
+        """
+        Build the graph from a dictionary name -> dependencies.
+        Nodes are the keys in their order, then the other nodes sorted by name.
+        """
+        # Keys first to keep the order of the dictionary
+        names = list(dependencies.keys())
+        index = {name: num for num, name in enumerate(names)}
+        nb_key = len(names)
+
+        # Other nodes : dependencies which are not a key and isolated nodes
+        others = set(list_node)
+        for name in names:
+            others.update(dependencies[name])
+        for name in sorted(others.difference(index)):
+            index[name] = len(names)
+            names.append(name)
+
+        # Edges of the keys, the other nodes have no child
+        offsets = array('I', [0])
+        targets = array('I')
+        for name in names[:nb_key]:
+            targets.extend(index[target] for target in dependencies[name])
+            offsets.append(len(targets))
+        offsets.extend([len(targets)] * (len(names) - nb_key))
+
+        return cls(names, offsets, targets, nb_key)
+
+    def to_dict(self):
+        # Dictionary name -> list of dependencies, keys are the keys of the original dictionary
+        names = self.names
+        offsets = self.offsets
+        targets = self.targets
+        return {names[node]: [names[target] for target in targets[offsets[node]:offsets[node + 1]]]
+                for node in range(self.nb_key)}
+
+    def get_nb_node(self):
+        return len(self.names)
+
+    def get_nb_edge(self):
+        return len(self.targets)
+
+    def get_id(self, name):
+        return self.index[name]
+
+    def get_name(self, node):
+        return self.names[node]
+
+    def get_children(self, node):
+        # Copy of the children of the node
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def get_edges(self):
+        # Iterate over (source, target)
+        offsets = self.offsets
+        targets = self.targets
+        for node in range(len(self.names)):
+            for num_edge in range(offsets[node], offsets[node + 1]):
+                yield node, targets[num_edge]
+
+    def get_reversed(self):
+        # Same nodes, each edge reversed, counting sort on the targets
+        nb_node = len(self.names)
+        counts = [0] * (nb_node + 1)
+        for target in self.targets:
+            counts[target + 1] = counts[target + 1] + 1
+        for node in range(nb_node):
+            counts[node + 1] = counts[node + 1] + counts[node]
+
+        offsets = array('I', counts)
+        targets = array('I', [0]) * len(self.targets)
+        position = counts[:nb_node]
+        for source, target in self.get_edges():
+            targets[position[target]] = source
+            position[target] = position[target] + 1
+
+        return DepGraph(self.names, offsets, targets)
+
+    def get_without_edges(self, removed_edges):
+        # Same nodes, without the edges (source, target) of removed_edges
+        offsets = array('I', [0])
+        targets = array('I')
+        for node in range(len(self.names)):
+            for num_edge in range(self.offsets[node], self.offsets[node + 1]):
+                if (node, self.targets[num_edge]) not in removed_edges:
+                    targets.append(self.targets[num_edge])
+            offsets.append(len(targets))
+        return DepGraph(self.names, offsets, targets, self.nb_key)
@@ -0,0 +1,78 @@
+from xml.sax.saxutils import escape
+
+
+# -----------------------------------------------
+#   Streaming writers of the SMS and SMD of a dependency graph
+#   Lines are produced by generators and written through a large buffer,
+#   the dependencies are never copied
+# -----------------------------------------------
+
+# Size of the write buffer in bytes
+WRITE_BUFFER_SIZE = 1 << 20
+
+SMD_HEADER = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+              '    <body>                            \n'
+              '        <diagram>                     \n')
+SMD_FOOTER = ('    </diagram>     \n'
+              '</body>            \n')
+
+
+def get_dep_nodes(dep):
+    """
+    Generate (name, dependencies) of each node, files included but not scanned have no dependency.
+    A file included but not scanned comes just before the first file including it.
+    """
+    leaves = set()
+
+    # For each file
+    for file, names in dep.items():
+
+        # For each dependency not scanned, first time only
+        for name in names:
+            if name not in dep and name not in leaves:
+                leaves.add(name)
+                yield name, ()
+
+        yield file, names
+
+
+def get_dep_edges(dep):
+    # Generate the edges (file, name) grouped by file, (file, None) for a file without dependency
+    for file, names in get_dep_nodes(dep):
+        if len(names) == 0:
+            yield file, None
+        for name in names:
+            yield file, name
+
+
+def get_sms_lines(edges):
+    # Lines of the SMS, a header when the file changes then one line per dependency
+    current = None
+    for file, name in edges:
+        if file != current:
+            current = file
+            yield '=' + file + '=\n'
+        if name is not None:
+            yield '->' + name + '\n'
+
+
+def write_sms(path, edges):
+    with open(path, "w", buffering=WRITE_BUFFER_SIZE) as f:
+        f.writelines(get_sms_lines(edges))
+
+
+def get_smd_lines(vertices):
+    # Lines of the SMD, vertices are (id, x, y, background)
+    option = '" show_sub="True" show_actions="True" excluded="False">\n'
+    for id, x, y, background in vertices:
+        yield ('<vertex id="' + escape(id, {'"': '&quot;'}) + '" background="' + background + option +
+               '  <rect x="0.0" y="0.0" width="' + str(len(id) * 10) + '" height="25.0"/>\n'
+               '  <pos x="' + str(x) + '" y="' + str(y) + '"/>\n'
+               '</vertex>\n')
+
+
+def write_smd(path, vertices):
+    with open(path, "w", buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(SMD_HEADER)
+        f.writelines(get_smd_lines(vertices))
+        f.write(SMD_FOOTER)
@@ -519,6 +519,7 @@ def test_update_from_dot():
     folderInput = GetDependenciesPathCode()
     dependMainPy(folderInput)
 
-# Call test function
-test_update_from_dot()
-# main_dep_cpp()
\ No newline at end of file
+# Call test function, only when run as a script
+if __name__ == "__main__":
+    test_update_from_dot()
+    # main_dep_cpp()
\ No newline at end of file
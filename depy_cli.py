@@ -0,0 +1,74 @@
+import argparse
+import os
+import sys
+import time
+
+from constant_mode import ALL_MODES, MODE_GENERATE_CPP_HEADER, MODE_GENERATE_NO
+from generate_dot import generate_dot_from_source, get_dep_from_dot, generate_dot_from_pyreverse
+from mode_generate_dep import ModeGenerateDep
+
+
+# -----------------------------------------------
+#   Headless dependency pipeline : scan -> analyze -> dot / sms / smd
+#   No Qt module is imported, the settings are the arguments instead of config.json
+# -----------------------------------------------
+
+
+def get_arguments():
+    parser = argparse.ArgumentParser(description="Generate the dependencies of a source folder without GUI")
+    parser.add_argument("folder", help="folder of the source code")
+    parser.add_argument("-m", "--mode", default=MODE_GENERATE_CPP_HEADER,
+                        choices=[mode for mode in ALL_MODES if mode != MODE_GENERATE_NO],
+                        help="mode of generation, default " + MODE_GENERATE_CPP_HEADER)
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="number of scan workers")
+    parser.add_argument("--no-cache", action="store_true", help="do not use the scan cache")
+    parser.add_argument("--reduce", action="store_true", help="remove the redundant includes from the dot file")
+    parser.add_argument("--no-graphviz", action="store_true", help="built-in layout even if dot is installed")
+    parser.add_argument("--update-smd", action="store_true", help="rewrite the smd even if it exists")
+    parser.add_argument("--no-sms", action="store_true", help="stop after the dot file")
+    return parser.parse_args()
+
+
+def generate(args):
+    # Same steps as the command "Update dependencies" of the main window
+    mode_generate_dep = ModeGenerateDep(args.mode, args.folder)
+    dot_name_path = mode_generate_dep.get_dot_name_path()
+
+    # If python mode
+    if mode_generate_dep.is_python():
+        # Get dependencies from py reverse
+        dependencies = generate_dot_from_pyreverse(args.folder, dot_name_path, mode_generate_dep.dot_name)
+    elif mode_generate_dep.is_dot():
+        # Get dependencies from dot directly
+        dependencies = get_dep_from_dot(dot_name_path)
+    else:
+        # Get dependencies from source
+        cache_path = None if args.no_cache else mode_generate_dep.get_scan_cache_path()
+        dependencies = generate_dot_from_source(args.folder, dot_name_path, args.mode, args.jobs,
+                                                cache_path=cache_path, reduce_graph=args.reduce,
+                                                cost_report_path=mode_generate_dep.get_cost_report_path(),
+                                                weights_path=mode_generate_dep.get_weights_path(),
+                                                graph_path=mode_generate_dep.get_graph_path())
+
+    # Generate SMS and SMD into the folder of the mode
+    if not args.no_sms:
+        os.makedirs(os.path.dirname(mode_generate_dep.get_sms_smd_name()), exist_ok=True)
+        mode_generate_dep.update_smd = args.update_smd
+        mode_generate_dep.use_graphviz = not args.no_graphviz
+        mode_generate_dep.generate_sms_smd(dependencies)
+
+
+def main():
+    args = get_arguments()
+    if not os.path.isdir(args.folder):
+        print("Folder is not found : " + args.folder)
+        return 1
+
+    start = time.perf_counter()
+    generate(args)
+    print("Duration (s) = %.3f" % (time.perf_counter() - start))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
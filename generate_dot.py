@@ -1,9 +1,19 @@
+import io
 import os
 import ntpath
 import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 
-from browse_dep import display_dependencies
-from mode_generate_dep import ModeGenerateDep
+from browse_dep import display_dependencies, display_cycles
+from compile_cost import get_compile_costs, get_weights, write_compile_cost_report, write_weights
+from constant_mode import MODE_GENERATE_CPP_HEADER, MODE_GENERATE_CPP_SRC, MODE_GENERATE_PHP, MODE_GENERATE_XML
+from dep_graph import DepGraph, write_dep_graph
+from impact import get_file_graph
+from graph_analysis import get_cycles, get_redundant_includes, get_reduced_graph
+from include_extractor import INCLUDE_QUOTED, get_includes, get_includes_file, get_nb_line_buffer
+from scan_cache import ScanCache, get_hash_buffer
+from source_walker import ScanRules, walk_source_files
 
 
 # -----------------------------------------------
@@ -25,24 +35,22 @@ def get_dependencies_line_cpp(line):
     return nameHeader
 
 
-def get_dependencies_file_cpp(path):
-    print(path)
+def get_dependencies_stat_cpp(path):
+    # Quoted and angle includes with their kind, outside comments and #if 0 blocks
+    return get_includes_file(path, classify=True)
 
-    # get date of the current file
-    with open(path, "r") as f:
-        data = f.readlines()
 
-    includes = set()
-    sharpInc = "#include"
+def get_dependencies_file_cpp(path):
+    return [name for name, kind in get_dependencies_stat_cpp(path)[0]]
 
-    # For each lines
-    for d in data:
-        if sharpInc in d:
-            nameHeader = get_dependencies_line_cpp(d)
-            if len(nameHeader) > 0:
-                includes.add(nameHeader)
 
-    return list(includes)
+def get_project_includes(includes, project_files):
+    # Quoted includes, and angle includes of a scanned file : <vector> or <QtCore/QString> are not nodes
+    names = {}
+    for name, kind in includes:
+        if kind == INCLUDE_QUOTED or name in project_files:
+            names[name] = None
+    return list(names)
 
 
 # -------------- PHP Mode ----------------------
@@ -63,43 +71,50 @@ def get_dependencies_line_php(line):
     return nameSpace
 
 
-def get_dependencies_file_php(path):
-    # get date of the current file
-    with open(path, "r", encoding='utf-8') as f:
-        data = f.readlines()
-
-    includes = set()
+def get_dependencies_lines_php(lines):
+    # Ordered set, the order of the includes does not depend on the process
+    includes = {}
     sharpInc = "use "
+    nb_line = 0
 
     # For each lines
-    for d in data:
+    for d in lines:
+        nb_line = nb_line + 1
         if sharpInc in d:
             nameHeader = get_dependencies_line_php(d)
             if len(nameHeader) > 0:
-                includes.add(nameHeader)
+                includes[nameHeader] = None
 
-    return list(includes)
+    return list(includes), nb_line
 
 
-# -------------- XML Mode ----------------------
+def get_dependencies_stat_php(path):
+    # Read the current file line by line, in one pass
+    with open(path, "r", encoding='utf-8') as f:
+        return get_dependencies_lines_php(f)
 
 
-def get_dependencies_file_xml(path):
-    # get data of the current file
-    with open(path, "r", encoding='utf-8') as f:
-        data = f.readlines()
+def get_dependencies_file_php(path):
+    return get_dependencies_stat_php(path)[0]
+
+
+# -------------- XML Mode ----------------------
 
+
+def get_dependencies_lines_xml(lines):
     # Regular expression
-    regexp_service = ".*<service.*id=\"(.*)\".*class=\"(.*)\".*"
-    regexp_dependency = ".*<argument.*id=\"(.*)\".*"
+    regexp_service = re.compile(".*<service.*id=\"(.*)\".*class=\"(.*)\".*")
+    regexp_dependency = re.compile(".*<argument.*id=\"(.*)\".*")
     current_name = "NOT_FOUND"
     all_dependencies = {}
     dependencies = []
+    nb_line = 0
 
     # For each lines
-    for d in data:
+    for d in lines:
+        nb_line = nb_line + 1
         # search if service is found
-        search_service = re.search(regexp_service, d)
+        search_service = regexp_service.search(d)
         # If new services is found
         if search_service is not None:
             # If dependencies are found
@@ -111,7 +126,7 @@ def get_dependencies_file_xml(path):
             current_name = search_service[1].replace(".","-")
         else:
             # search if dependency is found
-            search_dependency = re.search(regexp_dependency, d)
+            search_dependency = regexp_dependency.search(d)
             # If new dependency is found
             if search_dependency is not None:
                 # Add new dependency
@@ -124,26 +139,63 @@ def get_dependencies_file_xml(path):
         dependencies = []
 
     # Return all dependencies
-    return all_dependencies
+    return all_dependencies, nb_line
+
+
+def get_dependencies_stat_xml(path):
+    # Read the current file line by line, in one pass
+    with open(path, "r", encoding='utf-8') as f:
+        return get_dependencies_lines_xml(f)
+
+
+def get_dependencies_file_xml(path):
+    return get_dependencies_stat_xml(path)[0]
 
 
 # --------- For each mode -----------------------
 
 
 def get_nb_line(path):
-    # get date of the current file
+    # Count lines without building the list of lines
+    nb_line = 0
     with open(path, "r", encoding='utf-8') as f:
-        data = f.readlines()
+        for d in f:
+            nb_line = nb_line + 1
+
+    return nb_line
+
+
+def get_dependencies_stat(path, mode_file):
+    # Return dependencies and number of lines, reading the file once
+    if mode_file == MODE_GENERATE_PHP:
+        return get_dependencies_stat_php(path)
+    if mode_file == MODE_GENERATE_XML:
+        return get_dependencies_stat_xml(path)
+    if mode_file == MODE_GENERATE_CPP_SRC or mode_file == MODE_GENERATE_CPP_HEADER:
+        return get_dependencies_stat_cpp(path)
+    return {}, get_nb_line(path)
 
-    return len(data)
+
+def get_dependencies_buffer(data, mode_file):
+    # Same result as get_dependencies_stat from the content of the file
+    if mode_file == MODE_GENERATE_CPP_SRC or mode_file == MODE_GENERATE_CPP_HEADER:
+        return get_includes(data, classify=True), get_nb_line_buffer(data)
+
+    # Lines as read from a text file
+    lines = io.StringIO(data.decode('utf-8'), newline=None)
+    if mode_file == MODE_GENERATE_PHP:
+        return get_dependencies_lines_php(lines)
+    if mode_file == MODE_GENERATE_XML:
+        return get_dependencies_lines_xml(lines)
+    return {}, sum(1 for d in lines)
 
 
 def get_dependencies_file(path, mode_file):
-    if mode_file == ModeGenerateDep.MODE_GENERATE_PHP:
+    if mode_file == MODE_GENERATE_PHP:
         return get_dependencies_file_php(path)
-    if mode_file == ModeGenerateDep.MODE_GENERATE_XML:
+    if mode_file == MODE_GENERATE_XML:
         return get_dependencies_file_xml(path)
-    if mode_file == ModeGenerateDep.MODE_GENERATE_CPP_SRC or mode_file == ModeGenerateDep.MODE_GENERATE_CPP_HEADER:
+    if mode_file == MODE_GENERATE_CPP_SRC or mode_file == MODE_GENERATE_CPP_HEADER:
         return get_dependencies_file_cpp(path)
     return {}
 
@@ -155,47 +207,137 @@ def clean_file(name):
     return name
 
 
-def is_good_file(root, name, mode_file):
-    # If CALIA4 SMP
-    if "VSB-CALIA4-SMP" in root:
-        return False
-    # If library
-    if "library" in root:
-        return False
-    # If LibsSiso
-    if "LibsSiso" in root:
-        return False
-
-    # If mode XML
-    if mode_file == ModeGenerateDep.MODE_GENERATE_XML:
-        # PHP in name
-        return "manager.xml" in name or "admin-sonata.xml" in name
-
-    # If mode PHP
-    if mode_file == ModeGenerateDep.MODE_GENERATE_PHP:
-        # PHP in name
-        return ".php" in name
-
-    # Good if header
-    answer = ".h" in name and (not ".hap" in name)
-
-    # If mode source
-    if mode_file == ModeGenerateDep.MODE_GENERATE_CPP_SRC:
-        # Good also if source
-        answer = answer or ".cpp" in name
-
-    # List of exception
-    exception = [
-        "ClsGigEVision.cpp"
-    ]
-
-    # If ok for this time
-    if answer:
-        # True only if the current name is not an exception
-        answer = name not in exception
+# -------------------------------
+#   Scan engine
+# -------------------------------
 
-    # Return answer
-    return answer
+
+# Default number of files parsed by a worker in one batch
+SCAN_CHUNK_SIZE = 64
+
+
+def get_source_files(folder_input, mode_file, scan_rules=None):
+    # Excluded folders are pruned from the walk
+    source_files, nb_dir, nb_visited = walk_source_files(folder_input, ScanRules.from_mode(mode_file, scan_rules))
+
+    # Return files in walk order and number of folders
+    return source_files, nb_dir
+
+
+def get_dependencies_source(root, name, mode_file, with_hash=False):
+    # Read header and get include and statistics in one pass
+    path = os.path.join(root, name)
+    if not with_hash:
+        return get_dependencies_stat(path, mode_file)
+
+    # The hash for the scan cache is computed from the same read
+    with open(path, "rb") as f:
+        data = f.read()
+    return get_dependencies_buffer(data, mode_file) + (get_hash_buffer(data),)
+
+
+def get_dependencies_batch(batch, mode_file, with_hash=False):
+    # Parse each file of the batch, used as the unit of work of a worker
+    return [get_dependencies_source(root, name, mode_file, with_hash) for root, name in batch]
+
+
+def get_dependencies_sources(source_files, mode_file, nb_workers=1, chunk_size=SCAN_CHUNK_SIZE, with_hash=False):
+    """
+    Parse all source files and return a list of (dependencies, nb_line) in the same order
+    as source_files, whatever the number of workers.
+
+    - nb_workers : number of processes, 1 parses serially, 0 or None uses all the cpus
+    - chunk_size : number of files sent to a worker at once
+    - with_hash  : if True return (dependencies, nb_line, hash of the content)
+    """
+    # If serial mode
+    if nb_workers == 1 or len(source_files) <= chunk_size:
+        return get_dependencies_batch(source_files, mode_file, with_hash)
+
+    # Split the paths in batches
+    batches = [source_files[i:i + chunk_size] for i in range(0, len(source_files), chunk_size)]
+    results = []
+
+    # Parse batches into the pool, map keeps the order of the batches
+    with ProcessPoolExecutor(max_workers=nb_workers or None) as executor:
+        for batch_result in executor.map(get_dependencies_batch, batches, repeat(mode_file), repeat(with_hash)):
+            results.extend(batch_result)
+
+    return results
+
+
+def add_dependencies_source(dep, listNode, name, dependencies, mode_file):
+    # Clean name
+    name = name.replace(".php", "")
+
+    # if source
+    if ".cpp" in name:
+        # replace source to header
+        name = name.replace(".cpp", ".h")
+        # If name into incs
+        if name in dependencies:
+            # remove from the list
+            dependencies.remove(name)
+
+    # If XML mode
+    if mode_file == MODE_GENERATE_XML:
+        # Variables dependencies is already a dictionary
+        # It's build into get_dependencies_file_xml
+        all_dependencies = dependencies
+    else:
+        # Create a dictionary with just one element to be homogenous
+        all_dependencies = {name: dependencies}
+
+    # For each couple current_name <-> dependencies
+    for current_name, dependencies in all_dependencies.items():
+        # For each incs
+        for my_dependency in dependencies:
+            # Add current inc
+            listNode.add(my_dependency)
+        # Add current name
+        listNode.add(current_name)
+
+        # If dependencies
+        if len(dependencies) > 0:
+            # If not first file
+            if current_name in dep:
+                for my_dependency in dependencies:
+                    dep[current_name].add(my_dependency)
+            else:
+                dep[current_name] = set(dependencies)
+
+    # Return the name of the node of the file
+    return name
+
+
+def get_dependencies_sources_cached(source_files, mode_file, scan_cache, nb_workers=1, chunk_size=SCAN_CHUNK_SIZE):
+    # Init
+    results = []
+    changed_files = []
+    changed_index = []
+
+    # Get unchanged files from the cache
+    for root, name in source_files:
+        result = scan_cache.get(os.path.join(root, name))
+        # If the file has to be parsed again
+        if result is None:
+            changed_index.append(len(results))
+            changed_files.append((root, name))
+        results.append(result)
+
+    # Parse only changed files, each file is read once for its dependencies and its hash
+    changed_results = get_dependencies_sources(changed_files, mode_file, nb_workers, chunk_size, with_hash=True)
+
+    # Store new results into the cache and into the list
+    for index, (root, name), (dependencies, nb_line, file_hash) in zip(changed_index, changed_files,
+                                                                       changed_results):
+        scan_cache.put(os.path.join(root, name), dependencies, nb_line, file_hash)
+        results[index] = (dependencies, nb_line)
+
+    # Drop deleted files and write the cache
+    scan_cache.save()
+
+    return results
 
 
 # -------------------------------
@@ -203,71 +345,62 @@ def is_good_file(root, name, mode_file):
 # -------------------------------
 
 
-def generate_dot_from_source(folder_input, dot_name_path, mode_file):
+def generate_dot_from_source(folder_input, dot_name_path, mode_file, nb_workers=1, chunk_size=SCAN_CHUNK_SIZE,
+                             cache_path=None, reduce_graph=False, scan_rules=None, cost_report_path=None,
+                             weights_path=None, graph_path=None):
     # Init
     dep = {}
     listNode = set()
     nb_line_tot = 0
     nb_files = 0
-    nb_dir = 0
-
-    # For each files
-    for root, dirs, files in os.walk(folder_input):
-        nb_dir = nb_dir + len(dirs)
-        # For each file into current folder
-        for name in files:
-            # If the file matches with current mode
-            if is_good_file(root, name, mode_file):
-                # Read header and get include
-                path = os.path.join(root, name)
-                dependencies = get_dependencies_file(path, mode_file)
-
-                # Statistics
-                nb_line = get_nb_line(path)
-                nb_line_tot = nb_line_tot + nb_line
-                nb_files = nb_files + 1
-
-                # Clean name
-                name = name.replace(".php", "")
-
-                # if source
-                if ".cpp" in name:
-                    # replace source to header
-                    name = name.replace(".cpp", ".h")
-                    # If name into incs
-                    if name in dependencies:
-                        # remove from the list
-                        dependencies.remove(name)
-
-                # If XML mode
-                if mode_file == ModeGenerateDep.MODE_GENERATE_XML:
-                    # Variables dependencies is already a dictionary
-                    # It's build into get_dependencies_file_xml
-                    all_dependencies = dependencies
-                else:
-                    # Create a dictionary with just one element to be homogenous
-                    all_dependencies = {name: dependencies}
-
-                # For each couple current_name <-> dependencies
-                for current_name, dependencies in all_dependencies.items():
-                    # For each incs
-                    for my_dependency in dependencies:
-                        # Add current inc
-                        listNode.add(my_dependency)
-                    # Add current name
-                    listNode.add(current_name)
-
-                    # If dependencies
-                    if len(dependencies) > 0:
-                        # If not first file
-                        if current_name in dep:
-                            for my_dependency in dependencies:
-                                dep[current_name].add(my_dependency)
-                        else:
-                            dep[current_name] = set(dependencies)
+    nb_lines = {}
+    translation_units = set()
+    file_includes = []
+
+    # Get all files matching with current mode
+    source_files, nb_dir = get_source_files(folder_input, mode_file, scan_rules)
+
+    # Parse all files, serially or into a process pool
+    if cache_path is None:
+        results = get_dependencies_sources(source_files, mode_file, nb_workers, chunk_size)
+    else:
+        # Parse only files changed since the last scan
+        scan_cache = ScanCache(cache_path, mode_file)
+        results = get_dependencies_sources_cached(source_files, mode_file, scan_cache, nb_workers, chunk_size)
+        scan_cache.close()
+        print("Nb Files from cache = ", scan_cache.nb_hit)
+
+    # Angle includes are kept only if they are files of the project
+    is_cpp = mode_file == MODE_GENERATE_CPP_SRC or mode_file == MODE_GENERATE_CPP_HEADER
+    project_files = set(name for root, name in source_files) if is_cpp else None
+
+    # Merge in walk order so that the output does not depend on the workers
+    for (root, name), (dependencies, nb_line) in zip(source_files, results):
+        # Statistics
+        nb_line_tot = nb_line_tot + nb_line
+        nb_files = nb_files + 1
+        if is_cpp:
+            dependencies = get_project_includes(dependencies, project_files)
+        file_includes.append(list(dependencies))
+
+        # Add dependencies of the current file
+        node = add_dependencies_source(dep, listNode, name, dependencies, mode_file)
+
+        # A source is merged with its header : it's a translation unit, its lines are not included
+        if ".cpp" in name:
+            translation_units.add(node)
+        else:
+            nb_lines[node] = nb_lines.get(node, 0) + nb_line
+
+    # Names are interned once, the analyses work on integers
+    graph = DepGraph.from_dict(dep, listNode)
+
+    # Graph of the files for the impact queries, a source is not merged with its header
+    if graph_path is not None:
+        write_dep_graph(graph_path, *get_file_graph(folder_input, source_files, file_includes))
 
     # Display all path from a node to an other
-    display_dependencies(dep, listNode)
+    display_dependencies(graph)
 
     # -------------- Error Analyse -------------------
 
@@ -281,41 +414,43 @@ def generate_dot_from_source(folder_input, dot_name_path, mode_file):
 
     print("")
     print("------------------------------------")
-    print("file A include file B and vice versa")
-    # For each file
-    for file in dep:
-        for name in dep[file]:
-            if name in dep.keys():
-                if file in dep[name]:
-                    print(name + "<->" + file)
+    print("include cycles")
+    # Cycles of more than one file, the self includes are above
+    display_cycles([(cycle, files) for cycle, files in get_cycles(graph) if len(files) > 1])
 
     print("")
     print("------------------------------------")
     print("file A include file B include file C but file A include file C")
 
-    # For each fileA in list of file
-    for fileA in dep:
-
-        # For each fileB in fileA dep
-        for fileB in dep[fileA]:
-
-            # dep in fileB
-            if fileB in dep.keys():
-
-                # For each fileC in fileB dep
-                for fileC in dep[fileB]:
-
-                    # For each fileD in fileA dep
-                    for fileD in dep[fileA]:
-
-                        # If fileD equal fileC
-                        if fileD == fileC:
-
-                            # If A B C all different
-                            if fileA != fileB and fileA != fileC and fileB != fileC:
-                                print("dependencies")
-                                print(fileA + "<->" + fileB + "<->" + fileC)
-                                print(fileA + "<->" + fileC)
+    # Redundant includes at any depth
+    redundant = get_redundant_includes(graph)
+    for fileA, fileB, fileC in redundant:
+        print("dependencies")
+        print(fileA + "<->" + fileB + "<->" + fileC)
+        print(fileA + "<->" + fileC)
+
+    # -------------- Compile Cost -------------------
+
+    # If a report or weights are requested
+    if cost_report_path is not None or weights_path is not None:
+        costs = get_compile_costs(graph, nb_lines, translation_units)
+        print("")
+        print("------------------------------------")
+        print("most expensive files : cost total_lines nb_tu")
+        for cost in costs[:10]:
+            print(cost.name, cost.cost, cost.total_lines, cost.nb_tu)
+
+        # Ranked report
+        if cost_report_path is not None:
+            write_compile_cost_report(cost_report_path, costs)
+
+        # Weights of the nodes of the diagram, names as into the dot file
+        if weights_path is not None:
+            weights = {}
+            for name, weight in get_weights(costs).items():
+                nameOnly = clean_file(name)
+                weights[nameOnly] = max(weight, weights.get(nameOnly, 0.0))
+            write_weights(weights_path, weights)
 
     # -------------- Export Graph -------------------
 
@@ -327,22 +462,29 @@ def generate_dot_from_source(folder_input, dot_name_path, mode_file):
 
     # Init
     depNew = {}
+    offsets = graph.offsets
+
+    # Export the graph without redundant includes
+    graphExport = get_reduced_graph(graph, redundant) if reduce_graph else graph
+
+    # Clean each name once
+    namesOnly = [clean_file(name) for name in graph.names]
 
     # For each file
-    for file in dep:
+    for file in range(graph.nb_key):
 
         # Init tab
         array_file = []
-        fileOnly = clean_file(file)
+        fileOnly = namesOnly[file]
 
         # For each dependency
-        for name in dep[file]:
-            if name in dep.keys():
-                if len(dep[name]) > 0:
-                    # Compute name and store into new dependencies
-                    nameOnly = clean_file(name)
-                    out.write("\"" + fileOnly + "\" -> \"" + nameOnly + "\"\n")
-                    array_file.append(nameOnly)
+        for name in graphExport.get_children(file):
+            # If the dependency is a file with dependencies
+            if name < graph.nb_key and offsets[name + 1] > offsets[name]:
+                # Store into new dependencies
+                nameOnly = namesOnly[name]
+                out.write("\"" + fileOnly + "\" -> \"" + nameOnly + "\"\n")
+                array_file.append(nameOnly)
 
         # If not empty
         if len(array_file) > 0:
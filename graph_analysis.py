@@ -0,0 +1,286 @@
+from collections import deque
+
+
+# -----------------------------------------------
+#   Analysis of a dependency graph (DepGraph)
+#   The loops iterate over the flat offsets/targets arrays of the graph
+# -----------------------------------------------
+
+
+def get_strongly_connected_components(graph):
+    """
+    Iterative Tarjan algorithm, no recursion limit.
+    Return the list of components (list of nodes), in reverse topological order.
+    """
+    offsets = graph.offsets
+    targets = graph.targets
+    nb_node = graph.get_nb_node()
+    order = [-1] * nb_node
+    low = [0] * nb_node
+    on_stack = [False] * nb_node
+    stack = []
+    components = []
+    counter = 0
+
+    # For each node not yet visited
+    for start in range(nb_node):
+        if order[start] >= 0:
+            continue
+
+        # Visit the start node
+        order[start] = low[start] = counter
+        counter = counter + 1
+        stack.append(start)
+        on_stack[start] = True
+        work = [(start, offsets[start])]
+
+        # Depth first search with an explicit stack of (node, number of the next edge)
+        while work:
+            node, num_edge = work[-1]
+
+            # If a child has to be visited
+            if num_edge < offsets[node + 1]:
+                work[-1] = (node, num_edge + 1)
+                child = targets[num_edge]
+                if order[child] < 0:
+                    order[child] = low[child] = counter
+                    counter = counter + 1
+                    stack.append(child)
+                    on_stack[child] = True
+                    work.append((child, offsets[child]))
+                elif on_stack[child] and order[child] < low[node]:
+                    low[node] = order[child]
+            else:
+                # All children are visited
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+
+                # If root of a component
+                if low[node] == order[node]:
+                    component = []
+                    while True:
+                        child = stack.pop()
+                        on_stack[child] = False
+                        component.append(child)
+                        if child == node:
+                            break
+                    components.append(component)
+
+    return components
+
+
+def get_component_of(nb_node, components):
+    # Number of the component of each node
+    component_of = [0] * nb_node
+    for num_component, component in enumerate(components):
+        for node in component:
+            component_of[node] = num_component
+    return component_of
+
+
+def get_roots(graph, components):
+    """
+    Return one root per source component of the condensed graph, in topological order.
+    All nodes are reachable from the roots.
+    """
+    component_of = get_component_of(graph.get_nb_node(), components)
+
+    # Components with an input edge from an other component
+    has_input = [False] * len(components)
+    for node, child in graph.get_edges():
+        if component_of[child] != component_of[node]:
+            has_input[component_of[child]] = True
+
+    # Smallest node of each source component, in topological order
+    return [min(components[num]) for num in reversed(range(len(components))) if not has_input[num]]
+
+
+def get_bfs_tree(graph, roots):
+    """
+    Breadth first search from all the roots at once.
+    Return (order, level, parent) where order is the order of visit.
+    """
+    offsets = graph.offsets
+    targets = graph.targets
+    nb_node = graph.get_nb_node()
+    level = [-1] * nb_node
+    parent = [-1] * nb_node
+    order = []
+
+    # All roots are at level 0
+    queue = deque(roots)
+    for root in roots:
+        level[root] = 0
+
+    # While not empty
+    while queue:
+        node = queue.popleft()
+        order.append(node)
+        for num_edge in range(offsets[node], offsets[node + 1]):
+            child = targets[num_edge]
+            if level[child] < 0:
+                level[child] = level[node] + 1
+                parent[child] = node
+                queue.append(child)
+
+    return order, level, parent
+
+
+def get_path(names, parent, node):
+    # Path from the root to node into the BFS tree
+    path = [names[node]]
+    while parent[node] >= 0:
+        node = parent[node]
+        path.append(names[node])
+    path.reverse()
+    return path
+
+
+def get_long_paths(graph, excluded=()):
+    """
+    Return the list of (path_long, path_short) : path_long ends by an include of a node
+    already reached by path_short, which is not longer.
+
+    One SCC pass gives the roots of the graph, then one BFS from all roots reports
+    each include going to a node of the same or of a lower level.
+    """
+    names = graph.names
+    roots = get_roots(graph, get_strongly_connected_components(graph))
+    order, level, parent = get_bfs_tree(graph, roots)
+    excluded = set(excluded)
+    long_paths = []
+
+    # For each node in order of visit
+    for node in order:
+        for child in graph.get_children(node):
+            # If the child is already reached and it's not a self include
+            if child != node and level[child] <= level[node] and names[child] not in excluded:
+                path_long = get_path(names, parent, node) + [names[child]]
+                path_short = get_path(names, parent, child)
+                long_paths.append((path_long, path_short))
+
+    return long_paths
+
+
+def get_component_reachability(graph, components, component_of):
+    """
+    Return for each component the bitset (python int) of the components reachable
+    by a path of at least one edge into the condensed graph.
+    """
+    offsets = graph.offsets
+    targets = graph.targets
+    reach = [0] * len(components)
+
+    # Components are in reverse topological order : successors are computed first
+    for num_component, component in enumerate(components):
+        bits = 0
+        for node in component:
+            for num_edge in range(offsets[node], offsets[node + 1]):
+                num_child = component_of[targets[num_edge]]
+                if num_child != num_component:
+                    bits |= reach[num_child] | (1 << num_child)
+        reach[num_component] = bits
+
+    return reach
+
+
+def get_redundant_includes(graph):
+    """
+    Return the list of (file_a, file_b, file_c) : file_a includes file_c directly
+    while file_c is also reached from file_a through file_b, at any depth.
+
+    Includes inside a cycle are never redundant, the reduction is done on the
+    graph of the strongly connected components.
+    """
+    names = graph.names
+    components = get_strongly_connected_components(graph)
+    component_of = get_component_of(graph.get_nb_node(), components)
+    reach = get_component_reachability(graph, components, component_of)
+    redundant = []
+
+    # For each node
+    for node in range(graph.get_nb_node()):
+        num_component = component_of[node]
+        children = graph.get_children(node)
+
+        # Components reached through an other component
+        indirect = 0
+        for child in children:
+            num_child = component_of[child]
+            if num_child != num_component:
+                indirect |= reach[num_child]
+
+        # Fast path : no include reached twice
+        if indirect == 0:
+            continue
+
+        # For each include also reached indirectly
+        for child in children:
+            num_child = component_of[child]
+            if num_child != num_component and (indirect >> num_child) & 1:
+                # First include leading to the same file
+                for via in children:
+                    if (reach[component_of[via]] >> num_child) & 1 and component_of[via] != num_component:
+                        redundant.append((names[node], names[via], names[child]))
+                        break
+
+    return redundant
+
+
+def get_reduced_graph(graph, redundant):
+    # Copy of the graph without the redundant includes
+    index = graph.index
+    return graph.get_without_edges(set((index[file_a], index[file_c]) for file_a, file_b, file_c in redundant))
+
+
+def get_shortest_cycle(graph, component_of, start):
+    # Shortest cycle through start, the search stays into the component of start
+    num_component = component_of[start]
+    parent = {start: -1}
+    queue = deque([start])
+
+    # While not empty
+    while queue:
+        node = queue.popleft()
+        for child in graph.get_children(node):
+            # Back to the start : build the path
+            if child == start:
+                cycle = [node]
+                while parent[node] >= 0:
+                    node = parent[node]
+                    cycle.append(node)
+                cycle.reverse()
+                return cycle
+            if component_of[child] == num_component and child not in parent:
+                parent[child] = node
+                queue.append(child)
+
+    return [start]
+
+
+def get_cycles(graph):
+    """
+    Return the list of include cycles as (cycle, files), one per strongly connected component.
+    - cycle : minimal witness path, the shortest cycle through the first file of the
+      component, the last file includes the first one
+    - files : all files of the component, sorted
+    A self include is a cycle of one file.
+    """
+    names = graph.names
+    components = get_strongly_connected_components(graph)
+    component_of = get_component_of(graph.get_nb_node(), components)
+    cycles = []
+
+    # For each component in topological order
+    for component in reversed(components):
+        start = min(component)
+        # A single file is a cycle only if it includes itself
+        if len(component) == 1 and start not in graph.get_children(start):
+            continue
+        cycle = get_shortest_cycle(graph, component_of, start)
+        cycles.append(([names[node] for node in cycle], sorted(names[node] for node in component)))
+
+    return cycles
@@ -0,0 +1,65 @@
+import re
+import shutil
+import subprocess
+
+from sugiyama_layout import get_layout_sugiyama
+
+
+# -----------------------------------------------
+#   Position of the nodes of a dependency graph
+#   Positions are in points, y goes down, same coordinates as the SVG of Graphviz
+# -----------------------------------------------
+
+# Points per inch, unit of the plain output of Graphviz
+POINTS_PER_INCH = 72
+
+# Line of a node into the plain output : node name x y ...
+PLAIN_NODE_PATTERN = re.compile(r'^node ("(?:[^"\\]|\\.)*"|\S+) (\S+) (\S+) ', re.MULTILINE)
+
+
+def get_plain_name(name):
+    # Names with special characters are quoted and escaped
+    if name.startswith('"'):
+        return re.sub(r'\\(.)', r'\1', name[1:-1])
+    return name
+
+
+def get_plain_layout(plain):
+    # Positions of the nodes from the plain output of Graphviz
+    positions = {}
+    for match in PLAIN_NODE_PATTERN.finditer(plain):
+        x = float(match.group(2)) * POINTS_PER_INCH
+        y = -float(match.group(3)) * POINTS_PER_INCH
+        positions[get_plain_name(match.group(1))] = (x, y)
+    return positions
+
+
+def get_layout_graphviz(dot_name_path):
+    """
+    Return the positions of the nodes of the dot file computed by Graphviz,
+    None if dot is not installed or if the layout failed.
+    One subprocess, the layout is read from its output without any SVG.
+    """
+    dot_path = shutil.which("dot")
+    if dot_path is None:
+        return None
+
+    # Layout only, plain text output
+    result = subprocess.run([dot_path, "-Tplain", dot_name_path], capture_output=True, text=True)
+    if result.returncode != 0:
+        print("dot failed on " + dot_name_path)
+        print(result.stderr)
+        return None
+
+    return get_plain_layout(result.stdout)
+
+
+def get_layout(dot_name_path, dependencies, use_graphviz=True):
+    # Layout of Graphviz, the built-in layered layout if dot is not found or not used
+    positions = get_layout_graphviz(dot_name_path) if use_graphviz else None
+    if positions is None:
+        if use_graphviz:
+            print("dot layout is not available, built-in layout is used")
+            print("sudo apt install graphviz")
+        positions = get_layout_sugiyama(dependencies)
+    return positions
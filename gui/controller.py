@@ -6,6 +6,35 @@ from state.state import State
 from state.transition_kind import TransitionKind
 
 
+def create_vertex_gi(vertex):
+    if isinstance(vertex, State):
+        return StateGItem()
+    elif isinstance(vertex, PseudoState):
+        return PseudoStateGItem()
+    else:
+        raise 'oula'
+
+
+def get_parent_name(element):
+    # Name of the state containing a vertex or a transition, None at the top level
+    parent_state = element.container.state
+    return parent_state.name if parent_state else None
+
+
+def get_vertex_signature(vertex):
+    # What the item of a vertex shows, by value : its kind, its parent, its actions and its note
+    if isinstance(vertex, State):
+        internals = tuple(transition.get_str() for transition in vertex.outgoing()
+                          if transition.kind == TransitionKind.internal)
+        return State, get_parent_name(vertex), str(vertex.entry), str(vertex.exit), vertex.note, internals
+    return PseudoState, get_parent_name(vertex), vertex.kind
+
+
+def get_transition_signature(transition):
+    # What the item of a transition shows, by value, besides its id : its text, its kind and its parent
+    return transition.get_str(), transition.kind, get_parent_name(transition)
+
+
 class Controller(object):
     """Load a state machine into the diagram
 
@@ -19,8 +48,10 @@ class Controller(object):
 
     def __init__(self, scene):
         self._scene = scene
+        self._sm = None
         self._sm_vertices = {}  # id:vertex
         self._sm_transitions = {}  # id:transition
+        self._vertex_signatures = {}  # id:what the vertex item shows
 
     def _load_regions(self, regions):
         for vertex in regions[0].subVertex:
@@ -76,12 +107,30 @@ class Controller(object):
             vertex_gi.setSelected(True)
 
     def load_sm(self, sm, placer):
+        """Load the state machine into the scene
+
+        The first load assigns its model to every item. The next ones compare the state
+        machine with the previous one by value, vertex name and transition id, and only
+        touch the items which changed. The other items are only given their new model.
+        """
+        is_loaded = self._sm is not None
+        old_transitions = self._sm_transitions
+        old_signatures = self._vertex_signatures
         self._sm = sm
         self._sm_vertices = {}
+        self._sm_transitions = {}
         self._scene.set_sm(sm)
         if self._sm.region:
             self._load_regions(self._sm.region)
+        self._vertex_signatures = {vertex_id: get_vertex_signature(vertex)
+                                   for (vertex_id, vertex) in self._sm_vertices.items()}
 
+        if is_loaded:
+            self._load_changes(old_transitions, old_signatures, placer)
+        else:
+            self._load_all(placer)
+
+    def _load_all(self, placer):
         # Detach their model from all vertices and transitions items and remove them from the scene
         for trans_gi in self._scene._transitions_gi.values():
             trans_gi.set_model(None, None, None)
@@ -106,12 +155,7 @@ class Controller(object):
         # Create orphan vertices
         for (vertex_id, vertex) in orphan_vertices:
             # self._scene.add_vertex_gi(vertex.name, vertex_gi)
-            if isinstance(vertex, State):
-                vertex_gi = StateGItem()
-            elif isinstance(vertex, PseudoState):
-                vertex_gi = PseudoStateGItem()
-            else:
-                raise 'oula'
+            vertex_gi = create_vertex_gi(vertex)
             vertex_gi.set_model(vertex)
             self._scene.add_vertex_gi(vertex_id, vertex_gi)
 
@@ -183,3 +227,103 @@ class Controller(object):
         for (trans_id, trans) in self._sm_transitions.items():
             trans_gi = self._scene.get_transition_gi(trans_id)
             trans_gi.update_visibility()
+
+    def _set_parent(self, item_gi, parent_name):
+        if parent_name:
+            item_gi.setParentItem(self._scene.get_vertex_gi(parent_name))
+        else:
+            if item_gi.parentItem():
+                item_gi.setParentItem(None)
+            if not item_gi.scene():
+                self._scene.addItem(item_gi)
+
+    def _load_changes(self, old_transitions, old_signatures, placer):
+        scene = self._scene
+
+        # Items of the vertices no longer in the model, or whose kind changed, are removed at the end
+        removed_vertices_gi = []
+        for (vertex_id, old_signature) in old_signatures.items():
+            signature = self._vertex_signatures.get(vertex_id)
+            if signature is None or signature[0] is not old_signature[0]:
+                removed_vertices_gi.append(scene.get_vertex_gi(vertex_id))
+                scene.del_vertex_gi(vertex_id)
+        removed_ids = set(vertex_id for vertex_id in old_signatures if not scene.get_vertex_gi(vertex_id))
+
+        # Create the new vertex items, assign their model to the changed ones, only rebind the others
+        new_vertices = []
+        moved_ids = set()
+        for (vertex_id, signature) in self._vertex_signatures.items():
+            vertex = self._sm_vertices[vertex_id]
+            vertex_gi = scene.get_vertex_gi(vertex_id)
+            if vertex_gi is None:
+                vertex_gi = create_vertex_gi(vertex)
+                vertex_gi.set_model(vertex)
+                scene.add_vertex_gi(vertex_id, vertex_gi)
+                new_vertices.append(vertex)
+                moved_ids.add(vertex_id)
+            elif signature != old_signatures[vertex_id]:
+                vertex_gi.set_model(vertex)
+                if signature[1] != old_signatures[vertex_id][1]:
+                    moved_ids.add(vertex_id)
+            else:
+                vertex_gi.rebind_model(vertex)
+            if removed_ids and signature[1] in removed_ids:
+                moved_ids.add(vertex_id)
+
+        # Build the hierarchy of the new and moved vertex items, place the new ones
+        for vertex_id in moved_ids:
+            self._set_parent(scene.get_vertex_gi(vertex_id), get_parent_name(self._sm_vertices[vertex_id]))
+        placer.place_vertices(scene, new_vertices)
+
+        # Remove transitions no longer in model
+        for trans_id in old_transitions:
+            if trans_id not in self._sm_transitions:
+                trans_gi = scene.get_transition_gi(trans_id)
+                if trans_gi:
+                    trans_gi.set_model(None, None, None)
+                    if trans_gi.scene():
+                        scene.removeItem(trans_gi)
+                    scene.del_transition_gi(trans_id)
+
+        # Create and place the new transitions, rebuild the changed ones and those of the moved vertices
+        changed_transitions_gi = []
+        for (trans_id, trans) in self._sm_transitions.items():
+            old_trans = old_transitions.get(trans_id)
+            if old_trans is not None and not (moved_ids and (
+                    trans.source.name in moved_ids or trans.target.name in moved_ids or
+                    get_parent_name(trans) in removed_ids)):
+                if trans is old_trans:
+                    continue
+                if get_transition_signature(trans) == get_transition_signature(old_trans):
+                    scene.get_transition_gi(trans_id).rebind_model(trans)
+                    continue
+            trans_gi = scene.get_transition_gi(trans_id)
+            source_gi = scene.get_vertex_gi(trans.source.name)
+            target_gi = scene.get_vertex_gi(trans.target.name)
+            if trans_gi is None:
+                trans_gi = TransitionGItem()
+                trans_gi.set_model(trans, source_gi, target_gi)
+                scene.add_transition_gi(trans_id, trans_gi)
+                self._set_parent(trans_gi, get_parent_name(trans))
+                placer.place_transition(trans_gi)
+                changed_transitions_gi.append(trans_gi)
+            else:
+                trans_gi.set_model(trans, source_gi, target_gi)
+                self._set_parent(trans_gi, get_parent_name(trans))
+                trans_gi.rebuild_path(False)
+                trans_gi.rebuild_rules(False)
+                changed_transitions_gi.append(trans_gi)
+
+        # Remove vertices no longer in model, their remaining children have been moved
+        for vertex_gi in removed_vertices_gi:
+            vertex_gi.set_model(None)
+            if vertex_gi.scene():
+                scene.removeItem(vertex_gi)
+            elif vertex_gi.parentItem():
+                vertex_gi.setParentItem(None)
+
+        # Update the visibility of the new vertices and the changed transitions
+        for vertex in new_vertices:
+            scene.get_vertex_gi(vertex.name).update_visibility()
+        for trans_gi in changed_transitions_gi:
+            trans_gi.update_visibility()
@@ -152,6 +152,12 @@ class GraphicsScene(QGraphicsScene):
             # Rebuild path
             transition.rebuild_path(False)
 
+    def rebuild_paths(self):
+        # Paths of the transitions depend on the config, rebuild them then repaint
+        for transition in self._transitions_gi.values():
+            transition.rebuild_path(False)
+        self.update()
+
     def removeSelected(self):
 
         # For each vertex
@@ -56,9 +56,8 @@ class StateGItem(VertexGItem):
             if self._model.exit:
                 lines.append('exit /%s' % str(self._model.exit))
 
-            container = self._model.container
-            for transition in container.transition:
-                if transition.kind == TransitionKind.internal and transition.source is self._model:
+            for transition in self._model.outgoing():
+                if transition.kind == TransitionKind.internal:
                     lines.append(transition.get_str())
 
             self._actions_text = '\n'.join(lines)
@@ -90,6 +90,10 @@ class TransitionGItem(QGraphicsPathItem):
         self._target_gi = target_gi
         self._text_gi.set_model(model)
 
+    def rebind_model(self, model):
+        # Same transition into a new state machine : the ends, the text and the path are kept
+        self._model = model
+
     def is_transition_to_self(self):
         return self._model.source is self._model.target
 
@@ -41,6 +41,10 @@ class VertexGItem(QGraphicsItem):
     def set_model(self, model):
         self._model = model
 
+    def rebind_model(self, model):
+        # Same vertex into a new state machine : the item is not updated
+        self._model = model
+
     def boundingRect(self):
         return self._rect.adjusted(-ClickZone.HalfWidth, -ClickZone.HalfWidth, ClickZone.HalfWidth, ClickZone.HalfWidth)
 
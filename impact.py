@@ -0,0 +1,157 @@
+import argparse
+import os
+import posixpath
+import sys
+import time
+
+from dep_graph import DepGraph, read_dep_graph
+
+
+# -----------------------------------------------
+#   Impact of changed files
+#   Which sources must be rebuilt if some files change : all sources including them, at any depth
+# -----------------------------------------------
+
+
+def get_relative_path(folder_input, root, name):
+    # Key of a scanned file : its path relative to the scanned folder, with / separators
+    return os.path.relpath(os.path.join(root, name), folder_input).replace(os.sep, "/")
+
+
+def is_source(path):
+    return ".cpp" in posixpath.basename(path)
+
+
+def get_file_graph(folder_input, source_files, includes):
+    """
+    Return (graph, translation_units) of the scanned files, keyed by their relative path.
+    Each source is its own node. The includes are names without folder : an include is the file
+    of this name into the folder of the including file, otherwise all the files of this name.
+    """
+    paths = [get_relative_path(folder_input, root, name) for root, name in source_files]
+    by_name = {}
+    for path in paths:
+        by_name.setdefault(posixpath.basename(path), []).append(path)
+
+    # Ordered set of the included files of each file
+    dependencies = {}
+    for path, names in zip(paths, includes):
+        folder = posixpath.dirname(path)
+        targets = {}
+        for name in names:
+            candidates = by_name.get(name, [])
+            local = posixpath.join(folder, name)
+            for target in ([local] if local in candidates else candidates):
+                if target != path:
+                    targets[target] = None
+        dependencies[path] = list(targets)
+
+    return DepGraph.from_dict(dependencies), [path for path in paths if is_source(path)]
+
+
+def is_same_file(path, other):
+    # True if a path is the other one or a part of it, paths relative to different folders
+    return path == other or path.endswith("/" + other) or other.endswith("/" + path)
+
+
+class ImpactIndex:
+
+    def __init__(self, graph, translation_units=()):
+        # Init attributes, the reversed graph gives the files including each file
+        self.graph = graph
+        self.reversed = graph.get_reversed()
+        self.translation_units = set(translation_units)
+        self.by_name = {}
+        for node, path in enumerate(graph.names):
+            self.by_name.setdefault(posixpath.basename(path), []).append(node)
+
+    @classmethod
+    def from_dict(cls, dependencies, translation_units=()):
+        return cls(DepGraph.from_dict(dependencies), translation_units)
+
+    @classmethod
+    def from_graph(cls, graph_path):
+        # Graph of the scanned files written by generate_dot_from_source
+        return cls(*read_dep_graph(graph_path))
+
+    def get_nodes(self, path):
+        # Nodes of a path, relative to the scanned folder or to an other folder, empty if unknown
+        path = path.replace("\\", "/")
+        while path.startswith("./"):
+            path = path[2:]
+        node = self.graph.index.get(path)
+        if node is not None:
+            return [node]
+        names = self.graph.names
+        return [node for node in self.by_name.get(posixpath.basename(path), []) if is_same_file(path, names[node])]
+
+    def get_impacted(self, changed):
+        """
+        Return (impacted, unknown) :
+        - impacted : paths of the changed files and of all files including them, in order of distance
+        - unknown  : changed files which are not into the graph
+        """
+        offsets = self.reversed.offsets
+        targets = self.reversed.targets
+        visited = bytearray(self.graph.get_nb_node())
+        queue = []
+        unknown = []
+
+        # Changed files first
+        for path in changed:
+            nodes = self.get_nodes(path)
+            if not nodes:
+                unknown.append(path)
+            for node in nodes:
+                if not visited[node]:
+                    visited[node] = 1
+                    queue.append(node)
+
+        # Breadth first search into the reversed graph, the queue is the result
+        num = 0
+        while num < len(queue):
+            node = queue[num]
+            num = num + 1
+            for num_edge in range(offsets[node], offsets[node + 1]):
+                parent = targets[num_edge]
+                if not visited[parent]:
+                    visited[parent] = 1
+                    queue.append(parent)
+
+        names = self.graph.names
+        return [names[node] for node in queue], unknown
+
+    def get_rebuilt(self, changed):
+        # Return (sources to compile again, unknown changed files)
+        impacted, unknown = self.get_impacted(changed)
+        return [path for path in impacted if path in self.translation_units], unknown
+
+
+def main():
+    # Arguments : scan graph and changed files, or changed files from the standard input
+    parser = argparse.ArgumentParser(description="Sources to rebuild when some files change")
+    parser.add_argument("graph", help="scan graph generated by depy next to the dot file, dependencies.graph.json")
+    parser.add_argument("changed", nargs="*", help="changed files, read from the standard input if none")
+    parser.add_argument("--all", action="store_true", help="display all the impacted files, not only the sources")
+    parser.add_argument("--time", action="store_true", help="display the time of the query")
+    args = parser.parse_args()
+
+    changed = args.changed if len(args.changed) > 0 else [line.strip() for line in sys.stdin if line.strip()]
+
+    # Build the index then query it
+    index = ImpactIndex.from_graph(args.graph)
+    start = time.perf_counter()
+    impacted, unknown = index.get_impacted(changed) if args.all else index.get_rebuilt(changed)
+    duration = time.perf_counter() - start
+
+    for name in unknown:
+        print("Unknown file : " + name, file=sys.stderr)
+    for name in impacted:
+        print(name)
+    if args.time:
+        print("Query (ms) = %.3f" % (duration * 1000), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+import re
+from bisect import bisect_right
+
+# Kind of include
+INCLUDE_QUOTED = "quoted"
+INCLUDE_ANGLE = "angle"
+
+# One pattern for the whole buffer : #include and conditional directives
+# It starts with a fixed character so that the regex engine jumps from one '#' to the next
+# Only the file name of the include is captured, without its folder
+DIRECTIVE_PATTERN = re.compile(
+    rb'#[ \t]*(?:include[ \t]*(?:"(?:[^"\n]*[/\\])?(?P<quoted>[^"\n/\\]+)"|<(?:[^>\n]*[/\\])?(?P<angle>[^>\n/\\]+)>)'
+    rb'|(?P<directive>ifdef|ifndef|if|elif|else|endif)\b(?P<argument>[^\n]*))')
+
+# Comment at the end of a directive
+COMMENT_PATTERN = re.compile(rb'//.*|/\*.*')
+
+
+def get_line_before(data, position):
+    # Text between the beginning of the line and position
+    return data[data.rfind(b'\n', 0, position) + 1:position]
+
+
+def get_block_comments(data):
+    # Return begin and end of each /* */ comment, ignoring /* into a // comment or a string
+    begins = []
+    ends = []
+    position = data.find(b'/*')
+
+    # While a comment is found
+    while position >= 0:
+        before = get_line_before(data, position)
+        # If the comment is into a // comment or into a string
+        if b'//' in before or before.count(b'"') % 2 == 1:
+            position = data.find(b'/*', position + 2)
+            continue
+
+        # Search the end of the comment
+        end = data.find(b'*/', position + 2)
+        end = len(data) if end < 0 else end + 2
+        begins.append(position)
+        ends.append(end)
+        position = data.find(b'/*', end)
+
+    return begins, ends
+
+
+def is_if_zero(argument):
+    # True if the argument of #if or #elif is 0
+    return COMMENT_PATTERN.sub(b'', argument).strip() == b'0'
+
+
+def get_includes(data, classify=False):
+    """
+    Return the includes of a C/C++ buffer (bytes) in order of appearance, without duplicates.
+    Includes into comments or into #if 0 blocks are ignored.
+
+    - classify : if True return a list of (name, INCLUDE_QUOTED or INCLUDE_ANGLE)
+    """
+    # Fast path : no include at all
+    if b'include' not in data:
+        return []
+
+    # Ordered set of includes
+    includes = {}
+    # Block comments, only if there is any
+    comment_begins, comment_ends = get_block_comments(data) if b'/*' in data else ([], [])
+    # Stack of conditional blocks, True if the block is an active #if 0
+    conditions = []
+    # Number of active #if 0 into the stack
+    nb_skip = 0
+
+    # For each directive of the buffer
+    for match in DIRECTIVE_PATTERN.finditer(data):
+        position = match.start()
+
+        # A directive must begin its line, this also excludes // comments
+        if get_line_before(data, position).strip() != b'':
+            continue
+
+        # If into a block comment
+        num_comment = bisect_right(comment_begins, position) - 1
+        if num_comment >= 0 and position < comment_ends[num_comment]:
+            continue
+
+        # Name of the last group : quoted, angle or argument
+        kind = match.lastgroup
+
+        # If conditional directive
+        if kind == 'argument':
+            directive = match.group('directive')
+            if directive == b'endif':
+                if conditions and conditions.pop():
+                    nb_skip = nb_skip - 1
+            elif directive == b'else' or directive == b'elif':
+                # The alternative of #if 0 is compiled, unless it's an #elif 0
+                skip = directive == b'elif' and is_if_zero(match.group('argument'))
+                if conditions and conditions[-1] != skip:
+                    conditions[-1] = skip
+                    nb_skip = nb_skip + (1 if skip else -1)
+            else:
+                skip = directive == b'if' and is_if_zero(match.group('argument'))
+                conditions.append(skip)
+                if skip:
+                    nb_skip = nb_skip + 1
+
+        # If include outside of #if 0
+        elif nb_skip == 0:
+            if kind == 'quoted':
+                includes[(match.group('quoted'), INCLUDE_QUOTED)] = None
+            else:
+                includes[(match.group('angle'), INCLUDE_ANGLE)] = None
+
+    # Decode names
+    names = {}
+    for name, kind in includes:
+        name = name.decode('utf-8', 'surrogateescape')
+        if classify:
+            names[(name, kind)] = None
+        else:
+            names[name] = None
+
+    return list(names)
+
+
+def get_nb_line_buffer(data):
+    # Same count as iterating over the lines of the file
+    nb_line = data.count(b'\n')
+    if len(data) > 0 and not data.endswith(b'\n'):
+        nb_line = nb_line + 1
+    return nb_line
+
+
+def get_includes_file(path, classify=False):
+    # Read the whole file at once and return its includes and its number of lines
+    with open(path, "rb") as f:
+        data = f.read()
+
+    return get_includes(data, classify), get_nb_line_buffer(data)
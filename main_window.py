@@ -2,25 +2,31 @@ import functools
 import os
 
 from PySide6.QtCore import QFile, QIODevice, Qt, QByteArray, QSettings, QFileInfo, QDir, QFileSystemWatcher, QEvent, \
-    QCoreApplication
+    QCoreApplication, QTimer
 from PySide6.QtGui import QBrush, QKeySequence, QPalette, QColor, QTextDocument, QPainter, QActionGroup, QAction
 from PySide6.QtPrintSupport import QPrintPreviewDialog
 from PySide6.QtWidgets import QMainWindow, QMessageBox, QHBoxLayout, QCheckBox, QPushButton, QSizePolicy, QLineEdit, \
     QLabel, QTreeWidgetItem, QDockWidget, QTreeWidget, QWidget, QTabWidget, QFileDialog, \
     QToolButton, QVBoxLayout, QApplication
 
+from browse_dep import display_cycles
 from cheat_sheet import CheatSheet
 from compileHeaders import GetCmdsErrorFileName
-from constant_value import MODE_GENERATE_NO
+from compile_cost import read_weights
+from constant_mode import MODE_GENERATE_NO
 from generate_dot import generate_dot_from_pyreverse, get_dep_from_dot, generate_dot_from_source
 from mode_generate_dep import ModeGenerateDep
+from model.compact_reader import CompactReader
+from model.compact_writer import CompactWriter
+from model.diagram_saver import DiagramSaver
+from model.layout_snapshot import get_diagram_layout
+from model.smd_layout import COMPACT_EXTENSION
 from model.xml_reader import XMLReader
-from model.xml_writer import XMLWriter
 from semantics_edit import SemanticsEdit
-from sms_reader import StateMachineBuilder
+from sms_incremental import IncrementalStateMachineBuilder
 from model.state_diagram import StateDiagram
-from state.state_machine import StateMachine
 from status_bar import StatusBar
+from tools.cfg import CFG
 
 ORGANIZATION_NAME = 'Soft'
 ORGANIZATION_DOMAIN='soft.com'
@@ -154,13 +160,19 @@ class MainWindow(QMainWindow):
         self._smd_name = ''
         self._sm = None
         self._dirty = False
+        self._nb_changes = 0
+        self._saved_changes = 0
+        self._nb_saves = 0
         self._build_errors = []
         self._cur_build_error = -1
+        self._sm_builder = IncrementalStateMachineBuilder()
         self._current_file_base = ''
         self._current_rose_base = ''
         self.wrapped = []
         self._borders = []
         self._file_watcher = QFileSystemWatcher()
+        self._cfg_watcher = QFileSystemWatcher([CFG.path_json])
+        self._saver = DiagramSaver(self)
         self._recent_file_actions = []
         self.setAcceptDrops(True)
         self._menu_actions = {}
@@ -291,6 +303,8 @@ class MainWindow(QMainWindow):
              self.semantics_text.dec_state_nesting, 'Ctrl+<'),
             ('', None, None),
             ("Auto colorize all states", self.cmd_auto_colorize, QKeySequence()),
+            ("Colorize by compile cost", self.cmd_colorize_weights, QKeySequence()),
+            ("Display cycles", self.cmd_display_cycles, QKeySequence()),
         ))
 
         viewMenu = self.menuBar().addMenu('View')
@@ -326,6 +340,9 @@ class MainWindow(QMainWindow):
 
         # Connect file watcher
         self._file_watcher.fileChanged.connect(self.file_changed)
+        self._cfg_watcher.fileChanged.connect(self.cfg_file_changed)
+        self._saver.finished.connect(self.save_finished)
+        CFG.add_listener(self.cfg_changed)
         self.update_recent_file_actions()
 
         self.read_settings()
@@ -574,10 +591,25 @@ class MainWindow(QMainWindow):
         if isinstance(wg, StateDiagram):
             wg.auto_colorize()
 
+    def cmd_colorize_weights(self):
+        wg = self._tabs_wg.currentWidget()
+        if isinstance(wg, StateDiagram):
+            wg.colorize_weights(read_weights(self._mode_generate_dep.get_weights_path()))
+
+    def cmd_display_cycles(self):
+        # Cycles of the current state machine
+        if self._sm is not None:
+            print("------------------------------------")
+            print("cycles")
+            # Cycles of more than one state, the internal transitions are loops on a single state
+            display_cycles([(cycle, states) for cycle, states in self._sm.get_cycles() if len(states) > 1])
+
     def compile(self):
-        sm = StateMachine()
-        smb = StateMachineBuilder(sm)
-        res = smb.build_from_string(self.semantics_text.toPlainText())
+        # Only the sections of the changed lines are parsed again when possible
+        smb = self._sm_builder
+        res = smb.update(self.semantics_text.toPlainText().splitlines(),
+                         self.semantics_text.take_first_changed_block())
+        sm = smb.get_state_machine()
 
         self._build_errors = smb.get_errors()
         self._cur_build_error = -1
@@ -616,7 +648,23 @@ class MainWindow(QMainWindow):
             file_base = finf.path() + '/' + finf.completeBaseName()
             self.load_files(file_base)
 
+    def cfg_file_changed(self, path):
+        # An editor may replace the file, watch it again
+        if path not in self._cfg_watcher.files():
+            self._cfg_watcher.addPath(path)
+        CFG.reload()
+
+    def cfg_changed(self, content):
+        # The config may be read again during a paint, rebuild the diagrams after it
+        QTimer.singleShot(0, self.rebuild_diagram_paths)
+
+    def rebuild_diagram_paths(self):
+        for d in self._diagrams:
+            d._scene.rebuild_paths()
+
     def offer_save(self):
+        # A save in progress ends first, the diagram stays dirty if it failed
+        self.wait_save()
         if self._dirty:
             res = QMessageBox.warning(self, SOFTWARE_NAME,
                                       'Save changes to %s before proceeding?' % QDir.toNativeSeparators(
@@ -626,7 +674,7 @@ class MainWindow(QMainWindow):
             if res == QMessageBox.Cancel:
                 return False
             if res == QMessageBox.Save:
-                if not self.cmd_save():
+                if not self.cmd_save() or not self.wait_save():
                     return False
         return True
 
@@ -662,9 +710,17 @@ class MainWindow(QMainWindow):
         else:
             # Get dependencies from source
             mode_file = self._mode_generate_dep.mode
-            dependencies = generate_dot_from_source(folder_input, dot_name_path, mode_file)
+            nb_workers = CFG.get_nb_scan_workers()
+            cache_path = self._mode_generate_dep.get_scan_cache_path()
+            dependencies = generate_dot_from_source(folder_input, dot_name_path, mode_file, nb_workers,
+                                                    cache_path=cache_path, reduce_graph=CFG.is_reduce_graph(),
+                                                    scan_rules=CFG.get_scan_rules(mode_file),
+                                                    cost_report_path=self._mode_generate_dep.get_cost_report_path(),
+                                                    weights_path=self._mode_generate_dep.get_weights_path(),
+                                                    graph_path=self._mode_generate_dep.get_graph_path())
 
         # Generate SMS and SMD
+        self._mode_generate_dep.use_graphviz = CFG.is_graphviz_layout()
         self._mode_generate_dep.generate_sms_smd(dependencies)
 
     def cmd_compile_all(self):
@@ -756,6 +812,9 @@ class MainWindow(QMainWindow):
 
     def load_files(self, file_base):
 
+        # The end of a save in progress must not apply to the loaded files
+        self.wait_save()
+
         # Init sms name and smd name
         self._sms_name = file_base + '.sms'
         self._smd_name = file_base + '.smd'
@@ -785,7 +844,13 @@ class MainWindow(QMainWindow):
                 diagram = self.new_diagram(name)
                 return diagram
 
-            reader = XMLReader(smd_file)
+            # The compact file is read instead of the XML one when it is up to date
+            compact_name = file_base + COMPACT_EXTENSION
+            is_compact = CFG.is_compact_layout() and self.is_up_to_date(compact_name, self._smd_name)
+            if is_compact:
+                reader = CompactReader(compact_name)
+            else:
+                reader = XMLReader(smd_file)
             if not reader.read(diagram_factory):
                 QMessageBox.error(self, SOFTWARE_NAME,
                                   'Error while reading diagram file %s' % QDir.convertSeparators(self._smd_name))
@@ -802,6 +867,9 @@ class MainWindow(QMainWindow):
         QApplication.restoreOverrideCursor()
 
         if success:
+            # Write the compact file for the next load
+            if is_diagram and CFG.is_compact_layout() and not is_compact:
+                CompactWriter(compact_name).write(self._diagrams)
             self.set_current_file(file_base)
             for d in self._diagrams:
                 d.update()
@@ -812,6 +880,10 @@ class MainWindow(QMainWindow):
 
         return success
 
+    def is_up_to_date(self, path, source_path):
+        # True if the file exists and is not older than its source
+        return os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(source_path)
+
     def save_files(self, file_base):
 
         # Init sms name and smd name
@@ -822,41 +894,31 @@ class MainWindow(QMainWindow):
         self._file_watcher.removePath(self._sms_name)
         self._file_watcher.removePath(self._smd_name)
 
-        # open the semantics file
-        sms_file = QFile(self._sms_name)
-        if not sms_file.open(QIODevice.WriteOnly):
-            QMessageBox.warning(self, SOFTWARE_NAME,
-                                'Cannot save semantics to %s' % QDir.convertSeparators(self._sms_name))
-            return False
+        # copy the text and the diagrams, then write them in a thread # todo encoding
+        sms_data = self.semantics_text.toPlainText().encode('Windows-1252')
+        layouts = [get_diagram_layout(d) for d in self._diagrams]
+        self._saved_changes = self._nb_changes
+        self._nb_saves = self._nb_saves + 1
+        self._saver.save(file_base, sms_data, layouts, CFG.is_compact_layout())
 
-        # open the diagram file
-        smd_file = QFile(self._smd_name)
-        is_diagram = True
-        if not smd_file.open(QIODevice.WriteOnly):
-            QMessageBox.warning(self, SOFTWARE_NAME,
-                                'Cannot save diagram to %s' % QDir.convertSeparators(self._smd_name))
-            sms_file.close()
-            return False
-
-        # save diagrams
-        success = True
-        if not XMLWriter(smd_file).write(self._diagrams):
-            success = False
-            QMessageBox.warning(self, SOFTWARE_NAME,
-                                "Failed to save %s" % (self._smd_name))
+        # The diagram stays dirty until the files are written, see save_finished
+        return True
 
-        # save semantics # todo encoding
-        if not sms_file.write(self.semantics_text.toPlainText().encode('Windows-1252')):
-            success = False
-            QMessageBox.warning(self, SOFTWARE_NAME,
-                                "Failed to save %s" % (self._sms_name))
+    def wait_save(self):
+        # End the save in progress and handle its result now, return False if the diagram is still dirty
+        self._saver.wait()
+        QCoreApplication.sendPostedEvents(self, QEvent.MetaCall)
+        return not self._dirty
 
-        sms_file.close()
-        smd_file.close()
+    def save_finished(self, file_base, errors):
+        self._nb_saves = self._nb_saves - 1
+        for error in errors:
+            QMessageBox.warning(self, SOFTWARE_NAME, error)
 
-        self.clear_dirty()
+        # Changes made during the write are not saved
+        if not errors and self._nb_saves == 0 and self._nb_changes == self._saved_changes:
+            self.clear_dirty()
         self.set_current_file(file_base)
-        return success
 
     def set_current_file(self, file_base):
         if self._current_file_base:
@@ -941,6 +1003,7 @@ class MainWindow(QMainWindow):
         return super(MainWindow, self).eventFilter(object, event)
 
     def set_dirty(self):
+        self._nb_changes = self._nb_changes + 1
         if not self._dirty:
             self._dirty = True
             self.setWindowModified(True)
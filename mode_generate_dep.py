@@ -1,10 +1,11 @@
 import os.path
-import re
 import sys
-import pydot
 
-from constant_value import MODE_GENERATE_PY, MODE_GENERATE_DOT, ALL_MODES, MODE_GENERATE_CPP_HEADER, \
+from constant_mode import MODE_GENERATE_PY, MODE_GENERATE_DOT, ALL_MODES, MODE_GENERATE_CPP_HEADER, \
     MODE_GENERATE_CPP_SRC, MODE_GENERATE_PHP, MODE_GENERATE_XML, MODE_GENERATE_NO
+from compile_cost import get_weight_color, read_weights
+from dep_writer import get_dep_edges, get_dep_nodes, write_sms, write_smd
+from graph_layout import get_layout
 
 
 # ---------------------------------------------
@@ -25,10 +26,12 @@ class ModeGenerateDep:
         # Return true if dot mode
         return self.mode == MODE_GENERATE_DOT
 
-    def __init__(self, mode):
-        # Init attributes
+    def __init__(self, mode, dep_path_code=None):
+        # Init attributes, dep_path_code overrides the default folder of the source code
         self.mode = mode
+        self.dep_path_code = dep_path_code
         self.update_smd = False
+        self.use_graphviz = True
 
         # If mode is not found
         if self.mode not in ALL_MODES:
@@ -53,10 +56,28 @@ class ModeGenerateDep:
             path_dot = os.path.join(self.get_dep_path_code(), path_dot)
         return path_dot
 
+    def get_scan_cache_path(self):
+        # Cache of the scan stored next to the dot file
+        return os.path.splitext(self.get_dot_name_path())[0] + ".scan.db"
+
+    def get_cost_report_path(self):
+        # Compile cost report stored next to the dot file
+        return os.path.splitext(self.get_dot_name_path())[0] + ".cost.txt"
+
+    def get_graph_path(self):
+        # Full scan graph stored next to the dot file
+        return os.path.splitext(self.get_dot_name_path())[0] + ".graph.json"
+
+    def get_weights_path(self):
+        # Weights of the nodes stored next to the dot file
+        return os.path.splitext(self.get_dot_name_path())[0] + ".weights.json"
+
     def get_sms_smd_name(self):
         return os.path.join(self.mode, self.mode)
 
     def get_dep_path_code(self):
+        if self.dep_path_code is not None:
+            return self.dep_path_code
         if self.mode == MODE_GENERATE_CPP_HEADER:
             return "/home/xfaure/Desktop/GIT/OMEGA_Embedded_Simu/exec/git/OMEGA_Embedded_SW/inc/ExR/Model/Autotests"
         if self.mode == MODE_GENERATE_CPP_SRC:
@@ -75,59 +96,17 @@ class ModeGenerateDep:
 
     def generate_sms_smd(self, dep):
 
-        # Get graph from dot
-        nameSvg = 'dep.svg'
-        (graph,) = pydot.graph_from_dot_file(self.get_dot_name_path())
-
-        try:
-            graph.write_svg(nameSvg)
-        except FileNotFoundError as mystr:
-            print("dot is not installed in your computer")
-            print("sudo apt install graphviz")
-            print(mystr)
-            sys.exit(-1)
-
         # Two path
         name = self.get_sms_smd_name()
         pathSMS = name + ".sms"
         pathSMD = name + ".smd"
-        fileSMS = open(pathSMS, "w")
-        depNew = {}
-
-        # ------------------------------------
-        #             CLEAN DEP
-        # ------------------------------------
-
-        # For each file
-        for file in dep:
-
-            # For each dependency
-            for name in dep[file]:
-
-                if not (name in dep.keys()):
-                    depNew[name] = []
-
-            depNew[file] = dep[file]
 
         # ------------------------------------
         #               SMS
         # ------------------------------------
 
-        # For each file
-        for file in depNew:
-
-            # Write header
-            fileSMS.write('=' + file + '=')
-            fileSMS.write("\n")
-
-            # For each dependency
-            for name in depNew[file]:
-                # Write current dependencies
-                fileSMS.write("->" + name)
-                fileSMS.write("\n")
-
-        # Close file
-        fileSMS.close()
+        # Files included but not scanned are added on the fly, dep is not copied
+        write_sms(pathSMS, get_dep_edges(dep))
 
         # ------------------------------------
         #               SMD
@@ -135,60 +114,16 @@ class ModeGenerateDep:
 
         # Test if File exist
         is_smd_found = os.path.isfile(pathSMD)
-        # Update SMD from SVG
+        # Update SMD from layout
         if self.update_smd or not is_smd_found:
-            # Create file
             print(pathSMD)
-            fileSMD = open(pathSMD, "w")
-            # Add header
-            fileSMD.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-            fileSMD.write('    <body>                            \n')
-            fileSMD.write('        <diagram>                     \n')
-
-            # get date of the current file
-            with open(nameSvg, "r") as f:
-                data = f.readlines()
-
-            # Find this into svg
-            pattern = "</text>"
-            # For each line
-            for d in data:
-                # If pattern into data
-                if pattern in d:
-                    # Init
-                    x = 'x="0"'
-                    y = 'y="0"'
-                    id = 'NO_ID'
-
-                    # Search x="..."
-                    m = re.search('x="([0-9|.|-]*)"', d)
-                    if m != None:
-                        x = (m.group(0))
-                    # Search y="..."
-                    m = re.search('y="([0-9|.|-]*)"', d)
-                    if m != None:
-                        y = (m.group(0))
-                    # Get id
-                    m = re.search('>(.*)<\/text>', d)
-                    if m != None:
-                        id = m.group(0)
-                        id = id.replace("</text>", "")
-                        id = id.replace(">", "")
-
-                    width = str(len(id) * 10)
-
-                    # Add current vertex
-                    vertex_str = '<vertex id="'
-                    vertex_option = '" background="#ffffcc" show_sub="True" show_actions="True" excluded="False">'
-                    fileSMD.write(vertex_str + id + vertex_option + '\n')
-                    fileSMD.write('  <rect x="0.0" y="0.0" width="' + width + '" height="25.0"/>\n')
-                    fileSMD.write('  <pos ' + x + ' ' + y + '/>\n')
-                    fileSMD.write('</vertex>\n')
-
-            # Add footer
-            fileSMD.write('    </diagram>     \n')
-            fileSMD.write('</body>            \n')
-
-            # Close file
-            fileSMD.close()
 
+            # Position of each node, without SVG rendering
+            positions = get_layout(self.get_dot_name_path(), dict(get_dep_nodes(dep)), self.use_graphviz)
+
+            # Weight of each node, the background is the default one without weight
+            weights = read_weights(self.get_weights_path())
+
+            # For each node
+            vertices = ((id, x, y, get_weight_color(weights.get(id, 0.0))) for id, (x, y) in positions.items())
+            write_smd(pathSMD, vertices)
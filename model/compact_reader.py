@@ -0,0 +1,57 @@
+from PySide6.QtCore import QRectF, QPointF
+from PySide6.QtGui import QColor
+
+from gui.pseudo_state_gitem import PseudoStateGItem
+from gui.seg_rule import SegRule
+from gui.state_gitem import StateGItem
+from gui.transition_gitem import TransitionGItem
+from model.smd_layout import read_compact
+
+
+class CompactReader(object):
+    """Same as XMLReader for a file of the compact format, see model.smd_layout"""
+
+    def __init__(self, path):
+        self._path = path
+
+    def read(self, diagram_factory):
+        try:
+            layouts = read_compact(self._path)
+        except (OSError, ValueError) as error:
+            print(str(error))
+            return False
+        for layout in layouts:
+            diagram = diagram_factory(layout.name)
+            self.read_StateDiagram(layout, diagram)
+        return True
+
+    def read_StateDiagram(self, layout, diagram):
+        colors = {}  # shared by name as in XMLReader
+        for id, pseudo, background, excluded, show_sub, show_actions, rect, pos in layout.vertices():
+            if pseudo is None:
+                vertex_gi = StateGItem()
+                color = colors.get(background)
+                if color is None:
+                    color = colors[background] = QColor(background)
+                vertex_gi._background_color = color
+                vertex_gi.show_sub = show_sub
+                vertex_gi.show_actions = show_actions
+                vertex_gi.setDiagram(diagram)
+            else:
+                vertex_gi = PseudoStateGItem()
+            vertex_gi._excluded = excluded
+            vertex_gi._rect = QRectF(*rect)
+            vertex_gi.setPos(QPointF(*pos))
+            diagram._scene.add_vertex_gi(id, vertex_gi)
+
+        for id, source_point, target_point, rules, text in layout.transitions():
+            transition_gi = TransitionGItem()
+            transition_gi._source_point = QPointF(*source_point)
+            transition_gi._target_point = QPointF(*target_point)
+            transition_gi._rules = [SegRule(orient, QPointF(*anchor)) for orient, anchor in rules]
+            if text:
+                text_pos, rect, pos = text
+                transition_gi._text_pos = QPointF(*text_pos)
+                transition_gi._text_gi._rect = QRectF(*rect)
+                transition_gi._text_gi.setPos(QPointF(*pos))
+            diagram._scene.add_transition_gi(id, transition_gi)
@@ -0,0 +1,17 @@
+from model.layout_snapshot import get_diagram_layout
+from model.smd_layout import write_compact
+
+
+class CompactWriter(object):
+    """Write the diagrams to a file of the compact format, see model.smd_layout"""
+
+    def __init__(self, path):
+        self._path = path
+
+    def write(self, diagrams):
+        try:
+            write_compact(self._path, [get_diagram_layout(d) for d in diagrams])
+        except OSError as error:
+            print(str(error))
+            return False
+        return True
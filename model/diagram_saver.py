@@ -0,0 +1,52 @@
+import threading
+
+from PySide6.QtCore import QObject, Signal
+
+from model.smd_layout import COMPACT_EXTENSION, write_compact, write_smd_xml
+from tools.file_atomic import open_atomic
+
+
+class DiagramSaver(QObject):
+    """
+    Write the SMS and the SMD of a state machine in a thread.
+    The text and the layouts are copied in the GUI thread before, see model.layout_snapshot.
+    """
+    # file base, messages of the files which failed
+    finished = Signal(str, list)
+
+    def __init__(self, parent=None):
+        super(DiagramSaver, self).__init__(parent)
+        self._thread = None
+
+    def save(self, file_base, sms_data, layouts, is_compact):
+        # A save in progress ends before the next one starts
+        self.wait()
+        self._thread = threading.Thread(target=self._write, args=(file_base, sms_data, layouts, is_compact))
+        self._thread.start()
+
+    def wait(self):
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def _write(self, file_base, sms_data, layouts, is_compact):
+        errors = []
+
+        # Save diagrams
+        smd_name = file_base + '.smd'
+        try:
+            write_smd_xml(smd_name, layouts)
+            if is_compact:
+                write_compact(file_base + COMPACT_EXTENSION, layouts)
+        except OSError as error:
+            errors.append('Failed to save %s : %s' % (smd_name, error))
+
+        # Save semantics
+        sms_name = file_base + '.sms'
+        try:
+            with open_atomic(sms_name, 'wb') as f:
+                f.write(sms_data)
+        except OSError as error:
+            errors.append('Failed to save %s : %s' % (sms_name, error))
+
+        self.finished.emit(file_base, errors)
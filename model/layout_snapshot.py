@@ -0,0 +1,42 @@
+from constant_value import PSEUDO_STATE_INITIAL
+from gui.pseudo_state_gitem import PseudoStateGItem
+from gui.state_gitem import StateGItem
+from model.smd_layout import DiagramLayout
+
+
+# -----------------------------------------------
+#   Copy of the positions of the items of a diagram, taken in the GUI thread
+#   The copy is plain data, it can be written in another thread
+# -----------------------------------------------
+
+def get_rect(rect):
+    return rect.x(), rect.y(), rect.width(), rect.height()
+
+
+def get_point(point):
+    return point.x(), point.y()
+
+
+def get_diagram_layout(diagram):
+    layout = DiagramLayout()
+    for (vertex_id, vertex_gi) in diagram._scene._vertices_gi.items():
+        if isinstance(vertex_gi, StateGItem):
+            layout.add_vertex(vertex_id, None, vertex_gi._background_color.name(), vertex_gi._excluded,
+                              getattr(vertex_gi, 'show_sub', True), getattr(vertex_gi, 'show_actions', True),
+                              get_rect(vertex_gi._rect), get_point(vertex_gi.pos()))
+        elif isinstance(vertex_gi, PseudoStateGItem):
+            # the model is not set yet when the diagram has just been read
+            kind = vertex_gi._model.kind if vertex_gi._model else PSEUDO_STATE_INITIAL
+            layout.add_vertex(vertex_id, kind, None, vertex_gi._excluded, True, True,
+                              get_rect(vertex_gi._rect), get_point(vertex_gi.pos()))
+
+    for (transition_id, transition_gi) in diagram._scene._transitions_gi.items():
+        rules = [(rule._orient, get_point(rule._anchor)) for rule in transition_gi._rules]
+        if transition_gi._text_gi:
+            text = (get_point(transition_gi._text_pos), get_rect(transition_gi._text_gi._rect),
+                    get_point(transition_gi._text_gi.pos()))
+        else:
+            text = None
+        layout.add_transition(transition_id, get_point(transition_gi._source_point),
+                              get_point(transition_gi._target_point), rules, text)
+    return layout
@@ -2,7 +2,38 @@ import re
 
 
 class LineParser(object):
-    def __init__(self, reg_exp, pass1_handler, pass2_handler, kind):
+    def __init__(self, reg_exp, pass1_handler, pass2_handler, kind, first_chars=None):
         self.reg_exp = re.compile(reg_exp)
         self.pass_handlers = (pass1_handler, pass2_handler)
-        self.kind = kind
\ No newline at end of file
+        self.kind = kind
+        # characters a matching line may start with after its spaces, None if any
+        self.first_chars = first_chars
+
+
+class LineClassifier(object):
+    """Find the parser of a line among the parsers able to match its first character
+
+    The first character of the line after its spaces selects the parsers to try, in
+    their order, so most lines are matched by one or two regexes instead of trying
+    each parser in turn. Parsers without first_chars are tried for any line.
+
+    """
+    def __init__(self, parsers):
+        self.parsers = tuple(parsers)
+
+        # parsers to try for each known first character, all of them otherwise
+        first_chars = set()
+        for parser in self.parsers:
+            first_chars.update(parser.first_chars or '')
+        self.first_char_parsers = {}
+        for char in first_chars:
+            self.first_char_parsers[char] = tuple(parser for parser in self.parsers
+                                    if parser.first_chars is None or char in parser.first_chars)
+
+    def classify(self, line):
+        """Return (parser, match) of the first parser matching the line, (None, None) if none"""
+        for parser in self.first_char_parsers.get(line.lstrip()[:1], self.parsers):
+            match_res = parser.reg_exp.match(line)
+            if match_res != None:
+                return (parser, match_res)
+        return (None, None)
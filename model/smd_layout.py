@@ -0,0 +1,348 @@
+"""
+
+Layout of the diagrams of a SMD file, without Qt
+
+The XML format is the one of XMLReader. The compact format keeps the
+same data in columns : arrays of string indexes, of flags and of floats, with one
+string table per diagram. A compact file is read at once, its columns are decoded
+only when the vertices or the transitions of a diagram are iterated.
+
+Usage : python -m model.smd_layout input.smd output.smdc
+        python -m model.smd_layout input.smdc output.smd
+
+"""
+import struct
+import sys
+import xml.etree.ElementTree as ElementTree
+from array import array
+from xml.sax.saxutils import quoteattr
+
+from dep_writer import WRITE_BUFFER_SIZE
+from tools.file_atomic import open_atomic
+
+COMPACT_EXTENSION = '.smdc'
+COMPACT_MAGIC = b'SMDC'
+COMPACT_VERSION = 1
+
+# Values of the boolean attributes, written by str(bool)
+BOOLEANS = {'True': True, 'False': False}
+
+# Index of a missing string, the background of a pseudo state for instance
+NO_STRING = 0xFFFFFFFF
+
+# Flags of a vertex
+FLAG_EXCLUDED = 1
+FLAG_SHOW_SUB = 2
+FLAG_SHOW_ACTIONS = 4
+# Flags of a transition
+FLAG_TEXT = 1
+
+# Floats of a vertex : rect x, y, width, height then pos x, y
+VERTEX_FLOATS = 6
+# Floats of a transition : source point, target point, text_pos, text rect, text pos
+TRANSITION_FLOATS = 12
+
+# Columns of a diagram in the order of the file, with their array type
+COLUMNS = (('vertex_ids', 'I'), ('vertex_kinds', 'I'), ('vertex_backgrounds', 'I'),
+           ('vertex_flags', 'B'), ('vertex_floats', 'd'),
+           ('transition_ids', 'I'), ('transition_nb_rules', 'I'), ('transition_flags', 'B'),
+           ('transition_floats', 'd'),
+           ('rule_orients', 'I'), ('rule_anchors', 'd'))
+
+
+class DiagramLayout(object):
+    """Vertices and transitions of a diagram, in columns"""
+
+    def __init__(self, name=''):
+        self.name = name
+        self.strings = []
+        self._string_indexes = {}
+        for column_name, type_code in COLUMNS:
+            setattr(self, column_name, array(type_code))
+
+    def get_nb_vertices(self):
+        return len(self.vertex_ids)
+
+    def get_nb_transitions(self):
+        return len(self.transition_ids)
+
+    def _get_index(self, string):
+        if string is None:
+            return NO_STRING
+        index = self._string_indexes.get(string)
+        if index is None:
+            index = self._string_indexes[string] = len(self.strings)
+            self.strings.append(string)
+        return index
+
+    def _get_string(self, index):
+        if index == NO_STRING:
+            return None
+        return self.strings[index]
+
+    def add_vertex(self, id, pseudo, background, excluded, show_sub, show_actions, rect, pos):
+        """
+        pseudo -- kind of the pseudo state, None for a state
+        background -- color name, None for a pseudo state
+        rect -- (x, y, width, height)
+        pos -- (x, y)
+        """
+        self.vertex_ids.append(self._get_index(id))
+        self.vertex_kinds.append(self._get_index(pseudo))
+        self.vertex_backgrounds.append(self._get_index(background))
+        self.vertex_flags.append((FLAG_EXCLUDED if excluded else 0) |
+                                 (FLAG_SHOW_SUB if show_sub else 0) |
+                                 (FLAG_SHOW_ACTIONS if show_actions else 0))
+        self.vertex_floats.extend(rect)
+        self.vertex_floats.extend(pos)
+
+    def add_transition(self, id, source_point, target_point, rules, text):
+        """
+        rules -- [(orient, (x, y)), ...]
+        text -- (text_pos, rect, pos) of the text, None if no text
+        """
+        self.transition_ids.append(self._get_index(id))
+        self.transition_nb_rules.append(len(rules))
+        self.transition_floats.extend(source_point)
+        self.transition_floats.extend(target_point)
+        if text:
+            text_pos, rect, pos = text
+            self.transition_flags.append(FLAG_TEXT)
+            self.transition_floats.extend(text_pos)
+            self.transition_floats.extend(rect)
+            self.transition_floats.extend(pos)
+        else:
+            self.transition_flags.append(0)
+            self.transition_floats.extend((0.0,) * 8)
+        for orient, anchor in rules:
+            self.rule_orients.append(self._get_index(orient))
+            self.rule_anchors.extend(anchor)
+
+    def vertices(self):
+        """Generate (id, pseudo, background, excluded, show_sub, show_actions, rect, pos) of each vertex"""
+        floats = self.vertex_floats
+        for num in range(len(self.vertex_ids)):
+            flags = self.vertex_flags[num]
+            first = num * VERTEX_FLOATS
+            yield (self.strings[self.vertex_ids[num]],
+                   self._get_string(self.vertex_kinds[num]),
+                   self._get_string(self.vertex_backgrounds[num]),
+                   bool(flags & FLAG_EXCLUDED), bool(flags & FLAG_SHOW_SUB), bool(flags & FLAG_SHOW_ACTIONS),
+                   tuple(floats[first:first + 4]), tuple(floats[first + 4:first + 6]))
+
+    def transitions(self):
+        """Generate (id, source_point, target_point, rules, text) of each transition"""
+        floats = self.transition_floats
+        num_rule = 0
+        for num in range(len(self.transition_ids)):
+            first = num * TRANSITION_FLOATS
+            nb_rules = self.transition_nb_rules[num]
+            rules = [(self.strings[self.rule_orients[num_rule + offset]],
+                      tuple(self.rule_anchors[2 * (num_rule + offset):2 * (num_rule + offset) + 2]))
+                     for offset in range(nb_rules)]
+            num_rule += nb_rules
+            if self.transition_flags[num] & FLAG_TEXT:
+                text = (tuple(floats[first + 4:first + 6]), tuple(floats[first + 6:first + 10]),
+                        tuple(floats[first + 10:first + 12]))
+            else:
+                text = None
+            yield (self.strings[self.transition_ids[num]], tuple(floats[first:first + 2]),
+                   tuple(floats[first + 2:first + 4]), rules, text)
+
+
+# -----------------------------------------------
+#   XML format
+# -----------------------------------------------
+
+def decode_bool(text, default):
+    # Value of a boolean attribute, default if the attribute is missing or invalid
+    return BOOLEANS.get(text, default)
+
+
+def _get_point(element):
+    return float(element.get('x')), float(element.get('y'))
+
+
+def _get_rect(element):
+    return float(element.get('x')), float(element.get('y')), float(element.get('width')), float(element.get('height'))
+
+
+def read_smd_xml(path):
+    # Layouts of the diagrams of a SMD file, the default values are the ones of XMLReader
+    layouts = []
+    body = ElementTree.parse(path).getroot()
+    for diagram in body.iter('diagram'):
+        layout = DiagramLayout(diagram.get('name', ''))
+        for vertex in diagram.iter('vertex'):
+            rect = _get_rect(vertex.find('rect'))
+            pos = _get_point(vertex.find('pos'))
+            pseudo = vertex.get('pseudo')
+            background = vertex.get('background', '') if pseudo is None else None
+            layout.add_vertex(vertex.get('id'), pseudo, background,
+                              decode_bool(vertex.get('excluded'), False), decode_bool(vertex.get('show_sub'), True),
+                              decode_bool(vertex.get('show_actions'), True), rect, pos)
+        for transition in diagram.iter('transition'):
+            rules = [(rule.get('orient'), _get_point(rule.find('anchor'))) for rule in transition.iter('rule')]
+            text_element = transition.find('text')
+            if text_element is not None:
+                text = (_get_point(transition.find('text_pos')), _get_rect(text_element.find('rect')),
+                        _get_point(text_element.find('pos')))
+            else:
+                text = None
+            layout.add_transition(transition.get('id'), _get_point(transition.find('source_point')),
+                                  _get_point(transition.find('target_point')), rules, text)
+        layouts.append(layout)
+    return layouts
+
+
+def format_number(value):
+    # Shortest text giving back the float, without '.0' for an integer
+    text = repr(float(value))
+    return text[:-2] if text.endswith('.0') else text
+
+
+def _get_point_attributes(point):
+    return 'x="%s" y="%s"' % (format_number(point[0]), format_number(point[1]))
+
+
+def _get_rect_attributes(rect):
+    return 'x="%s" y="%s" width="%s" height="%s"' % tuple(format_number(value) for value in rect)
+
+
+def get_smd_xml_lines(layouts):
+    # Lines of the SMD, indented, numbers as short as possible
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n<body>\n'
+    for layout in layouts:
+        yield '  <diagram>\n'
+        for id, pseudo, background, excluded, show_sub, show_actions, rect, pos in layout.vertices():
+            if pseudo is None:
+                options = 'background=%s show_sub="%s" show_actions="%s"' % (quoteattr(background), show_sub,
+                                                                          show_actions)
+            else:
+                options = 'pseudo=%s' % quoteattr(pseudo)
+            yield ('    <vertex id=%s %s excluded="%s">\n'
+                   '      <rect %s/>\n'
+                   '      <pos %s/>\n'
+                   '    </vertex>\n' % (quoteattr(id), options, excluded,
+                                        _get_rect_attributes(rect), _get_point_attributes(pos)))
+        for id, source_point, target_point, rules, text in layout.transitions():
+            yield ('    <transition id=%s>\n'
+                   '      <source_point %s/>\n'
+                   '      <target_point %s/>\n' % (quoteattr(id), _get_point_attributes(source_point),
+                                                   _get_point_attributes(target_point)))
+            for orient, anchor in rules:
+                yield ('      <rule orient=%s>\n'
+                       '        <anchor %s/>\n'
+                       '      </rule>\n' % (quoteattr(orient), _get_point_attributes(anchor)))
+            if text:
+                text_pos, rect, pos = text
+                yield ('      <text_pos %s/>\n'
+                       '      <text>\n'
+                       '        <rect %s/>\n'
+                       '        <pos %s/>\n'
+                       '      </text>\n' % (_get_point_attributes(text_pos), _get_rect_attributes(rect),
+                                            _get_point_attributes(pos)))
+            yield '    </transition>\n'
+        yield '  </diagram>\n'
+    yield '</body>\n'
+
+
+def write_smd_xml(path, layouts):
+    with open_atomic(path, 'w', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+        f.writelines(get_smd_xml_lines(layouts))
+
+
+# -----------------------------------------------
+#   Compact format
+#   'SMDC', version, number of diagrams, then for each diagram :
+#   name, number of strings, size of the strings, length of each column,
+#   the strings separated by zeros, then the columns, each one aligned on 8 bytes
+# -----------------------------------------------
+
+def _get_padding(size):
+    return -size % 8
+
+
+def _to_little_endian(column):
+    if sys.byteorder == 'big' and column.itemsize > 1:
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column
+
+
+def write_compact(path, layouts):
+    with open_atomic(path, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(COMPACT_MAGIC + struct.pack('<II', COMPACT_VERSION, len(layouts)))
+        for layout in layouts:
+            name = layout.name.encode('utf-8')
+            strings = b'\0'.join(string.encode('utf-8') for string in layout.strings)
+            columns = [getattr(layout, column_name) for column_name, type_code in COLUMNS]
+            f.write(struct.pack('<I', len(name)) + name)
+            f.write(struct.pack('<II', len(layout.strings), len(strings)))
+            f.write(struct.pack('<%dI' % len(columns), *[len(column) for column in columns]))
+            f.write(strings + b'\0' * _get_padding(f.tell() + len(strings)))
+            for column in columns:
+                data = _to_little_endian(column).tobytes()
+                f.write(data + b'\0' * _get_padding(len(data)))
+
+
+def read_compact(path):
+    # Layouts of a compact file, read only, the columns are views on the content of the file
+    with open(path, 'rb') as f:
+        content = memoryview(f.read())
+    if bytes(content[:4]) != COMPACT_MAGIC:
+        raise ValueError('%s is not a compact diagram file' % path)
+    version, nb_layouts = struct.unpack_from('<II', content, 4)
+    if version != COMPACT_VERSION:
+        raise ValueError('%s : version %d is not supported' % (path, version))
+    offset = 12
+    layouts = []
+    for num in range(nb_layouts):
+        name_size, = struct.unpack_from('<I', content, offset)
+        offset += 4
+        layout = DiagramLayout(str(content[offset:offset + name_size], 'utf-8'))
+        offset += name_size
+        nb_strings, strings_size = struct.unpack_from('<II', content, offset)
+        offset += 8
+        lengths = struct.unpack_from('<%dI' % len(COLUMNS), content, offset)
+        offset += 4 * len(COLUMNS)
+        if nb_strings:
+            layout.strings = str(content[offset:offset + strings_size], 'utf-8').split('\0')
+        offset += strings_size
+        offset += _get_padding(offset)
+        for (column_name, type_code), length in zip(COLUMNS, lengths):
+            size = length * array(type_code).itemsize
+            column = content[offset:offset + size].cast(type_code)
+            if sys.byteorder == 'big' and column.itemsize > 1:
+                column = array(type_code, column)
+                column.byteswap()
+            setattr(layout, column_name, column)
+            offset += size + _get_padding(size)
+        layouts.append(layout)
+    return layouts
+
+
+def read_layouts(path):
+    # Layouts of a SMD file in either format, chosen by the extension
+    if path.endswith(COMPACT_EXTENSION):
+        return read_compact(path)
+    return read_smd_xml(path)
+
+
+def write_layouts(path, layouts):
+    if path.endswith(COMPACT_EXTENSION):
+        write_compact(path, layouts)
+    else:
+        write_smd_xml(path, layouts)
+
+
+def main():
+    if len(sys.argv) != 3:
+        print("Usage : python -m model.smd_layout input output, " + COMPACT_EXTENSION + " for the compact format")
+        return 1
+    write_layouts(sys.argv[2], read_layouts(sys.argv[1]))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,7 @@ from PySide6.QtWidgets import QToolButton, QLineEdit, QPushButton, QSizePolicy,
 
 import numpy as np
 
+from compile_cost import get_weight_color
 from gui.controller import Controller
 from gui.graphics_scene import GraphicsScene
 from gui.graphics_view import GraphicsView
@@ -143,6 +144,7 @@ class StateDiagram(QWidget):
 
         # View widget
         self._scene = GraphicsScene(self)
+        self.controller = None
         self._view_wg = GraphicsView()
         self._view_wg.setScene(self._scene)
         self._scene.selectionChanged.connect(self.on_selection_changed)
@@ -372,7 +374,9 @@ class StateDiagram(QWidget):
         sm = self._parent.compile()
         if sm:
             self._sm = sm
-            self.controller = Controller(self._scene)
+            # The controller keeps the loaded state machine, only the changes are applied to the scene
+            if self.controller is None:
+                self.controller = Controller(self._scene)
             self.controller.load_sm(self._sm, placer)
             self.updateServerChangeState()
             self._main_ly.setCurrentWidget(self._search_view_wd)
@@ -402,6 +406,7 @@ class StateDiagram(QWidget):
 
     def reset(self):
         self._scene.reset()
+        self.controller = None
 
     def auto_colorize(self):
         def do_region(region, col_index):
@@ -414,3 +419,10 @@ class StateDiagram(QWidget):
 
         do_region(self._sm.region[0], 0)
 
+    def colorize_weights(self, weights):
+        # Background of each vertex from its weight, between 0 and 1
+        for name, weight in weights.items():
+            vertex_gi = self._scene.get_vertex_gi(name)
+            if vertex_gi is not None:
+                vertex_gi.background_color = QColor(get_weight_color(weight))
+
@@ -5,6 +5,7 @@ from gui.pseudo_state_gitem import PseudoStateGItem
 from gui.seg_rule import SegRule
 from gui.state_gitem import StateGItem
 from gui.transition_gitem import TransitionGItem
+from model.smd_layout import decode_bool
 
 
 def elements(stream, only_names=None):
@@ -31,6 +32,26 @@ class XMLReader(object):
     def __init__(self, file):
         self._file = file
         self._stream = QXmlStreamReader(file)
+        self._colors = {}  # colors of the document by name
+
+    def read_bool(self, attributes, name, default):
+        return decode_bool(str(attributes.value(name)), default)
+
+    def read_float(self, attributes, name):
+        # Value of a float attribute, 0 if the attribute is missing or invalid
+        try:
+            return float(attributes.value(name))
+        except ValueError:
+            print("Bad float for " + name + " : " + str(attributes.value(name)))
+            return 0.0
+
+    def read_color(self, attributes, name):
+        # The items replace their color, they never modify it, so the color of a name is shared
+        color_name = str(attributes.value(name))
+        color = self._colors.get(color_name)
+        if color is None:
+            color = self._colors[color_name] = QColor(color_name)
+        return color
 
     def read(self, diagram_factory):
         self._diagram_factory = diagram_factory
@@ -70,7 +91,7 @@ class XMLReader(object):
 
     def read_VertexGItem(self, state_gi):
         attributes = self._stream.attributes()
-        state_gi._excluded = eval(str(attributes.value('excluded'))  or 'False')
+        state_gi._excluded = self.read_bool(attributes, 'excluded', False)
         for elem_name in elements(self._stream, ('rect', 'pos')) :
             if self._stream.name() == 'rect':
                 state_gi._rect = self.read_QRectF()
@@ -82,9 +103,9 @@ class XMLReader(object):
     def read_StateGItem(self):
         state_gi = StateGItem()
         attributes = self._stream.attributes()
-        state_gi._background_color = QColor(attributes.value('background'))
-        state_gi.show_sub = eval(str(attributes.value('show_sub')) or 'True')
-        state_gi.show_actions = eval(str(attributes.value('show_actions'))  or 'True')
+        state_gi._background_color = self.read_color(attributes, 'background')
+        state_gi.show_sub = self.read_bool(attributes, 'show_sub', True)
+        state_gi.show_actions = self.read_bool(attributes, 'show_actions', True)
         state_gi = self.read_VertexGItem(state_gi)
         return state_gi
 
@@ -122,17 +143,14 @@ class XMLReader(object):
 
     def read_QRectF(self):
         attribs = self._stream.attributes()
-        x = attribs.value('x')
-        y = attribs.value('y')
-        width = attribs.value('width')
-        height = attribs.value('height')
+        rect = QRectF(self.read_float(attribs, 'x'), self.read_float(attribs, 'y'),
+                      self.read_float(attribs, 'width'), self.read_float(attribs, 'height'))
         skip_unknown_elements(self._stream)
-        return QRectF(float(x), float(y), float(width), float(height))
+        return rect
 
     def read_QPointF(self):
         attribs = self._stream.attributes()
-        x = attribs.value('x')
-        y = attribs.value('y')
+        point = QPointF(self.read_float(attribs, 'x'), self.read_float(attribs, 'y'))
         skip_unknown_elements(self._stream)
-        return QPointF(float(x), float(y))
+        return point
 
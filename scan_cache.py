@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import sqlite3
+
+
+# Cache of the parsed source files, stored into a SQLite file next to the dot file
+# A file is parsed again only if its mtime/size changed and its content hash is different
+
+# Increase it when the result of the parsing changes, the old cache is then dropped
+SCAN_CACHE_VERSION = 3
+
+
+def get_hash_buffer(data):
+    # Hash of the content of a file already read
+    return hashlib.sha1(data).hexdigest()
+
+
+def get_hash_file(path):
+    # Hash of the content of the file
+    file_hash = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            file_hash.update(block)
+    return file_hash.hexdigest()
+
+
+class ScanCache:
+
+    def __init__(self, path_cache, mode_file):
+        # Init attributes
+        self.path_cache = path_cache
+        self.mode_file = mode_file
+        self.nb_hit = 0
+        self.nb_miss = 0
+        self._entries = {}
+        self._updated = {}
+        self._seen = set()
+
+        # Open the data base and drop the entries of an other version of the parser
+        self._connection = sqlite3.connect(path_cache)
+        if self._connection.execute("PRAGMA user_version").fetchone()[0] != SCAN_CACHE_VERSION:
+            self._connection.execute("DROP TABLE IF EXISTS files")
+            self._connection.execute("PRAGMA user_version = %d" % SCAN_CACHE_VERSION)
+
+        # Create the table the first time
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "mode TEXT, path TEXT, mtime_ns INTEGER, size INTEGER, hash TEXT, "
+            "nb_line INTEGER, dependencies TEXT, PRIMARY KEY (mode, path))")
+
+        # Load all entries of the current mode at once
+        rows = self._connection.execute(
+            "SELECT path, mtime_ns, size, hash, nb_line, dependencies FROM files WHERE mode = ?", (mode_file,))
+        for path, mtime_ns, size, file_hash, nb_line, dependencies in rows:
+            self._entries[path] = (mtime_ns, size, file_hash, nb_line, dependencies)
+
+    def get(self, path):
+        """
+        Return (dependencies, nb_line) of the file if it's unchanged since the last scan, None otherwise
+        """
+        self._seen.add(path)
+        entry = self._entries.get(path)
+        stat = os.stat(path)
+
+        # If unknown file
+        if entry is None:
+            self.nb_miss = self.nb_miss + 1
+            return None
+
+        mtime_ns, size, file_hash, nb_line, dependencies = entry
+
+        # If same date and size, the file is unchanged
+        if mtime_ns != stat.st_mtime_ns or size != stat.st_size:
+            # If same content, only the date is updated
+            if size != stat.st_size or file_hash != get_hash_file(path):
+                self.nb_miss = self.nb_miss + 1
+                return None
+            self._updated[path] = (stat.st_mtime_ns, stat.st_size, file_hash, nb_line, dependencies)
+
+        self.nb_hit = self.nb_hit + 1
+        return json.loads(dependencies), nb_line
+
+    def put(self, path, dependencies, nb_line, file_hash=None):
+        # Store the result of the parsing of the file, the hash is given when the parser has read the file
+        stat = os.stat(path)
+        if file_hash is None:
+            file_hash = get_hash_file(path)
+        self._updated[path] = (stat.st_mtime_ns, stat.st_size, file_hash, nb_line, json.dumps(dependencies))
+
+    def save(self):
+        # Write updated entries and drop deleted files into one transaction
+        deleted = [(self.mode_file, path) for path in self._entries if path not in self._seen]
+        updated = [(self.mode_file, path) + entry for path, entry in self._updated.items()]
+
+        with self._connection:
+            self._connection.executemany("DELETE FROM files WHERE mode = ? AND path = ?", deleted)
+            self._connection.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?)", updated)
+
+        # Update entries in memory
+        for mode, path in deleted:
+            del self._entries[path]
+        self._entries.update(self._updated)
+        self._updated = {}
+        self._seen = set()
+
+    def close(self):
+        self._connection.close()
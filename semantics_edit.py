@@ -27,6 +27,9 @@ class SemanticsEdit(QPlainTextEdit):
         self._completer.setCompletionMode(QCompleter.PopupCompletion)
         self._completer.setCaseSensitivity(Qt.CaseSensitive)
         self._completer.activated.connect(self.insert_completion)
+        # first block changed since the last compilation, None if no change was signaled
+        self._first_changed_block = None
+        self.document().contentsChange.connect(self._contents_change)
 
     def read_settings(self):
         settings = QSettings()
@@ -44,6 +47,22 @@ class SemanticsEdit(QPlainTextEdit):
         settings.endArray()
         settings.endGroup()
 
+    def _contents_change(self, position, chars_removed, chars_added):
+        block_nb = max(self.document().findBlock(position).blockNumber(), 0)
+        if self._first_changed_block is None or block_nb < self._first_changed_block:
+            self._first_changed_block = block_nb
+
+    def take_first_changed_block(self):
+        """Return the first block changed since the last call, None if no change was signaled
+
+        A block may hold several lines of toPlainText(), so the block number is
+        never greater than the line number of the first changed line
+
+        """
+        first_changed = self._first_changed_block
+        self._first_changed_block = None
+        return first_changed
+
     def set_completion(self, my_list):
         model = QStringListModel(my_list)
         self._completer.setModel(model)
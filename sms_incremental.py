@@ -0,0 +1,365 @@
+"""
+
+Build a StateMachine from a text description, then patch it when the text changes
+
+The text is cut into sections, one per state of the first level, the lines before
+the first state forming the first section. When the lines of the states (names,
+nesting, initial flags) of the changed sections are the same, only the pass 2 of
+these sections is replayed: their transitions are replaced, their states get their
+entry, exit and note again. Otherwise the state machine is built from scratch.
+
+"""
+from bisect import bisect_right
+from collections import Counter
+
+from sms_reader import StateMachineBuilder
+from state.state_machine import StateMachine
+
+
+class SmChanges(object):
+    """Changes of the state machine made by an update
+
+    full -- the state machine has been built from scratch, nothing else is filled
+    added -- transitions added to the state machine
+    removed -- transitions removed from the state machine
+    updated -- states whose entry, exit or note changed
+
+    """
+    def __init__(self, full):
+        self.full = full
+        self.added = []
+        self.removed = []
+        self.updated = []
+
+    def is_empty(self):
+        return not (self.full or self.added or self.removed or self.updated)
+
+    def __str__(self):
+        if self.full:
+            return 'full build'
+        return '%d added, %d removed, %d updated' % (len(self.added), len(self.removed), len(self.updated))
+
+
+class LineResult(object):
+    """What the pass 2 of a line added to the state machine"""
+    def __init__(self, def_lines, events, guards, actions, errors):
+        self.def_lines = def_lines  # transitions -> line
+        self.events = events
+        self.guards = guards
+        self.actions = actions
+        self.errors = errors
+
+
+def get_transition_key(transition):
+    # Transitions with the same key are the same for the diagram
+    return (transition.kind, transition.source.name, transition.target.name, transition.get_str())
+
+
+class IncrementalStateMachineBuilder(StateMachineBuilder):
+    def __init__(self, extra_parser=None):
+        super(IncrementalStateMachineBuilder, self).__init__(None, extra_parser)
+        self._lines = []
+        self._tokens = []
+        self._results = []
+        self._sections = [0]  # first line of each section
+        self._errors = []
+        self._all_states = {}
+        self._all_actions = set()
+        self._all_events = set()
+        self._all_guards = set()
+        self._port = -1
+        self._is_patchable = False
+        self._changes = SmChanges(True)
+
+    def get_state_machine(self):
+        return self._sm
+
+    def get_changes(self):
+        """Return the SmChanges of the last update"""
+        return self._changes
+
+    def update(self, smlines, first_changed=None):
+        """Update the state machine from the new lines of the text
+
+        first_changed -- the lines before it are unchanged since the last update,
+                         None if unknown : all the lines are compared
+
+        Return True if the text has no error, as build_from_string
+
+        """
+        smlines = list(smlines)
+        if not self._is_patchable:
+            return self._build_full(smlines)
+
+        # Changed lines : [begin, old_end) replaced by [begin, new_end)
+        old_lines = self._lines
+        begin = min(first_changed or 0, len(old_lines), len(smlines))
+        while begin < len(old_lines) and begin < len(smlines) and old_lines[begin] == smlines[begin]:
+            begin += 1
+        old_end = len(old_lines)
+        new_end = len(smlines)
+        while old_end > begin and new_end > begin and old_lines[old_end - 1] == smlines[new_end - 1]:
+            old_end -= 1
+            new_end -= 1
+        if begin == old_end and begin == new_end:
+            self._changes = SmChanges(False)
+            return not self._errors
+
+        # Sections containing the changed lines
+        first_section = bisect_right(self._sections, begin) - 1
+        last_section = bisect_right(self._sections, max(old_end - 1, begin)) - 1
+        if last_section + 1 < len(self._sections):
+            region_end = self._sections[last_section + 1]
+        else:
+            region_end = len(old_lines)
+        changed_tokens = [self.CLASSIFIER.classify(line) for line in smlines[begin:new_end]]
+
+        # The region starts with a state of the first level, else its lines belong to the previous section
+        while True:
+            region_begin = self._sections[first_section]
+            tokens = self._tokens[region_begin:begin] + changed_tokens + self._tokens[old_end:region_end]
+            if region_begin == 0 or (tokens and self._is_section_begin(tokens[0])):
+                break
+            first_section -= 1
+
+        # Same states into the region, else build from scratch
+        old_signature = self._get_signature(self._tokens[region_begin:region_end], region_begin)
+        new_signature = self._get_signature(tokens, region_begin)
+        if [key for (key, line_nb) in old_signature] != [key for (key, line_nb) in new_signature]:
+            return self._build_full(smlines)
+
+        self._patch(smlines, tokens, first_section, last_section, region_end, new_end - old_end,
+                    old_signature, new_signature)
+        return not self._errors
+
+    def _is_section_begin(self, token):
+        # Line of a state of the first level
+        (parser, match_res) = token
+        return parser is not None and parser.kind == 'state' and len(match_res.group('level')) == 1
+
+    def _get_sections(self, tokens, first_line):
+        # First line of each section of the lines, the first line always begins a section
+        return [first_line + num for (num, token) in enumerate(tokens)
+                if num == 0 or self._is_section_begin(token)]
+
+    def _get_signature(self, tokens, first_line):
+        """Return the ((kind, name, initial, level), line_nb) of the lines of states and initial states"""
+        signature = []
+        for (num, (parser, match_res)) in enumerate(tokens):
+            if parser is None:
+                continue
+            if parser.kind == 'state':
+                key = ('state', match_res.group('name'), bool(match_res.group('initial')),
+                       len(match_res.group('level')))
+                signature.append((key, first_line + num + 1))
+            elif parser.kind == 'initial':
+                signature.append((('initial', None, False, 0), first_line + num + 1))
+        return signature
+
+    def _build_full(self, smlines):
+        self._sm = StateMachine()
+        self._def_lines = {}
+        self._errors = []
+        self._all_states = {}
+        self._all_actions = set()
+        self._all_events = set()
+        self._all_guards = set()
+        self._port = -1
+        self._lines = smlines
+        self._tokens = [self.CLASSIFIER.classify(line) for line in smlines]
+        self._results = [None] * len(smlines)
+
+        # pass 1 on all lines
+        self._passn = 0
+        self._state_stack = ['']
+        self._line_nb = 1
+        for (parser, match_res) in self._tokens:
+            if parser != None:
+                parser.pass_handlers[0](self, match_res)
+                self._parse_comment(match_res)
+            self._line_nb += 1
+
+        # Only syntax errors are local to a line, other errors of pass 1 depend on the other sections
+        self._is_patchable = self._extra_parser is None and \
+                             all(err[2] == 'syntax error' for err in self._errors)
+
+        # pass 2 on all lines, what each line adds is kept
+        def_lines = self._def_lines
+        self._passn = 1
+        self._state_stack = ['']
+        self._replay(0, len(smlines))
+        def_lines.update(self._def_lines)
+        self._def_lines = def_lines
+
+        self._events_count = Counter()
+        self._guards_count = Counter()
+        self._actions_count = Counter()
+        for result in self._results:
+            if result:
+                self._count_result(result, 1)
+        self._all_events = set(self._events_count)
+        self._all_guards = set(self._guards_count)
+        self._all_actions = set(self._actions_count)
+
+        self._sections = self._get_sections(self._tokens, 0) or [0]
+        self._changes = SmChanges(True)
+        return not self._errors
+
+    def _parse_comment(self, match_res):
+        if self._extra_parser and match_res.group('comment'):
+            err = self._extra_parser.parse(self, match_res.group('comment'))
+            if (err):
+                self._append_error(err, match_res.span(0))
+
+    def _replay(self, begin, end):
+        """Run the pass 2 on the lines [begin, end), keep what each line adds into self._results
+
+        At the end self._def_lines holds the transitions added by these lines only
+
+        """
+        all_def_lines = {}
+        self._line_nb = begin + 1
+        for num in range(begin, end):
+            (parser, match_res) = self._tokens[num]
+            result = None
+            if parser != None:
+                nb_error = len(self._errors)
+                self._def_lines = {}
+                self._all_events = set()
+                self._all_guards = set()
+                self._all_actions = set()
+                parser.pass_handlers[1](self, match_res)
+                self._parse_comment(match_res)
+                if self._def_lines or self._all_events or self._all_guards or self._all_actions or \
+                        len(self._errors) > nb_error:
+                    result = LineResult(self._def_lines, self._all_events, self._all_guards,
+                                        self._all_actions, self._errors[nb_error:])
+                    all_def_lines.update(self._def_lines)
+            self._results[num] = result
+            self._line_nb += 1
+        self._def_lines = all_def_lines
+
+    def _count_result(self, result, sign):
+        for event in result.events:
+            self._events_count[event] += sign
+        for guard in result.guards:
+            self._guards_count[guard] += sign
+        for action in result.actions:
+            self._actions_count[action] += sign
+
+    def _patch(self, smlines, tokens, first_section, last_section, region_end, delta,
+               old_signature, new_signature):
+        sm = self._sm
+        changes = SmChanges(False)
+        region_begin = self._sections[first_section]
+        new_region_end = region_end + delta
+
+        # States of the region and their current entry, exit and note
+        states = [sm.get_state(key[1]) for (key, line_nb) in new_signature if key[0] == 'state']
+        before = [(str(state.entry), str(state.exit), state.note) for state in states]
+
+        # Remove the transitions of the region
+        removed = {}
+        containers = set()
+        vertices = set()
+        for result in self._results[region_begin:region_end]:
+            if result:
+                self._count_result(result, -1)
+                for transition in result.def_lines:
+                    sm.remove_transition(transition)
+                    containers.add(transition.container)
+                    vertices.update((transition.source, transition.target))
+                    del self._def_lines[transition]
+                    removed.setdefault(get_transition_key(transition), []).append(transition)
+        for state in states:
+            state.entry = None
+            state.exit = None
+            state.note = ''
+
+        # Lines of the states of the region, lines after the region
+        def_lines = self._def_lines
+        moved = dict(zip([line_nb for (key, line_nb) in old_signature],
+                         [line_nb for (key, line_nb) in new_signature]))
+        for (obj, line_nb) in def_lines.items():
+            if line_nb > region_end:
+                def_lines[obj] = line_nb + delta
+            elif line_nb > region_begin and line_nb in moved:
+                def_lines[obj] = moved[line_nb]
+
+        # Splice the lines, replay the pass 2 of the region
+        self._lines = smlines
+        self._tokens[region_begin:region_end] = tokens
+        self._results[region_begin:region_end] = [None] * (new_region_end - region_begin)
+        self._passn = 1
+        self._state_stack = ['']
+        self._replay(region_begin, new_region_end)
+        self._def_lines = def_lines
+
+        # Transitions found again are kept, the diagram keeps its items
+        for result in self._results[region_begin:new_region_end]:
+            if not result:
+                continue
+            kept_def_lines = {}
+            for (transition, line_nb) in result.def_lines.items():
+                same = removed.get(get_transition_key(transition))
+                if same:
+                    old_transition = same.pop(0)
+                    sm.remove_transition(transition)
+                    sm.insert_transition(old_transition)
+                    if transition.trigger and transition.trigger.event in result.events:
+                        result.events.discard(transition.trigger.event)
+                        result.events.add(old_transition.trigger.event)
+                    transition = old_transition
+                else:
+                    changes.added.append(transition)
+                kept_def_lines[transition] = line_nb
+                def_lines[transition] = line_nb
+                containers.add(transition.container)
+                vertices.update((transition.source, transition.target))
+            result.def_lines = kept_def_lines
+            self._count_result(result, 1)
+        for same in removed.values():
+            changes.removed.extend(same)
+
+        # Transitions of a region or a vertex in the order of their line, as in a full build
+        for container in containers:
+            container.transition.sort(key=lambda transition: def_lines[transition])
+        for vertex in vertices:
+            vertex._outgoing.sort(key=lambda transition: def_lines[transition])
+            vertex._incoming.sort(key=lambda transition: def_lines[transition])
+
+        # Sections of the region, sections after the region
+        region_sections = self._get_sections(tokens, region_begin)
+        self._sections[first_section:last_section + 1] = region_sections
+        for num in range(first_section + len(region_sections), len(self._sections)):
+            self._sections[num] += delta
+        if not self._sections or self._sections[0] != 0:
+            self._sections.insert(0, 0)
+
+        self._update_all()
+        changes.updated = [state for (state, old) in zip(states, before)
+                           if (str(state.entry), str(state.exit), state.note) != old]
+        self._changes = changes
+
+    def _update_all(self):
+        # Sets, port and errors of the whole text from the results of the lines
+        self._events_count = +self._events_count
+        self._guards_count = +self._guards_count
+        self._actions_count = +self._actions_count
+        self._all_events = set(self._events_count)
+        self._all_guards = set(self._guards_count)
+        self._all_actions = set(self._actions_count)
+
+        self._port = -1
+        for (parser, match_res) in reversed(self._tokens):
+            if parser is not None and parser.kind == 'port':
+                self._port = int(match_res.group('port'))
+                break
+
+        self._errors = []
+        for (num, (parser, match_res)) in enumerate(self._tokens):
+            if parser is not None and parser.kind == 'error':
+                self._errors.append((num + 1, match_res.span('error'), 'syntax error'))
+        for (num, result) in enumerate(self._results):
+            if result:
+                self._errors.extend((num + 1, columns, description) for (line_nb, columns, description) in result.errors)
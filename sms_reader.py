@@ -3,12 +3,14 @@
 Build a StateMachine from a text description
 
 """
+import string
+
 from constant_value import PSEUDO_STATE_INITIAL
 from state.constraint import Constraint
 from state.my_behaviour import MyBehavior
 from state.my_event import MyEvent
 from state.my_time_event import MyTimeEvent
-from model.line_parser import LineParser
+from model.line_parser import LineParser, LineClassifier
 from state.trigger import Trigger
 
 
@@ -21,11 +23,13 @@ class StateMachineBuilder(object):
 
     ALL_PARSERS = ()
 
+    # first characters of an event name
+    WORD_CHARS = string.ascii_letters + string.digits + '_'
+
     def check_line_syntax(cls, line):
-        for parser in cls.ALL_PARSERS:
-            match_res = parser.reg_exp.match(line)
-            if match_res != None:
-                return (parser.kind, match_res)
+        (parser, match_res) = cls.CLASSIFIER.classify(line)
+        if parser != None:
+            return (parser.kind, match_res)
         return ('error', None)
     check_line_syntax = classmethod(check_line_syntax)
 
@@ -68,20 +72,20 @@ class StateMachineBuilder(object):
         self._all_guards = set()
         self._port = -1
 
+        # tokenize once, the tokens are replayed by each pass
+        tokens = [self.CLASSIFIER.classify(line) for line in smlines]
+
         for self._passn in range(0,2):
             self._state_stack = [''] # stack of state names
             self._line_nb = 1
-            for line in smlines:
-                for parser in self.ALL_PARSERS:
-                    match_res = parser.reg_exp.match(line)
-                    if match_res != None:
-                        parser.pass_handlers[self._passn](self, match_res)
-                        if self._extra_parser and match_res.group('comment'):
-                            err = self._extra_parser.parse(self,
-                                                    match_res.group('comment'))
-                            if (err):
-                                self._append_error(err, match_res.span(0))
-                        break
+            for (parser, match_res) in tokens:
+                if parser != None:
+                    parser.pass_handlers[self._passn](self, match_res)
+                    if self._extra_parser and match_res.group('comment'):
+                        err = self._extra_parser.parse(self,
+                                                match_res.group('comment'))
+                        if (err):
+                            self._append_error(err, match_res.span(0))
                 self._line_nb += 1
 
         return not self._errors
@@ -163,8 +167,7 @@ class StateMachineBuilder(object):
         action = match_res.group('action')
         check = match_res.group('check')
         if self._get_current_state():
-            context = { 'source' : self._get_current_state(), 'event' : 'entry' }
-            behaviour = MyBehavior(action, check, context)
+            behaviour = MyBehavior(action, check, self._get_current_state(), event='entry')
             self._sm.add_entry_action(self._get_current_state(), behaviour)
             if action:
                 self._all_actions.add(behaviour.fmt_action())
@@ -172,8 +175,7 @@ class StateMachineBuilder(object):
     def _pass2_exit(self, match_res):
         action = match_res.group('action')
         if self._get_current_state():
-            context = { 'source' : self._get_current_state(), 'event' : 'exit' }
-            behaviour = MyBehavior(action, None, context)
+            behaviour = MyBehavior(action, None, self._get_current_state(), event='exit')
             self._sm.add_exit_action(self._get_current_state(), behaviour)
             if action:
                 self._all_actions.add( behaviour.fmt_action() )
@@ -197,11 +199,7 @@ class StateMachineBuilder(object):
             guard_cons = Constraint(guard)
         else:
             guard_cons = None
-        context = { 'source' : self._get_current_state(),
-                    'target' : self._get_current_state(),
-                    'event' : event_id,
-                    'guard' : guard }
-        effect = MyBehavior(action, check, context)
+        effect = MyBehavior(action, check, self._get_current_state(), self._get_current_state(), event_id, guard)
         if self._get_current_state():
             obj = self._sm.add_event(self._get_current_state(), trigger, guard_cons, effect)
             self._def_lines[obj] = self._line_nb
@@ -233,11 +231,7 @@ class StateMachineBuilder(object):
         else:
             guard_cons = None
         if action or check:
-            context = { 'source' : self._get_current_state(),
-                        'target' : target,
-                        'event' : event_id,
-                        'guard' : guard }
-            effect = MyBehavior(action, check, context)
+            effect = MyBehavior(action, check, self._get_current_state(), target, event_id, guard)
         else:
             effect = None
 
@@ -267,23 +261,25 @@ class StateMachineBuilder(object):
 
     ALL_PARSERS = (
             LineParser(r'\s*(?P<statedef>(?P<level>=+)\s*(?P<name>\w+)(?P<initial>\*)?\s*(?P=level))\s*(?P<comment>#.*)?$',
-                       _pass1_state, _pass2_state, 'state'),
+                       _pass1_state, _pass2_state, 'state', '='),
             LineParser(r'\s*(?P<source>\$I)\s*->\s*(?P<target>\w+)\s*(?P<comment>#.*)?$',
-                       _pass1_initial, _pass2_initial, 'initial'),
+                       _pass1_initial, _pass2_initial, 'initial', '$'),
             LineParser(r'\s*(?P<keyword>entry)\s*/\s*((?P<action>[^\s]+)\s*)?(\^\s*(?P<check>check|c)\s*)?(?P<comment>#.*)?$',
-                       _passX_nop, _pass2_entry, 'entry'),
+                       _passX_nop, _pass2_entry, 'entry', 'e'),
             LineParser(r'\s*(?P<keyword>exit)\s*/\s*(?P<action>[^\s]+)\s*(?P<comment>#.*)?$',
-                       _passX_nop, _pass2_exit, 'exit'),
+                       _passX_nop, _pass2_exit, 'exit', 'e'),
             LineParser(r'\s*(?P<event>(?!(exit|entry|do)\s)\w+)\s*(\[\s*(?P<guard>!?[^\]]+)\s*\]\s*)?\/\s*(\s*(?P<action>[^\s]+)\s*)?(\^\s*(?P<check>check|c)\s*)?(?P<comment>#.*)?$',
-                       _passX_nop,_pass2_event, 'event'),
+                       _passX_nop,_pass2_event, 'event', WORD_CHARS),
             LineParser(r'\s*((?P<event>(?!(exit|entry|do)\s)\w+)\s*)?(\[\s*(?P<guard>!?[^\]]+)\s*\]\s*)?(\/\s*(?P<action>[^\s]+)\s*)?\s*->\s*(?P<target>\w+)\s*(?P<comment>#.*)?$',
-                       _passX_nop, _pass2_transition, 'transition'),
+                       _passX_nop, _pass2_transition, 'transition', WORD_CHARS + '[/-'),
             LineParser(r'\s*(?P<event>(?!(exit|entry|do)\s)after\s*\(\s*(?P<timeout>\w+)\s*\)\s*)\s*(\[\s*(?P<guard>!?[^\]]+)\s*\]\s*)?\/\s*(\s*(?P<action>[^\s]+)\s*)?(\^\s*(?P<check>check|c)\s*)?(?P<comment>#.*)?$',
-                       _passX_nop,_pass2_event, 'event'),
+                       _passX_nop,_pass2_event, 'event', 'a'),
             LineParser(r'\s*((?P<event>(?!(exit|entry|do)\s)after\s*\(\s*(?P<timeout>\w+)\s*\)\s*)\s*)?(\[\s*(?P<guard>!?[^\]]+)\s*\]\s*)?(\/\s*(?P<action>[^\s]+)\s*)?\s*->\s*(?P<target>\w+)\s*(?P<comment>#.*)?$',
-                       _passX_nop, _pass2_transition, 'transition'),
-            LineParser(r'\s*(?P<comment>#port=(?P<port>.+))$', _passX_nop, _pass2_port, 'port'),
-            LineParser(r'\s*(?P<comment>##(?P<note>.+))$', _passX_nop, _pass2_note, 'note'),
-            LineParser(r'\s*(?P<comment>#.*)?$', _passX_nop, _passX_nop, 'comment'),
+                       _passX_nop, _pass2_transition, 'transition', 'a[/-'),
+            LineParser(r'\s*(?P<comment>#port=(?P<port>.+))$', _passX_nop, _pass2_port, 'port', '#'),
+            LineParser(r'\s*(?P<comment>##(?P<note>.+))$', _passX_nop, _pass2_note, 'note', '#'),
+            LineParser(r'\s*(?P<comment>#.*)?$', _passX_nop, _passX_nop, 'comment', '#'),
             LineParser(r'\s*(?P<error>.+?)\s*(?P<comment>#.*)?$', _pass1_error, _passX_nop, 'error'),
             )
+
+    CLASSIFIER = LineClassifier(ALL_PARSERS)
@@ -0,0 +1,142 @@
+import os
+import re
+
+from constant_mode import MODE_GENERATE_CPP_HEADER, MODE_GENERATE_CPP_SRC, MODE_GENERATE_PHP, MODE_GENERATE_XML
+
+
+# -----------------------------------------------
+#   Rules of the source files to scan, per mode
+#   - exclude_dirs  : globs of folder names, these folders are not browsed
+#   - include_files : globs of file names to scan
+#   - exclude_files : globs of file names to skip even if included
+# -----------------------------------------------
+
+# Folders never browsed whatever the mode
+EXCLUDE_DIRS = ["*VSB-CALIA4-SMP*", "*library*", "*LibsSiso*"]
+
+DEFAULT_SCAN_RULES = {
+    MODE_GENERATE_CPP_HEADER: {
+        "exclude_dirs": EXCLUDE_DIRS,
+        "include_files": ["*.h*"],
+        "exclude_files": ["*.hap*", "ClsGigEVision.cpp"],
+    },
+    MODE_GENERATE_CPP_SRC: {
+        "exclude_dirs": EXCLUDE_DIRS,
+        "include_files": ["*.h*", "*.cpp*"],
+        "exclude_files": ["*.hap*", "ClsGigEVision.cpp"],
+    },
+    MODE_GENERATE_PHP: {
+        "exclude_dirs": EXCLUDE_DIRS,
+        "include_files": ["*.php*"],
+        "exclude_files": [],
+    },
+    MODE_GENERATE_XML: {
+        "exclude_dirs": EXCLUDE_DIRS,
+        "include_files": ["*manager.xml*", "*admin-sonata.xml*"],
+        "exclude_files": [],
+    },
+}
+
+
+# Wildcards of a glob : *, ? and [...]
+GLOB_WILDCARD_PATTERN = re.compile(r'(\*|\?|\[!?[^]]+\])')
+
+
+def get_glob_regex(glob):
+    # Regex to search into a name, a leading or trailing * is not matched so "*.h*" is a plain search of ".h"
+    begin = "" if glob.startswith("*") else r"\A"
+    end = "" if glob.endswith("*") else r"\Z"
+    regex = []
+
+    # For each part of the glob
+    for part in GLOB_WILDCARD_PATTERN.split(glob.strip("*")):
+        if part == "*":
+            regex.append(".*")
+        elif part == "?":
+            regex.append(".")
+        elif part.startswith("[") and len(part) > 2:
+            regex.append("[^" + part[2:] if part.startswith("[!") else part)
+        else:
+            regex.append(re.escape(part))
+
+    return begin + "".join(regex) + end
+
+
+def compile_globs(globs):
+    # One case sensitive pattern for all globs, None if no glob
+    if len(globs) == 0:
+        return None
+    return re.compile("|".join("(?:" + get_glob_regex(glob) + ")" for glob in globs), re.DOTALL)
+
+
+class ScanRules:
+
+    def __init__(self, include_files, exclude_files=(), exclude_dirs=()):
+        # Init attributes
+        self.include_files = list(include_files)
+        self.exclude_files = list(exclude_files)
+        self.exclude_dirs = list(exclude_dirs)
+
+        # Patterns compiled once
+        self._include_files = compile_globs(self.include_files)
+        self._exclude_files = compile_globs(self.exclude_files)
+        self._exclude_dirs = compile_globs(self.exclude_dirs)
+
+    @classmethod
+    def from_mode(cls, mode_file, scan_rules=None):
+        # Rules of the mode, scan_rules overrides the default rules
+        rules = dict(DEFAULT_SCAN_RULES.get(mode_file, {}))
+        if scan_rules is not None:
+            rules.update(scan_rules)
+        return cls(rules.get("include_files", []), rules.get("exclude_files", []), rules.get("exclude_dirs", []))
+
+    def is_good_dir(self, name):
+        return self._exclude_dirs is None or self._exclude_dirs.search(name) is None
+
+    def is_good_file(self, name):
+        if self._include_files is None or self._include_files.search(name) is None:
+            return False
+        return self._exclude_files is None or self._exclude_files.search(name) is None
+
+
+def walk_source_files(folder_input, scan_rules):
+    """
+    Return (source_files, nb_dir, nb_visited) : the (root, name) of the files matching
+    the rules, in the order of os.walk, the number of browsed folders and of visited files.
+    Excluded folders are pruned, their content is never listed.
+    """
+    source_files = []
+    nb_dir = 0
+    nb_visited = 0
+    stack = [folder_input]
+
+    # While a folder has to be browsed
+    while stack:
+        root = stack.pop()
+        dirs = []
+        try:
+            entries = list(os.scandir(root))
+        except OSError:
+            continue
+
+        # For each entry of the current folder, the type comes from the listing without stat
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+
+            if is_dir:
+                # Symbolic links are not followed, same as os.walk
+                if scan_rules.is_good_dir(entry.name) and not entry.is_symlink():
+                    dirs.append(entry.path)
+            else:
+                nb_visited = nb_visited + 1
+                if scan_rules.is_good_file(entry.name):
+                    source_files.append((root, entry.name))
+
+        # Sub folders in listing order
+        nb_dir = nb_dir + len(dirs)
+        stack.extend(reversed(dirs))
+
+    return source_files, nb_dir, nb_visited
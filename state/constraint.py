@@ -1,6 +1,11 @@
+from sys import intern
+
+
 class Constraint(object):
+    __slots__ = ('specification',)
+
     def __init__(self, specification):
-        self.specification = specification
+        self.specification = intern(specification)
 
     def __str__(self):
         return str(self.specification)
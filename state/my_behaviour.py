@@ -1,10 +1,22 @@
 import re
+from sys import intern
+
+
+def intern_or_none(text):
+    return intern(text) if text else text
+
 
 class MyBehavior(object):
-    def __init__(self, action, check, context):
-        self.action = action # string
+    # the context of the action is kept in slots instead of a dict
+    __slots__ = ('action', 'check', 'source', 'target', 'event', 'guard')
+
+    def __init__(self, action, check, source, target=None, event=None, guard=None):
+        self.action = intern_or_none(action) # string
         self.check = check # bool
-        self.context = context # dict
+        self.source = intern_or_none(source) # name of the source state
+        self.target = intern_or_none(target) # name of the target state
+        self.event = intern_or_none(event) # id of the event, 'entry' or 'exit'
+        self.guard = intern_or_none(guard) # string
 
     def __str__(self):
         result = self.fmt_action()
@@ -16,25 +28,24 @@ class MyBehavior(object):
         if not self.action:
             return ''
 
-        if 'source' in  self.context:
-            source_name = self.context['source']
+        if self.source:
+            source_name = self.source
             auto_source = source_name[0].lower() + source_name[1:]
         else:
             auto_source = ''
 
-        if 'target' in  self.context:
-            target_name = self.context['target']
+        if self.target:
+            target_name = self.target
             auto_target = target_name[0].lower() + target_name[1:]
         else:
             auto_target = ''
 
         event = ''
-        if 'event' in  self.context and self.context['event'] \
-            and self.context['event'] != 'Check':
-            event = self.context['event']
+        if self.event and self.event != 'Check':
+            event = self.event
             auto_event = event[0].upper() + event[1:]
-        elif 'guard' in self.context and self.context['guard']:
-            guard = self.context['guard']
+        elif self.guard:
+            guard = self.guard
             if guard[0] == '!':
                 guard = guard[1:]
                 not_prefix = 'Not'
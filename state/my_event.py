@@ -1,7 +1,11 @@
+from sys import intern
+
 
 class MyEvent(object):
+    __slots__ = ('event',)
+
     def __init__ (self, event):
-        self.event = event
+        self.event = intern(event)
 
     def id(self):
         if self.event:
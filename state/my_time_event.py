@@ -1,7 +1,11 @@
+from sys import intern
+
 
 class MyTimeEvent(object):
+    __slots__ = ('timeout',)
+
     def __init__ (self, timeout):
-        self.timeout = timeout
+        self.timeout = intern(timeout)
 
     def id(self):
         return 'after%s%s' % (self.timeout[0].upper(), self.timeout[1:])
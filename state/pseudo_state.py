@@ -1,10 +1,14 @@
+from sys import intern
+
 from state.vertex import Vertex
 
 
 class PseudoState(Vertex):
+    __slots__ = ('name', 'kind', 'stateMachine', 'state')
+
     def __init__(self, name, kind, container):
         Vertex.__init__(self, container)
-        self.name = name
+        self.name = intern(name)
         self.kind = kind
         self.stateMachine = None
         self.state = None  # attribute valid when used as a connectionPoint
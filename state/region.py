@@ -1,4 +1,6 @@
 class Region(object):
+    __slots__ = ('name', 'stateMachine', 'transition', 'state', 'subVertex')
+
     def __init__(self, name, state):
         self.name = name
         self.stateMachine = None
@@ -1,10 +1,15 @@
+from sys import intern
+
 from state.vertex import Vertex
 
 
 class State(Vertex):
+    __slots__ = ('name', 'region', 'entry', 'exit', 'doActivity', 'deferrableTrigger',
+                 'subMachine', 'connection', 'connectionPoint', 'note')
+
     def __init__(self, name, container):
         Vertex.__init__(self, container)
-        self.name = name
+        self.name = intern(name)
         self.region = []
         self.entry = None
         self.exit = None
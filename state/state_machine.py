@@ -2,6 +2,8 @@ import re
 
 from PySide6.QtCore import QFile, QIODevice
 
+from dep_graph import DepGraph
+from graph_analysis import get_cycles
 from state.pseudo_state import PseudoState
 from state.region import Region
 from state.state import State
@@ -109,7 +111,7 @@ class StateMachine(object):
         container = state.container
         transition = Transition(TransitionKind.internal, container, state,
                                 state, trigger, guard, effect)
-        container.transition.append(transition)
+        self.insert_transition(transition)
         # print "add internal transition from %s on %s in region %s" % (state_name, trigger.event.name, container)
         return transition
 
@@ -144,9 +146,21 @@ class StateMachine(object):
                                     from_state, to_state,
                                     trigger, guard, effect)
             # print 'add local transition from %s to %s in region %s' % (from_name, to_name, container)
-        container.transition.append(transition)
+        self.insert_transition(transition)
         return transition
 
+    def insert_transition(self, transition):
+        """Add a transition to its region and to the transitions of its source and target"""
+        transition.container.transition.append(transition)
+        transition.source._outgoing.append(transition)
+        transition.target._incoming.append(transition)
+
+    def remove_transition(self, transition):
+        """Remove a transition from its region and from the transitions of its source and target"""
+        transition.container.transition.remove(transition)
+        transition.source._outgoing.remove(transition)
+        transition.target._incoming.remove(transition)
+
     def get_state(self, state_name):
         return self._all_vertices[state_name]
 
@@ -209,3 +223,7 @@ class StateMachine(object):
 
         # Return simple graph
         return map_graph
+
+    def get_cycles(self):
+        # Cycles of transitions, with a minimal witness path for each
+        return get_cycles(DepGraph.from_dict(self.get_simple_graph(), self._all_vertices.keys()))
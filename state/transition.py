@@ -1,8 +1,5 @@
-import weakref
-
-
 class Transition(object):
-    allInstances = []
+    __slots__ = ('kind', 'container', 'source', 'target', 'trigger', 'effect', 'guard')
 
     def __init__(self, kind, region, source, target, trigger, guard, effect):
         self.kind = kind         # TransitionKind
@@ -12,12 +9,6 @@ class Transition(object):
         self.trigger = trigger   # Trigger
         self.effect = effect     # Behavior
         self.guard = guard       # Constraint
-        self.allInstances.append(weakref.ref(self))
-
-        # allInstances maintenance: remove references to dead transitions
-        self.allInstances[:] = [trans_ref
-                                for trans_ref in Transition.allInstances
-                                if trans_ref()]
 
     def get_str(self):
         text_parts = []
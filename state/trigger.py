@@ -1,3 +1,5 @@
 class Trigger(object):
+    __slots__ = ('event',)
+
     def __init__(self, event):
         self.event = event
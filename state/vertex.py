@@ -1,14 +1,13 @@
-from state.transition import Transition
-
-
 class Vertex(object):
+    __slots__ = ('container', '_outgoing', '_incoming')
+
     def __init__(self, container):
         self.container = container # region
+        self._outgoing = [] # transitions from this vertex, added by the StateMachine
+        self._incoming = [] # transitions to this vertex, added by the StateMachine
 
     def outgoing(self):
-        return [transition() for transition in Transition.allInstances
-                if transition() and transition().source is self]
+        return list(self._outgoing)
 
     def incoming(self):
-        return [transition() for transition in Transition.allInstances
-                if transition() and transition().target is self]
+        return list(self._incoming)
@@ -0,0 +1,193 @@
+import numpy as np
+
+from dep_graph import DepGraph
+from graph_analysis import get_strongly_connected_components
+
+
+# -----------------------------------------------
+#   Layered layout (Sugiyama) of a dependency graph
+#   1) cycle removal   : edges going back in a topological order are reversed
+#   2) layering        : longest path from the roots
+#   3) crossings       : barycentric sweeps, down then up
+#   4) coordinates     : nodes side by side into each layer, layers centered
+#   Long edges have no dummy node, the sweeps only use the edges between adjacent layers
+# -----------------------------------------------
+
+# Spacing in points
+LAYER_SPACING = 100
+NODE_SPACING = 20
+
+# Number of down and up sweeps of the crossing reduction
+NB_SWEEP = 4
+
+
+def get_edges(graph):
+    # Sources and targets of the edges as numpy arrays
+    offsets = np.frombuffer(graph.offsets, dtype=np.uint32).astype(np.int64)
+    targets = np.frombuffer(graph.targets, dtype=np.uint32).astype(np.int64)
+    sources = np.repeat(np.arange(graph.get_nb_node()), np.diff(offsets))
+    return sources, targets
+
+
+def get_acyclic_edges(graph, sources, targets):
+    """
+    Reverse the edges going back in a topological order of the strongly connected components,
+    remove self edges. Return the edges of a graph without cycle.
+    """
+    # Rank of each node : components in topological order, nodes of a component in order
+    rank = np.empty(graph.get_nb_node(), dtype=np.int64)
+    components = get_strongly_connected_components(graph)
+    rank[np.fromiter((node for component in reversed(components) for node in sorted(component)),
+                     dtype=np.int64, count=graph.get_nb_node())] = np.arange(graph.get_nb_node())
+
+    # Reverse the edges going back, drop self edges
+    back = rank[sources] > rank[targets]
+    sources, targets = np.where(back, targets, sources), np.where(back, sources, targets)
+    kept = sources != targets
+    return sources[kept], targets[kept]
+
+
+def get_layers(nb_node, sources, targets):
+    """
+    Longest path layering : the layer of a node is the number of the round of Kahn
+    algorithm where it has no parent left.
+    """
+    # Edges sorted by source, as CSR
+    order = np.argsort(sources, kind='stable')
+    children = targets[order]
+    offsets = np.searchsorted(sources[order], np.arange(nb_node + 1))
+
+    nb_parent = np.bincount(targets, minlength=nb_node)
+    layer = np.zeros(nb_node, dtype=np.int64)
+    frontier = np.flatnonzero(nb_parent == 0)
+    num_layer = 0
+
+    # While nodes have been freed
+    while frontier.size > 0:
+        layer[frontier] = num_layer
+        num_layer = num_layer + 1
+
+        # Children of the frontier
+        begins = offsets[frontier]
+        counts = offsets[frontier + 1] - begins
+        nb_edge = counts.sum()
+        if nb_edge == 0:
+            break
+        edges = np.repeat(begins - np.cumsum(counts) + counts, counts) + np.arange(nb_edge)
+        freed = children[edges]
+
+        # Children without parent left form the next frontier
+        np.subtract.at(nb_parent, freed, 1)
+        freed = np.unique(freed)
+        frontier = freed[nb_parent[freed] == 0]
+
+    return layer
+
+
+def get_groups(keys, nb_group):
+    # Indexes sorted by key and begin of each group
+    order = np.argsort(keys, kind='stable')
+    return order, np.searchsorted(keys[order], np.arange(nb_group + 1))
+
+
+def sweep_layer(nodes, local, position, neighbours, owners):
+    # Order the nodes of a layer by the barycenter of their neighbours
+    nb_node = nodes.size
+    current = position[nodes]
+    if neighbours.size > 0:
+        total = np.bincount(local[owners], weights=position[neighbours], minlength=nb_node)
+        count = np.bincount(local[owners], minlength=nb_node)
+        barycenter = np.where(count > 0, total / np.maximum(count, 1), current)
+    else:
+        barycenter = current
+
+    # Ties keep the current order
+    order = np.lexsort((current, barycenter))
+    position[nodes[order]] = np.arange(nb_node) / (nb_node - 1)
+
+
+def reduce_crossings(layer, sources, targets, nb_sweep=NB_SWEEP):
+    """
+    Return the position of each node into its layer, between 0 and 1.
+    """
+    nb_node = layer.size
+    nb_layer = int(layer.max()) + 1 if nb_node > 0 else 0
+
+    # Nodes of each layer, local index of a node into its layer
+    nodes_order, nodes_begin = get_groups(layer, nb_layer)
+    local = np.empty(nb_node, dtype=np.int64)
+    sizes = np.diff(nodes_begin)
+    local[nodes_order] = np.arange(nb_node) - np.repeat(nodes_begin[:-1], sizes)
+
+    # Initial order : order of the graph
+    position = local / np.maximum(sizes[layer] - 1, 1)
+
+    # Edges between adjacent layers, grouped by layer of the target (down sweep) and of the source (up sweep)
+    adjacent = layer[targets] == layer[sources] + 1
+    sources = sources[adjacent]
+    targets = targets[adjacent]
+    down_order, down_begin = get_groups(layer[targets], nb_layer)
+    up_order, up_begin = get_groups(layer[sources], nb_layer)
+
+    # Only layers of several nodes are ordered
+    layers = [num_layer for num_layer, size in enumerate(sizes.tolist()) if size > 1]
+
+    # For each sweep
+    for num_sweep in range(nb_sweep):
+        # Down : each layer follows its parents
+        for num_layer in layers:
+            if num_layer == 0:
+                continue
+            edges = down_order[down_begin[num_layer]:down_begin[num_layer + 1]]
+            nodes = nodes_order[nodes_begin[num_layer]:nodes_begin[num_layer + 1]]
+            sweep_layer(nodes, local, position, sources[edges], targets[edges])
+
+        # Up : each layer follows its children
+        for num_layer in reversed(layers):
+            if num_layer == nb_layer - 1:
+                continue
+            edges = up_order[up_begin[num_layer]:up_begin[num_layer + 1]]
+            nodes = nodes_order[nodes_begin[num_layer]:nodes_begin[num_layer + 1]]
+            sweep_layer(nodes, local, position, targets[edges], sources[edges])
+
+    return position
+
+
+def get_coordinates(layer, position, widths):
+    # Center of each node : nodes side by side in the order of their position, each layer centered
+    order = np.lexsort((position, layer))
+    spaced = widths[order] + NODE_SPACING
+    right = np.cumsum(spaced)
+
+    # Width of the previous layers and of the current layer, without the spacing after its last node
+    begin = np.searchsorted(layer[order], layer[order])
+    end = np.searchsorted(layer[order], layer[order], side='right')
+    before = np.where(begin > 0, right[begin - 1], 0)
+    layer_width = right[end - 1] - before - NODE_SPACING
+
+    x = np.empty(layer.size)
+    x[order] = right - before - spaced + widths[order] / 2 - layer_width / 2
+    y = layer * float(LAYER_SPACING)
+    return x, y
+
+
+def get_layout_sugiyama(dependencies, nb_sweep=NB_SWEEP):
+    """
+    Return the position of each node of the dependencies, in points, y going down.
+    """
+    graph = DepGraph.from_dict(dependencies)
+    names = graph.names
+    if len(names) == 0:
+        return {}
+
+    sources, targets = get_edges(graph)
+    sources, targets = get_acyclic_edges(graph, sources, targets)
+    layer = get_layers(len(names), sources, targets)
+    position = reduce_crossings(layer, sources, targets, nb_sweep)
+
+    # Width of a node is the width of its name
+    widths = np.fromiter((len(name) * 10 for name in names), dtype=np.float64, count=len(names))
+    x, y = get_coordinates(layer, position, widths)
+
+    return {name: (float(x[node]), float(y[node])) for node, name in enumerate(names)}
+
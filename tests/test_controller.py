@@ -0,0 +1,131 @@
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+SMS = '\n'.join([
+    '=S1*=',
+    'entry / start',
+    'go [ready] / run -> S2',
+    '  ==S1_1==',
+    '  stop -> S1_2',
+    '  ==S1_2==',
+    '=S2=',
+    'back -> S1',
+])
+
+
+@pytest.fixture
+def gui(tmp_path, monkeypatch):
+    # The config file is created into the current folder when the gui is imported
+    monkeypatch.chdir(tmp_path)
+    from PySide6.QtCore import QObject
+    from PySide6.QtWidgets import QApplication
+    from gui.controller import Controller
+    from gui.graphics_scene import GraphicsScene
+    from gui.state_gitem import StateGItem
+    from gui.transition_gitem import TransitionGItem
+    from model.default_placer import DefaultPlacer
+    from sms_reader import StateMachineBuilder
+    from state.state_machine import StateMachine
+
+    def build(text):
+        sm = StateMachine()
+        StateMachineBuilder(sm).build_from_string(text)
+        return sm
+
+    app = QApplication.instance() or QApplication([])
+    owner = QObject()
+    scene = GraphicsScene(owner)
+    controller = Controller(scene)
+    controller.load_sm(build(SMS), DefaultPlacer())
+
+    # Count the changes done on each item
+    calls = []
+    for cls, name in ((StateGItem, 'set_model'), (TransitionGItem, 'set_model'),
+                      (TransitionGItem, 'rebuild_path'), (StateGItem, 'setParentItem'),
+                      (TransitionGItem, 'setParentItem')):
+        def spy(item, *args, method=getattr(cls, name), name=name):
+            calls.append((item, name))
+            return method(item, *args)
+        monkeypatch.setattr(cls, name, spy)
+
+    yield scene, controller, build, calls, DefaultPlacer
+    scene.reset()
+
+
+def test_full_rebuild_leaves_unchanged_items(gui):
+    scene, controller, build, calls, placer = gui
+    items_s1 = scene.get_vertex_gi('S1')
+    items_back = scene.get_transition_gi('S2->S1:back')
+
+    # A new state machine, every object is new, as after a full build
+    sm = build(SMS + '\n=S3=\nback -> S2\n')
+    controller.load_sm(sm, placer())
+
+    touched = set(item for (item, name) in calls)
+    unchanged = [scene.get_vertex_gi(name) for name in ('S1', 'S1_1', 'S1_2', 'S2')]
+    unchanged += [scene.get_transition_gi(trans_id) for trans_id in ('S1->S2:go[ready]', 'S2->S1:back',
+                                                                      'S1_1->S1_2:stop')]
+    assert not touched.intersection(unchanged)
+    assert scene.get_vertex_gi('S3') in touched
+    assert scene.get_transition_gi('S3->S2:back') in touched
+
+    # Same items, given the objects of the new state machine
+    assert scene.get_vertex_gi('S1') is items_s1
+    assert scene.get_transition_gi('S2->S1:back') is items_back
+    assert items_s1._model is sm.get_all_vertices()['S1']
+    assert items_back._model.source is sm.get_all_vertices()['S2']
+
+
+def test_changed_text_only_touches_its_item(gui):
+    scene, controller, build, calls, placer = gui
+    controller.load_sm(build(SMS.replace('/ run', '/ walk')), placer())
+
+    assert set(item for (item, name) in calls) == {scene.get_transition_gi('S1->S2:go[ready]')}
+    assert {'set_model', 'rebuild_path'} <= set(name for (item, name) in calls)
+
+
+def get_scene_items(scene):
+    # Models, hierarchy and texts of the items, the positions depend on the placer
+    names = {id(vertex_gi): vertex_id for (vertex_id, vertex_gi) in scene._vertices_gi.items()}
+    items = {}
+    for (vertex_id, vertex_gi) in scene._vertices_gi.items():
+        items[vertex_id] = (type(vertex_gi).__name__, vertex_gi._model.name, names.get(id(vertex_gi.parentItem())),
+                            getattr(vertex_gi, '_actions_text', None), vertex_gi.toolTip())
+    for (trans_id, trans_gi) in scene._transitions_gi.items():
+        items[trans_id] = (trans_gi._model.get_id_str(), names.get(id(trans_gi.parentItem())),
+                           names.get(id(trans_gi._source_gi)), names.get(id(trans_gi._target_gi)),
+                           trans_gi._text_gi._text)
+    return items
+
+
+@pytest.mark.parametrize('edit', [
+    lambda text: text.replace('/ run', '/ walk'),
+    lambda text: text.replace('entry / start', 'entry / begin\n## note'),
+    lambda text: text.replace('back -> S1', 'back -> S1_2'),
+    lambda text: text.replace('  stop -> S1_2\n', ''),
+    lambda text: text + '\n=S3=\nback -> S2\n  ==S3_1==\n',
+    lambda text: text.replace('  ==S1_2==\n', '=S1_2=\n'),
+])
+def test_incremental_load_equals_fresh_load(gui, edit):
+    scene, controller, build, calls, placer = gui
+    from gui.controller import Controller
+    from gui.graphics_scene import GraphicsScene
+    from sms_incremental import IncrementalStateMachineBuilder
+
+    # The state machine of the incremental builder is patched, its unchanged objects are kept
+    builder = IncrementalStateMachineBuilder()
+    builder.update(SMS.splitlines())
+    controller.load_sm(builder.get_state_machine(), placer())
+    text = edit(SMS)
+    builder.update(text.splitlines())
+    sm = builder.get_state_machine()
+    controller.load_sm(sm, placer())
+
+    fresh_scene = GraphicsScene(scene.parent())
+    Controller(fresh_scene).load_sm(build(text), placer())
+    assert get_scene_items(scene) == get_scene_items(fresh_scene)
+    assert all(scene.get_vertex_gi(name)._model is vertex for (name, vertex) in sm.get_all_vertices().items())
+    fresh_scene.reset()
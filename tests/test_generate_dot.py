@@ -0,0 +1,8 @@
+from generate_dot import get_project_includes
+from include_extractor import INCLUDE_ANGLE, INCLUDE_QUOTED
+
+
+def test_angle_includes_of_the_project_only():
+    includes = [('a.h', INCLUDE_QUOTED), ('vector', INCLUDE_ANGLE), ('QString', INCLUDE_ANGLE),
+                ('b.h', INCLUDE_ANGLE), ('missing.h', INCLUDE_QUOTED), ('a.h', INCLUDE_ANGLE)]
+    assert get_project_includes(includes, {'a.h', 'b.h', 'c.cpp'}) == ['a.h', 'b.h', 'missing.h']
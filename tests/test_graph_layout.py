@@ -0,0 +1,18 @@
+from graph_layout import get_plain_layout
+
+PLAIN = '\n'.join([
+    'graph 1 4 3',
+    'node xml_node 1 2 0.5 0.5 xml_node solid ellipse black lightgrey',
+    'node foo 3 2.5 0.5 0.5 foo solid ellipse black lightgrey',
+    'node "my node" 2 1 0.5 0.5 "my node" solid ellipse black lightgrey',
+    'edge xml_node foo 4 1 2 3 4 5 6 7 8 solid black',
+    'edge foo "my node" 4 1 2 3 4 5 6 7 8 solid black',
+    'stop',
+    ''])
+
+
+def test_plain_layout_reads_node_lines_only():
+    # A name ending in "node" must not match inside a node or an edge line
+    assert get_plain_layout(PLAIN) == {'xml_node': (72.0, -144.0),
+                                       'foo': (216.0, -180.0),
+                                       'my node': (144.0, -72.0)}
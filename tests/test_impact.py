@@ -0,0 +1,63 @@
+from constant_mode import MODE_GENERATE_CPP_SRC
+from generate_dot import generate_dot_from_source
+from impact import ImpactIndex
+
+SOURCES = {
+    "a.h": '#include "d.h"\n',
+    "b.h": '#include "d.h"\n',
+    "c.h": '#include "d.h"\n',
+    "d.h": 'int d;\n',
+    "a.cpp": '#include "a.h"\n',
+}
+
+
+def get_index(tmp_path, sources):
+    folder = tmp_path / "src"
+    for path, text in sources.items():
+        (folder / path).parent.mkdir(parents=True, exist_ok=True)
+        (folder / path).write_text(text)
+    graph_path = str(tmp_path / "dependencies.graph.json")
+    generate_dot_from_source(str(folder), str(tmp_path / "dependencies.dot"), MODE_GENERATE_CPP_SRC,
+                             graph_path=graph_path)
+    return ImpactIndex.from_graph(graph_path)
+
+
+def test_leaf_header_impacts_its_includers(tmp_path):
+    # d.h includes nothing, it's not into the dot file but it's into the scan graph
+    impacted, unknown = get_index(tmp_path, SOURCES).get_impacted(["src/d.h"])
+    assert impacted[0] == "d.h"
+    assert sorted(impacted[1:]) == ["a.cpp", "a.h", "b.h", "c.h"]
+    assert unknown == []
+
+
+def test_source_only_impacts_itself(tmp_path):
+    index = get_index(tmp_path, SOURCES)
+    assert index.get_rebuilt(["src/a.cpp"]) == (["a.cpp"], [])
+    assert index.get_rebuilt(["src/b.cpp"]) == ([], ["src/b.cpp"])
+
+
+def test_source_is_not_merged_with_its_header(tmp_path):
+    # a.cpp includes x.h but a.h does not : b.h including a.h is not impacted by x.h
+    index = get_index(tmp_path, {
+        "a.cpp": '#include "x.h"\n',
+        "a.h": 'int a;\n',
+        "b.h": '#include "a.h"\n',
+        "x.h": 'int x;\n',
+    })
+    impacted, unknown = index.get_impacted(["x.h"])
+    assert impacted == ["x.h", "a.cpp"]
+    assert index.get_rebuilt(["x.h"]) == (["a.cpp"], [])
+    assert index.get_rebuilt(["a.h"]) == ([], [])
+
+
+def test_same_name_into_two_folders(tmp_path):
+    # Each util.h is included by the source of its folder
+    index = get_index(tmp_path, {
+        "core/util.h": 'int core;\n',
+        "core/core.cpp": '#include "util.h"\n',
+        "gui/util.h": 'int gui;\n',
+        "gui/gui.cpp": '#include "util.h"\n',
+    })
+    assert index.get_rebuilt(["core/util.h"]) == (["core/core.cpp"], [])
+    assert index.get_rebuilt(["src/gui/util.h"]) == (["gui/gui.cpp"], [])
+    assert sorted(index.get_rebuilt(["util.h"])[0]) == ["core/core.cpp", "gui/gui.cpp"]
@@ -0,0 +1,59 @@
+from include_extractor import INCLUDE_ANGLE, INCLUDE_QUOTED, get_includes
+
+
+def includes(*lines):
+    return get_includes('\n'.join(lines).encode() + b'\n')
+
+
+def test_quoted_and_angle_without_folder():
+    assert includes('#include "a.h"', '# include <sys/b.h>', '#include "../c/d.hpp"') == ['a.h', 'b.h', 'd.hpp']
+
+
+def test_duplicates_are_removed():
+    assert includes('#include "a.h"', '#include "a.h"', '#include "b.h"') == ['a.h', 'b.h']
+
+
+def test_classify():
+    assert get_includes(b'#include "a.h"\n#include <vector>\n#include <QtCore/QString>\n', classify=True) == \
+        [('a.h', INCLUDE_QUOTED), ('vector', INCLUDE_ANGLE), ('QString', INCLUDE_ANGLE)]
+
+
+def test_comments():
+    assert includes('// #include "a.h"',
+                    '/* #include "b.h"',
+                    '#include "c.h"',
+                    '*/',
+                    'int x; /* comment */ #include "d.h"',
+                    'const char *s = "/*";',
+                    '#include "e.h" // comment') == ['e.h']
+
+
+def test_if_zero():
+    assert includes('#if 0', '#include "a.h"', '#endif', '#include "b.h"') == ['b.h']
+    assert includes('#if 0 // disabled', '#include "a.h"', '#else', '#include "b.h"', '#endif') == ['b.h']
+    assert includes('#if FOO', '#include "a.h"', '#else', '#include "b.h"', '#endif') == ['a.h', 'b.h']
+
+
+def test_elif():
+    assert includes('#if 0', '#include "a.h"', '#elif 0', '#include "b.h"', '#endif') == []
+    assert includes('#if 0', '#include "a.h"', '#elif FOO', '#include "b.h"', '#endif') == ['b.h']
+    assert includes('#if 0', '#elif 0', '#include "a.h"', '#else', '#include "b.h"', '#endif') == ['b.h']
+    assert includes('#if FOO', '#include "a.h"', '#elif 0', '#include "b.h"', '#elif BAR', '#include "c.h"',
+                    '#endif') == ['a.h', 'c.h']
+
+
+def test_nested_if_zero():
+    assert includes('#if 0',
+                    '#ifdef FOO',
+                    '#include "a.h"',
+                    '#else',
+                    '#include "b.h"',
+                    '#endif',
+                    '#include "c.h"',
+                    '#endif',
+                    '#ifdef BAR',
+                    '#if 0',
+                    '#include "d.h"',
+                    '#endif',
+                    '#include "e.h"',
+                    '#endif') == ['e.h']
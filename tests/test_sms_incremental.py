@@ -0,0 +1,30 @@
+from sms_incremental import IncrementalStateMachineBuilder
+
+LINES = [
+    '=A*=',
+    'ev1 / act1 -> B',
+    '=B=',
+    'ev2 / act2 -> A',
+]
+
+
+def get_builder():
+    builder = IncrementalStateMachineBuilder()
+    assert builder.update(LINES)
+    return builder
+
+
+def test_unknown_first_change_compares_all_lines():
+    # Same number of lines, the changed line is found without the first changed line
+    builder = get_builder()
+    lines = list(LINES)
+    lines[1] = 'ev1 / act3 -> B'
+    assert builder.update(lines, None)
+    changes = builder.get_changes()
+    assert len(changes.added) == 1 and len(changes.removed) == 1
+
+
+def test_same_lines_change_nothing():
+    builder = get_builder()
+    assert builder.update(list(LINES), None)
+    assert builder.get_changes().is_empty()
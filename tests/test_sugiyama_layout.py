@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from sugiyama_layout import LAYER_SPACING, NODE_SPACING, get_coordinates
+
+
+def test_single_node_is_centered():
+    x, y = get_coordinates(np.array([0]), np.array([0]), np.array([50.0]))
+    assert x[0] == 0.0
+    assert y[0] == 0.0
+
+
+def test_layers_are_symmetric():
+    # Layer 0 : two nodes of the same width, layer 1 : two nodes of different widths
+    layer = np.array([0, 0, 1, 1])
+    position = np.array([1, 0, 0, 1])
+    widths = np.array([40.0, 40.0, 30.0, 70.0])
+    x, y = get_coordinates(layer, position, widths)
+
+    assert x[1] == pytest.approx(-x[0])
+    assert x[0] - x[1] == pytest.approx(40.0 + NODE_SPACING)
+    # Left side of the first node and right side of the last node
+    assert x[2] - 15.0 == pytest.approx(-(x[3] + 35.0))
+    assert list(y) == [0.0, 0.0, LAYER_SPACING, LAYER_SPACING]
@@ -4,29 +4,49 @@ from tools.file_json import FileJson
 
 class Cfg(FileJson):
 
-    def __init__(self):
-        super(Cfg, self).__init__("config.json", DataCfg())
+    def __init__(self, path_json="config.json"):
+        super(Cfg, self).__init__(path_json, DataCfg())
 
     def get_mode_generate(self):
-        return self.get_content().mode_generate
+        return self.get_cached_content().mode_generate
 
     def get_height_rectangle(self, split_height, full_height):
-        if self.get_content().is_center_state_text:
+        if self.get_cached_content().is_center_state_text:
             return full_height
 
         return split_height
 
     def is_reset_color_search(self):
-        return self.get_content().is_reset_color_search
+        return self.get_cached_content().is_reset_color_search
 
     def is_reset_representation_circle(self):
-        return self.get_content().is_reset_representation_circle
+        return self.get_cached_content().is_reset_representation_circle
 
     def is_diagonal_visible(self):
-        return self.get_content().is_diagonal_visible
+        return self.get_cached_content().is_diagonal_visible
 
     def is_used_diagonal(self):
-        return self.get_content().is_used_diagonal
+        return self.get_cached_content().is_used_diagonal
+
+    def get_nb_scan_workers(self):
+        # Older config files do not have this entry
+        return getattr(self.get_cached_content(), 'nb_scan_workers', 1)
+
+    def is_reduce_graph(self):
+        # Older config files do not have this entry
+        return getattr(self.get_cached_content(), 'is_reduce_graph', False)
+
+    def is_graphviz_layout(self):
+        # Older config files do not have this entry
+        return getattr(self.get_cached_content(), 'is_graphviz_layout', True)
+
+    def is_compact_layout(self):
+        # Older config files do not have this entry
+        return getattr(self.get_cached_content(), 'is_compact_layout', False)
+
+    def get_scan_rules(self, mode):
+        # Rules overriding the default ones for this mode, None if not set
+        return getattr(self.get_cached_content(), 'scan_rules', {}).get(mode)
 
 
 CFG = Cfg()
@@ -1,4 +1,4 @@
-from constant_value import ALL_MODES, MODE_GENERATE_NO
+from constant_mode import ALL_MODES, MODE_GENERATE_NO
 
 
 class DataCfg:
@@ -11,3 +11,10 @@ class DataCfg:
         self.is_center_state_text = True
         self.is_diagonal_visible = False
         self.is_used_diagonal = True
+        self.nb_scan_workers = 1
+        self.is_reduce_graph = False
+        self.is_graphviz_layout = True
+        # Rules of the scanned files per mode, see source_walker.DEFAULT_SCAN_RULES
+        self.scan_rules = {}
+        # Diagrams also saved in the compact format, loaded from it when up to date
+        self.is_compact_layout = False
@@ -0,0 +1,17 @@
+# Write a file under a temporary name then rename it,
+# the previous file stays whole if the write fails or is interrupted
+import os
+from contextlib import contextmanager
+
+
+@contextmanager
+def open_atomic(path, mode='w', **kwargs):
+    temp_path = path + '.tmp'
+    try:
+        with open(temp_path, mode, **kwargs) as f:
+            yield f
+        os.replace(temp_path, path)
+    finally:
+        # Temporary file left by a failed write
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
@@ -1,20 +1,28 @@
 # Class managing json file input/output
 # Read/Write json file : self.path_json
 # Read/Write json content : self.content_json
+# The content is kept in memory, the file is read again when its date changes
 import codecs
 import json
 import os
+import time
 from json import JSONDecodeError
 import jsonpickle
 
 
 class FileJson:
+    # Minimal delay in seconds between two checks of the date of the file
+    RELOAD_INTERVAL = 1.0
 
     def __init__(self, path_json, default_content_json):
         # Init json file path
         self.default_content_json = default_content_json
         self.content_json = self.default_content_json
         self.path_json = path_json
+        self.nb_reads = 0  # number of reads of the file
+        self._listeners = []
+        self._mtime = None
+        self._next_check = 0.0
 
         # If file does not exist
         if not self.is_exists():
@@ -24,10 +32,13 @@ class FileJson:
         else:
             # Load content json
             self.read_content()
+        self._mtime = self._get_mtime()
+        self._next_check = time.monotonic() + self.RELOAD_INTERVAL
 
     def get_content(self):
         try:
             # Get content from json file
+            self.nb_reads += 1
             serialized = ""
             json_object_data = open(self.path_json, "rb").readlines()
             for d in json_object_data:
@@ -50,6 +61,34 @@ class FileJson:
             print("JSONDecodeError : return self.default_content_json")
             return self.default_content_json
 
+    def get_cached_content(self):
+        # Content in memory, the date of the file is checked at most once per interval
+        if time.monotonic() >= self._next_check:
+            self.reload()
+        return self.content_json
+
+    def reload(self):
+        # Read the file again if its date changed and notify the listeners, return True if read
+        self._next_check = time.monotonic() + self.RELOAD_INTERVAL
+        mtime = self._get_mtime()
+        if mtime is None or mtime == self._mtime:
+            return False
+        self._mtime = mtime
+        self.read_content()
+        for listener in self._listeners:
+            listener(self.content_json)
+        return True
+
+    def add_listener(self, listener):
+        # listener(content_json) is called when the content is read again
+        self._listeners.append(listener)
+
+    def _get_mtime(self):
+        try:
+            return os.stat(self.path_json).st_mtime_ns
+        except OSError:
+            return None
+
     def read_content(self):
         try:
             self.content_json = self.get_content()
@@ -59,10 +98,12 @@ class FileJson:
     def set_content(self, content_json):
         try:
             # Set content to json file
-            file = codecs.open(self.path_json, 'w', "utf-8")
             serialized = jsonpickle.encode(content_json)
             json_object = json.loads(serialized)
-            file.write(json.dumps(json_object, indent=2, ensure_ascii=False))
+            with codecs.open(self.path_json, 'w', "utf-8") as file:
+                file.write(json.dumps(json_object, indent=2, ensure_ascii=False))
+            self.content_json = content_json
+            self._mtime = self._get_mtime()
         except TypeError:
             pass
 